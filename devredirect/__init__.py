@@ -0,0 +1,6 @@
+"""
+DevRedirect: 하드코딩된 IP:PORT로 가는 연결을 개발/테스트 서버로 우회하는 사용자 공간 포워더
+
+    python -m devredirect add 203.0.113.5:5432 10.0.0.5:5432
+    python -m devredirect run
+"""
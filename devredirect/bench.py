@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+DevRedirect 지연시간 벤치마크
+
+PRD의 성공 기준(추가 지연 5ms 이하)을 확인합니다. 저장소 루트에서 실행합니다:
+
+    python -m devredirect.bench                        # 로컬 PostgreSQL 대역 서버로 측정
+    python -m devredirect.bench --connections 2000 --pool-size 16
+    python -m devredirect.bench --target 10.0.0.5:5432 # 실제 PostgreSQL 서버로 측정 (왕복 측정 생략)
+    python -m devredirect.bench --json
+
+같은 대상에 세 가지 경로로 연결해 비교합니다.
+
+- direct:  대상에 바로 연결
+- forward: 포워더를 거쳐 연결 (accept 뒤에 대상에 연결)
+- pool:    포워더를 거쳐 연결 (미리 연결해 둔 소켓 사용)
+
+setup은 connect부터 PostgreSQL SSLRequest 응답 1바이트를 받을 때까지, rtt는 연결된 상태에서 작은
+메시지 하나의 왕복 시간입니다. forward/pool의 p99가 direct보다 --budget-ms 넘게 늘어나면 종료 코드 1입니다.
+대역 서버를 쓸 때는 UDP 에코로 udp_direct/udp_forward의 왕복 시간과 초당 데이터그램 수도 잽니다.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import signal
+import socket
+import struct
+import sys
+import time
+import timeit
+from typing import Dict, Any, List, Optional
+
+from devredirect.forwarder import Forwarder
+from devredirect.rules import Address, Rule, UDP, address_family, format_address, parse_address
+from devredirect.table import RuleTable
+from devredirect.udp import UdpForwarder
+
+# PostgreSQL SSLRequest: 길이 8, 요청 코드 80877103. 서버는 'S' 또는 'N' 한 바이트로 답합니다.
+SSL_REQUEST = struct.pack("!ii", 8, 80877103)
+
+_MESSAGE = b"x" * 64
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    return {
+        "p50_ms": round(percentile(values, 50), 3),
+        "p99_ms": round(percentile(values, 99), 3),
+        "max_ms": round(max(values), 3) if values else 0.0,
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class _UdpEcho(asyncio.DatagramProtocol):
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, address):
+        self.transport.sendto(data, address)
+
+
+def _stand_in_server(ready) -> None:
+    """SSLRequest에 'N'으로 답하고 그 뒤로는 받은 데이터를 돌려주는 PostgreSQL 대역 서버 (+ UDP 에코)"""
+
+    async def handle(reader, writer):
+        try:
+            first = await reader.readexactly(8)
+            writer.write(b"N" if first == SSL_REQUEST else first)
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                writer.write(data)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        writer.close()
+
+    async def serve():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0, backlog=1024)
+        transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+            _UdpEcho, local_addr=("127.0.0.1", 0))
+        ready.send((server.sockets[0].getsockname()[1], transport.get_extra_info("sockname")[1]))
+        await server.serve_forever()
+
+    asyncio.run(serve())
+
+
+def _forwarder_process(rules: List[Rule], pool_size: int, use_splice: Optional[bool], conn) -> None:
+    """
+    pool 없는 포워더와 pool 있는 포워더(, UDP 포워더)를 한 이벤트 루프에서 돌리고, 종료할 때 통계를 보냅니다.
+
+    rules는 [pool 없는 TCP 규칙, pool 있는 TCP 규칙, (UDP 규칙)] 순서입니다.
+    """
+
+    async def serve():
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        loop.add_signal_handler(signal.SIGTERM, stop.set)
+        forwarders = [Forwarder(rules[:1], use_splice=use_splice),
+                      Forwarder(rules[1:2], use_splice=use_splice, pool_size=pool_size),
+                      UdpForwarder(rules[2:])]
+        for forwarder in forwarders:
+            await forwarder.start()
+        conn.send("ready")
+        await stop.wait()
+        stats = {}
+        for forwarder in forwarders:
+            stats.update(forwarder.stats())
+            await forwarder.stop()
+        conn.send(stats)
+
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(serve())
+
+
+def _measure_setup(address: Address, count: int) -> List[float]:
+    durations = []
+    for _ in range(count):
+        started = time.perf_counter()
+        sock = socket.create_connection(address)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.sendall(SSL_REQUEST)
+        reply = sock.recv(1)
+        durations.append((time.perf_counter() - started) * 1000)
+        sock.close()
+        if reply not in (b"N", b"S"):
+            raise RuntimeError(f"{format_address(address)}: SSLRequest 응답이 아닙니다: {reply!r}")
+    return durations
+
+
+def _measure_rtt(address: Address, count: int) -> List[float]:
+    durations = []
+    with socket.create_connection(address) as sock:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.sendall(SSL_REQUEST)
+        sock.recv(1)
+        for _ in range(count):
+            started = time.perf_counter()
+            sock.sendall(_MESSAGE)
+            received = 0
+            while received < len(_MESSAGE):
+                chunk = sock.recv(65536)
+                if not chunk:
+                    raise RuntimeError("대역 서버가 연결을 닫았습니다")
+                received += len(chunk)
+            durations.append((time.perf_counter() - started) * 1000)
+    return durations
+
+
+def _measure_udp(address: Address, count: int, window: int = 32) -> Dict[str, Any]:
+    """UDP 에코 왕복 시간과, window개씩 보내고 받을 때의 초당 데이터그램 수"""
+    durations = []
+    with socket.socket(address_family(address[0]), socket.SOCK_DGRAM) as sock:
+        sock.settimeout(2.0)
+        sock.connect(address)
+        for _ in range(count):
+            started = time.perf_counter()
+            sock.send(_MESSAGE)
+            sock.recv(65536)
+            durations.append((time.perf_counter() - started) * 1000)
+
+        received = 0
+        started = time.perf_counter()
+        for _ in range(max(1, count // window)):
+            for _ in range(window):
+                sock.send(_MESSAGE)
+            for _ in range(window):
+                sock.recv(65536)
+                received += 1
+        elapsed = time.perf_counter() - started
+    result = {f"rtt_{key}": value for key, value in _summary(durations).items()}
+    result["datagrams_per_second"] = round(received * 2 / elapsed)
+    return result
+
+
+def _measure_lookup(sizes: List[int]) -> Dict[str, float]:
+    """규칙 수별 RuleTable.lookup 한 번의 비용 (ns)"""
+    result = {}
+    for size in sizes:
+        table = RuleTable(Rule((f"10.{i // 65536}.{i // 256 % 256}.{i % 256}", 5432), ("127.0.0.1", 1))
+                          for i in range(size))
+        key = (f"10.0.0.{min(size, 256) // 2}", 5432)
+        number = 200_000
+        seconds = min(timeit.repeat(lambda: table.lookup(key), number=number, repeat=3))
+        result[f"lookup_ns[{size}]"] = round(seconds / number * 1e9, 1)
+    return result
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="DevRedirect 지연시간 벤치마크")
+    parser.add_argument("--target", help="측정할 PostgreSQL 서버 (기본: 로컬 대역 서버)")
+    parser.add_argument("--connections", type=int, default=500, help="경로별 연결 수")
+    parser.add_argument("--messages", type=int, default=2000, help="경로별 왕복 메시지 수 (대역 서버만)")
+    parser.add_argument("--pool-size", type=int, default=8)
+    parser.add_argument("--no-splice", action="store_true", help="splice 대신 버퍼 복사 사용")
+    parser.add_argument("--budget-ms", type=float, default=5.0, help="허용하는 추가 지연 (p99 기준)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    context = multiprocessing.get_context("fork")
+    processes = []
+
+    try:
+        if args.target:
+            target = parse_address(args.target)
+        else:
+            receiver, sender = context.Pipe(duplex=False)
+            server = context.Process(target=_stand_in_server, args=(sender,), daemon=True)
+            server.start()
+            processes.append(server)
+            tcp_port, udp_port = receiver.recv()
+            target = ("127.0.0.1", tcp_port)
+
+        listens = [("127.0.0.1", _free_port()), ("127.0.0.1", _free_port())]
+        rules = [Rule(listens[0], target), Rule(listens[1], target)]
+        if not args.target:
+            udp_paths = {"udp_direct": ("127.0.0.1", udp_port), "udp_forward": ("127.0.0.1", _free_port())}
+            rules.append(Rule(udp_paths["udp_forward"], udp_paths["udp_direct"], UDP))
+        parent, child = context.Pipe()
+        forwarder = context.Process(target=_forwarder_process,
+                                    args=(rules, args.pool_size, False if args.no_splice else None, child),
+                                    daemon=True)
+        forwarder.start()
+        processes.append(forwarder)
+        if parent.recv() != "ready":
+            raise RuntimeError("포워더를 시작하지 못했습니다")
+        time.sleep(0.2)  # 풀이 채워질 시간
+
+        paths = {"direct": target, "forward": listens[0], "pool": listens[1]}
+        results: Dict[str, Dict[str, Any]] = {}
+        for name, address in paths.items():
+            _measure_setup(address, min(20, args.connections))  # 워밍업
+            results[name] = {f"setup_{key}": value
+                             for key, value in _summary(_measure_setup(address, args.connections)).items()}
+            if not args.target:
+                results[name].update({f"rtt_{key}": value
+                                      for key, value in _summary(_measure_rtt(address, args.messages)).items()})
+        if not args.target:
+            for name, address in udp_paths.items():
+                _measure_udp(address, min(100, args.messages))  # 워밍업
+                results[name] = _measure_udp(address, args.messages)
+
+        forwarder.terminate()
+        stats = parent.recv()
+        forwarder.join()
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    for name in ("forward", "pool"):
+        listen = format_address(paths[name])
+        results[name]["forwarder_setup_p50_ms"] = stats[listen]["setup_p50_ms"]
+        results[name]["forwarder_setup_p99_ms"] = stats[listen]["setup_p99_ms"]
+        if name == "pool":
+            results[name]["pool_hits"] = stats[listen]["pool_hits"]
+            results[name]["pool_misses"] = stats[listen]["pool_misses"]
+    results["rule_table"] = _measure_lookup([10, 1000, 10000])
+
+    failures = []
+    for name, baseline in (("forward", "direct"), ("pool", "direct"), ("udp_forward", "udp_direct")):
+        if name not in results:
+            continue
+        for metric in ("setup_p99_ms", "rtt_p99_ms"):
+            if metric not in results[name]:
+                continue
+            added = round(results[name][metric] - results[baseline][metric], 3)
+            results[name][f"added_{metric}"] = added
+            if added > args.budget_ms:
+                failures.append(f"{name}.{metric}: {baseline} 대비 +{added}ms")
+
+    if args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+    else:
+        print(f"대상 {format_address(target)}, 경로별 연결 {args.connections}개"
+              + ("" if args.target else f", 왕복 {args.messages}회"))
+        for name in paths:
+            item = results[name]
+            line = f"  {name:8s} setup p50 {item['setup_p50_ms']}ms p99 {item['setup_p99_ms']}ms"
+            if "rtt_p50_ms" in item:
+                line += f" | rtt p50 {item['rtt_p50_ms']}ms p99 {item['rtt_p99_ms']}ms"
+            if "added_setup_p99_ms" in item:
+                line += f" | 추가 지연 p99 setup {item['added_setup_p99_ms']:+}ms"
+                if "added_rtt_p99_ms" in item:
+                    line += f", rtt {item['added_rtt_p99_ms']:+}ms"
+            print(line)
+        for name in ("udp_direct", "udp_forward"):
+            if name in results:
+                item = results[name]
+                line = (f"  {name:11s} rtt p50 {item['rtt_p50_ms']}ms p99 {item['rtt_p99_ms']}ms"
+                        f" | {item['datagrams_per_second']} 데이터그램/초")
+                if "added_rtt_p99_ms" in item:
+                    line += f" | 추가 지연 p99 rtt {item['added_rtt_p99_ms']:+}ms"
+                print(line)
+        print(f"  포워더 측 연결 준비 p50: forward {results['forward']['forwarder_setup_p50_ms']}ms, "
+              f"pool {results['pool']['forwarder_setup_p50_ms']}ms "
+              f"(풀 사용 {results['pool']['pool_hits']}, 부족 {results['pool']['pool_misses']})")
+        print("  규칙 조회: " + ", ".join(f"{key} {value}" for key, value in results["rule_table"].items()))
+
+    if failures:
+        print(f"추가 지연 {args.budget_ms:g}ms 초과:")
+        for line in failures:
+            print(f"  - {line}")
+        return 1
+    print(f"추가 지연 {args.budget_ms:g}ms 이내")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+import argparse
+import asyncio
+import json
+import logging
+import signal
+import sys
+from typing import Callable, List, Optional
+
+from devredirect import profiles
+from devredirect.forwarder import Forwarder
+from devredirect.rules import Rule, TCP, UDP, format_address, parse_address
+from devredirect.table import RuleTable
+from devredirect.udp import UdpForwarder
+
+logger = logging.getLogger(__name__)
+
+
+def _protocol(args) -> str:
+    return UDP if getattr(args, "udp", False) else TCP
+
+
+def _parse_rules(values: List[str], protocol: str = TCP) -> List[Rule]:
+    if len(values) % 2:
+        raise ValueError("listen 주소와 대상 주소를 짝지어 입력하세요 (LISTEN TARGET [LISTEN TARGET ...])")
+    return [Rule.parse(values[i], values[i + 1], protocol) for i in range(0, len(values), 2)]
+
+
+def _build_forwarders(args, rules: List[Rule]) -> list:
+    """TCP 포워더와 UDP 포워더. 각자 자기 프로토콜의 규칙만 사용합니다."""
+    return [
+        Forwarder(rules, use_splice=False if args.no_splice else None,
+                  max_connections=args.max_connections, connect_timeout=args.connect_timeout,
+                  drain_timeout=args.drain_timeout, pool_size=args.pool_size,
+                  pool_max_idle=args.pool_max_idle),
+        UdpForwarder(rules, idle_timeout=args.udp_idle_timeout, max_flows=args.udp_max_flows),
+    ]
+
+
+def _stats(forwarders: list) -> str:
+    stats = {}
+    for forwarder in forwarders:
+        stats.update(forwarder.stats())
+    return json.dumps(stats, ensure_ascii=False)
+
+
+async def _serve(forwarders: list, stats_interval: float,
+                 load_rules: Optional[Callable[[], List[Rule]]] = None) -> None:
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    async def reload() -> None:
+        try:
+            rules = load_rules()
+            for forwarder in forwarders:
+                await forwarder.apply(rules)
+            logger.info(f"규칙 다시 읽음: {len(rules)}개")
+        except (OSError, ValueError) as e:
+            logger.error(f"규칙을 적용하지 못해 이전 규칙을 유지합니다: {e}")
+
+    if load_rules is not None and hasattr(signal, "SIGHUP"):
+        loop.add_signal_handler(signal.SIGHUP, lambda: loop.create_task(reload()))
+
+    started = []
+    try:
+        for forwarder in forwarders:
+            await forwarder.start()
+            started.append(forwarder)
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=stats_interval or None)
+            except asyncio.TimeoutError:
+                logger.info(f"통계: {_stats(forwarders)}")
+    finally:
+        for forwarder in started:
+            await forwarder.stop()
+        logger.info(f"종료 통계: {_stats(forwarders)}")
+
+
+def _forward(args) -> int:
+    try:
+        rules = _parse_rules(args.addresses, _protocol(args))
+    except ValueError as e:
+        logger.error(str(e))
+        return 2
+    try:
+        asyncio.run(_serve(_build_forwarders(args, rules), args.stats_interval))
+    except OSError as e:
+        logger.error(f"listen 소켓을 열 수 없습니다: {e}")
+        return 1
+    return 0
+
+
+def _run(args) -> int:
+    try:
+        rules = profiles.load_profile(args.profile)
+    except ValueError as e:
+        logger.error(str(e))
+        return 2
+    if hasattr(signal, "SIGHUP"):
+        # 이벤트 루프가 처리기를 등록하기 전에 add/remove가 보낸 신호로 종료되지 않도록
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    pid_lock = profiles.lock_pid(args.profile)
+    if pid_lock is None:
+        logger.error(f"프로필 {args.profile}은 이미 실행 중입니다 (pid {profiles.read_pid(args.profile)})")
+        return 1
+    if not rules:
+        logger.warning(f"프로필 {args.profile}에 규칙이 없습니다. devredirect add로 추가하면 바로 적용됩니다")
+
+    try:
+        asyncio.run(_serve(_build_forwarders(args, rules), args.stats_interval,
+                           lambda: profiles.load_profile(args.profile)))
+    except OSError as e:
+        logger.error(f"listen 소켓을 열 수 없습니다: {e}")
+        return 1
+    finally:
+        pid_lock.release()
+    return 0
+
+
+def _save_and_notify(profile: str, table: RuleTable) -> None:
+    path = profiles.save_profile(profile, table.rules())
+    pid = profiles.notify_reload(profile)
+    if pid is not None:
+        print(f"저장: {path} (실행 중인 포워더 pid {pid}에 적용)")
+    else:
+        print(f"저장: {path} (devredirect run --profile {profile}으로 실행)")
+
+
+def _add(args) -> int:
+    try:
+        rule = Rule.parse(args.listen, args.target, _protocol(args))
+        table = RuleTable(profiles.load_profile(args.profile))
+    except ValueError as e:
+        logger.error(str(e))
+        return 2
+    previous = table.lookup(rule.listen, rule.protocol)
+    _save_and_notify(args.profile, table.with_rule(rule))
+    if previous is not None and previous != rule:
+        print(f"변경: {rule.name} -> {format_address(rule.target)} (이전 대상 {format_address(previous.target)})")
+    else:
+        print(f"추가: {rule.name} -> {format_address(rule.target)}")
+    return 0
+
+
+def _remove(args) -> int:
+    try:
+        listen = parse_address(args.listen)
+        table = RuleTable(profiles.load_profile(args.profile))
+        table = table.without(listen, _protocol(args))
+    except ValueError as e:
+        logger.error(str(e))
+        return 2
+    except KeyError:
+        logger.error(f"프로필 {args.profile}에 {args.listen} 규칙이 없습니다")
+        return 1
+    _save_and_notify(args.profile, table)
+    print(f"삭제: {format_address(listen)}" + ("/udp" if _protocol(args) == UDP else ""))
+    return 0
+
+
+def _list(args) -> int:
+    try:
+        rules = profiles.load_profile(args.profile)
+    except ValueError as e:
+        logger.error(str(e))
+        return 2
+    pid = profiles.read_pid(args.profile)
+    print(f"프로필 {args.profile}" + (f" (실행 중, pid {pid})" if pid else " (실행 중 아님)"))
+    if not rules:
+        print("  규칙 없음")
+    for rule in rules:
+        print(f"  {rule.name} -> {format_address(rule.target)}")
+    return 0
+
+
+def _profiles(args) -> int:
+    for name in profiles.list_profiles():
+        pid = profiles.read_pid(name)
+        print(name + (f" (실행 중, pid {pid})" if pid else ""))
+    return 0
+
+
+def _add_forwarder_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--stats-interval", type=float, default=60.0, help="통계 로그 간격 (초, 0이면 끔)")
+    parser.add_argument("--max-connections", type=int, default=1024)
+    parser.add_argument("--connect-timeout", type=float, default=5.0)
+    parser.add_argument("--drain-timeout", type=float, default=None,
+                        help="규칙이 바뀐 뒤 기존 연결을 유지할 최대 시간 (초, 기본은 끝날 때까지)")
+    parser.add_argument("--no-splice", action="store_true", help="splice 대신 버퍼 복사 사용")
+    parser.add_argument("--pool-size", type=int, default=0,
+                        help="규칙마다 대상에 미리 연결해 둘 소켓 수 (0이면 끔)")
+    parser.add_argument("--pool-max-idle", type=float, default=30.0,
+                        help="미리 연결한 소켓을 쓰지 않고 둘 최대 시간 (초, PostgreSQL은 60 미만)")
+    parser.add_argument("--udp-idle-timeout", type=float, default=60.0,
+                        help="UDP 흐름을 정리할 때까지의 유휴 시간 (초)")
+    parser.add_argument("--udp-max-flows", type=int, default=4096, help="동시 UDP 흐름 한도")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="devredirect", description="TCP 연결 리다이렉트 포워더")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--log-level", default="INFO")
+    profile_option = argparse.ArgumentParser(add_help=False, parents=[common])
+    profile_option.add_argument("--profile", default=profiles.DEFAULT_PROFILE, help="규칙 프로필 이름")
+    udp_option = argparse.ArgumentParser(add_help=False)
+    udp_option.add_argument("--udp", action="store_true", help="UDP 규칙 (기본은 TCP)")
+
+    add = commands.add_parser("add", parents=[profile_option, udp_option], help="규칙 추가 (같은 원본이 있으면 대상 변경)")
+    add.add_argument("listen", help="원본 주소 (예: 203.0.113.5:5432)")
+    add.add_argument("target", help="대상 주소 (예: 10.0.0.5:5432)")
+
+    remove = commands.add_parser("remove", parents=[profile_option, udp_option], help="규칙 삭제")
+    remove.add_argument("listen", help="원본 주소")
+
+    commands.add_parser("list", parents=[profile_option], help="규칙 조회")
+    commands.add_parser("profiles", parents=[common], help="프로필 목록")
+
+    run = commands.add_parser("run", parents=[profile_option],
+                              help="프로필의 규칙으로 전달 (add/remove가 바로 반영됨, Ctrl+C로 종료)")
+    _add_forwarder_options(run)
+
+    forward = commands.add_parser("forward", parents=[common, udp_option], help="명령줄의 규칙으로 전달 (프로필 없이, Ctrl+C로 종료)")
+    forward.add_argument("addresses", nargs="+", metavar="LISTEN TARGET",
+                         help="listen 주소와 대상 주소 쌍 (예: 127.0.0.1:15432 10.0.0.5:5432)")
+    _add_forwarder_options(forward)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s - %(levelname)s - %(message)s")
+
+    handlers = {"add": _add, "remove": _remove, "list": _list, "profiles": _profiles,
+                "run": _run, "forward": _forward}
+    try:
+        return handlers[args.command](args)
+    except ValueError as e:
+        # 잘못된 프로필 이름 등
+        logger.error(str(e))
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,372 @@
+import asyncio
+import errno
+import logging
+import socket
+import struct
+import time
+from typing import Dict, Any, Iterable, List, Optional, Set
+
+from devredirect.pool import PendingConnect, UpstreamPool
+from devredirect.pump import BufferPool, BufferPump, PipePool, SplicePump, SPLICE_SUPPORTED
+from devredirect.rules import Address, Rule, TCP, address_family, format_address, resolve
+from devredirect.stats import RuleStats
+from devredirect.table import RuleTable
+
+logger = logging.getLogger(__name__)
+
+# 한 번의 accept 이벤트에서 받아들일 최대 연결 수
+_ACCEPT_BATCH = 64
+
+# SO_LINGER (켜짐, 0초): close()가 FIN 대신 RST를 보냅니다
+_LINGER_RESET = struct.pack("ii", 1, 0)
+
+
+class _Connection:
+    """클라이언트 소켓 하나와 대상 소켓 하나, 그리고 두 방향의 Pump."""
+
+    __slots__ = ("forwarder", "rule", "stats", "client", "upstream", "accepted_at",
+                 "pumps", "pipes", "buffers", "pending", "closed")
+
+    def __init__(self, forwarder: "Forwarder", rule: Rule, stats: RuleStats,
+                 client: socket.socket, accepted_at: float):
+        self.forwarder = forwarder
+        self.rule = rule
+        self.stats = stats
+        self.client = client
+        self.upstream: Optional[socket.socket] = None
+        self.accepted_at = accepted_at
+        self.pumps: List = []
+        self.pipes: List = []
+        self.buffers: List[bytearray] = []
+        self.pending: Optional[PendingConnect] = None
+        self.closed = False
+
+    def connect(self, target: Address) -> None:
+        """대상에 비동기 connect를 시작합니다. 완료되면 _on_connected가 호출됩니다."""
+        try:
+            self.pending = PendingConnect(self.forwarder.loop, target, self.forwarder.connect_timeout,
+                                          self._on_connected)
+        except OSError as e:
+            self._on_connected(None, None, e)
+
+    def _on_connected(self, pending: Optional[PendingConnect], upstream: Optional[socket.socket],
+                      error: Optional[Exception]) -> None:
+        self.pending = None
+        if error is not None:
+            self.stats.connect_errors += 1
+            logger.warning(f"{self.rule.name}: 대상 {format_address(self.rule.target)} 연결 실패: {error}")
+            self.close()
+            return
+        self.start(upstream)
+
+    def start(self, upstream: socket.socket) -> None:
+        """연결된 대상 소켓으로 양방향 전달을 시작합니다."""
+        self.stats.record_setup((time.perf_counter() - self.accepted_at) * 1000)
+        self.upstream = upstream
+        forwarder = self.forwarder
+        stats = self.stats
+
+        def count_up(n: int) -> None:
+            stats.bytes_up += n
+
+        def count_down(n: int) -> None:
+            stats.bytes_down += n
+
+        if forwarder.use_splice:
+            for _ in range(2):
+                self.pipes.append(forwarder.pipe_pool.acquire())
+            capacity = forwarder.pipe_pool.capacity(self.pipes[0])
+            self.pumps = [
+                SplicePump(forwarder.loop, self.client, upstream, self.pipes[0], capacity,
+                           count_up, self._on_pump_done, self.abort),
+                SplicePump(forwarder.loop, upstream, self.client, self.pipes[1], capacity,
+                           count_down, self._on_pump_done, self.abort),
+            ]
+        else:
+            for _ in range(2):
+                self.buffers.append(forwarder.buffer_pool.acquire())
+            self.pumps = [
+                BufferPump(forwarder.loop, self.client, upstream, self.buffers[0],
+                           count_up, self._on_pump_done, self.abort),
+                BufferPump(forwarder.loop, upstream, self.client, self.buffers[1],
+                           count_down, self._on_pump_done, self.abort),
+            ]
+        for pump in self.pumps:
+            pump.start()
+
+    def _on_pump_done(self, pump) -> None:
+        if all(item.done for item in self.pumps):
+            self.close()
+
+    def abort(self, error: Optional[OSError] = None) -> None:
+        """오류가 나면 양쪽을 바로 닫습니다 (RST)."""
+        if self.closed:
+            return
+        if error is not None and error.errno == errno.EINVAL and self.pipes:
+            # 이 소켓 종류에서 splice를 쓸 수 없는 커널: 이후 연결은 버퍼로 전달
+            logger.warning(f"splice 실패, 버퍼 복사로 전환합니다: {error}")
+            self.forwarder.use_splice = False
+        elif error is not None and error.errno not in (errno.ECONNRESET, errno.EPIPE):
+            logger.info(f"{self.rule.name}: 연결 종료 ({error})")
+        for sock in (self.client, self.upstream):
+            if sock is not None:
+                try:
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, _LINGER_RESET)
+                except OSError:
+                    pass
+        self.close()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        if self.pending is not None:
+            self.pending.cancel()
+            self.pending = None
+        for pump in self.pumps:
+            pump.stop()
+            if isinstance(pump, BufferPump):
+                pump.release_view()
+        for pipe, pump in zip(self.pipes, self.pumps):
+            self.forwarder.pipe_pool.release(pipe, clean=pump.pending == 0)
+        for buffer in self.buffers:
+            self.forwarder.buffer_pool.release(buffer)
+        if self.upstream is not None:
+            self.upstream.close()
+        self.client.close()
+        self.pumps = []
+        self.pipes = []
+        self.buffers = []
+        self.forwarder._on_connection_closed(self)
+
+
+class Forwarder:
+    """
+    규칙마다 listen 소켓을 열고, 들어온 TCP 연결을 대상 주소로 전달합니다.
+
+    asyncio 이벤트 루프의 add_reader/add_writer만 사용하는 콜백 방식이라 연결마다 코루틴이나
+    Task를 만들지 않습니다. Linux에서는 splice로 커널 안에서 바로 옮기고, 그 외에는
+    미리 할당해 재사용하는 버퍼로 복사합니다. 선택자 기반 루프가 필요합니다 (Windows Proactor 불가).
+    pool_size를 주면 규칙마다 대상에 미리 연결해 둔 소켓을 accept 직후 넘겨줘, 연결 준비 시간이
+    대상과의 핸드셰이크가 아니라 로컬 accept 수준이 됩니다 (UpstreamPool).
+
+    규칙은 apply()로 실행 중에 바꿀 수 있습니다. 새 RuleTable을 통째로 바꿔 끼우므로 accept 경로는
+    항상 한 버전의 테이블만 보고, 이미 연결된 세션은 바뀌기 전 대상과 계속 주고받다가 스스로 끝납니다.
+
+        forwarder = Forwarder([Rule.parse("127.0.0.1:15432", "10.0.0.5:5432")])
+        await forwarder.start()
+        await forwarder.apply([...])
+        await forwarder.stop()
+    """
+
+    def __init__(self, rules: Iterable[Rule] = (), use_splice: Optional[bool] = None,
+                 buffer_size: int = 64 * 1024, pipe_size: int = 0,
+                 max_connections: int = 1024, connect_timeout: float = 5.0, backlog: int = 512,
+                 drain_timeout: Optional[float] = None, pool_size: int = 0, pool_max_idle: float = 30.0):
+        self.table = RuleTable(rules)
+        self.use_splice = SPLICE_SUPPORTED if use_splice is None else (use_splice and SPLICE_SUPPORTED)
+        self.buffer_pool = BufferPool(buffer_size)
+        self.pipe_pool = PipePool(pipe_size)
+        self.max_connections = max_connections
+        self.connect_timeout = connect_timeout
+        self.backlog = backlog
+        self.drain_timeout = drain_timeout
+        self.pool_size = pool_size
+        self.pool_max_idle = pool_max_idle
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stats: Dict[str, RuleStats] = {}
+        self._listeners: Dict[Address, socket.socket] = {}
+        self._targets: Dict[Address, Address] = {}
+        self._pools: Dict[Address, UpstreamPool] = {}
+        self._connections: Set[_Connection] = set()
+        self._accepting = False
+
+    @property
+    def rules(self) -> List[Rule]:
+        return self.table.rules()
+
+    async def start(self) -> None:
+        """
+        listen 소켓을 엽니다.
+
+        Raises:
+            OSError: listen 주소에 바인드할 수 없거나 대상 호스트 이름을 확인할 수 없는 경우
+        """
+        self.loop = asyncio.get_running_loop()
+        table, self.table = self.table, RuleTable()
+        self._accepting = True
+        try:
+            await self.apply(table.rules())
+        except (OSError, ValueError):
+            self._accepting = False
+            raise
+
+    async def apply(self, rules: Iterable[Rule]) -> None:
+        """
+        규칙 전체를 바꿉니다. TCP 규칙만 사용하고 다른 프로토콜의 규칙은 무시합니다.
+
+        새 listen 소켓을 모두 연 다음에 테이블을 한 번에 바꾸고, 빠진 listen 소켓만 닫습니다.
+        그대로인 규칙의 listen 소켓과 모든 기존 연결은 건드리지 않으므로 진행 중인 DB 세션에 지연이 생기지
+        않습니다. 빠지거나 대상이 바뀐 규칙의 기존 연결은 끝날 때까지 두고 (drain), drain_timeout이
+        있으면 그 뒤에 끊습니다.
+
+        Raises:
+            ValueError: listen 주소가 중복된 경우
+            OSError: 새 listen 주소에 바인드할 수 없거나 대상을 확인할 수 없는 경우 (기존 규칙 유지)
+        """
+        table = RuleTable(rule for rule in rules if rule.protocol == TCP)
+        targets: Dict[Address, Address] = {}
+        for rule in table:
+            if rule.target not in targets:
+                targets[rule.target] = await resolve(self.loop, rule.target, socket.SOCK_STREAM)
+
+        opened: Dict[Address, socket.socket] = {}
+        try:
+            for rule in table:
+                if rule.listen not in self._listeners:
+                    opened[rule.listen] = self._listen(rule.listen)
+        except OSError:
+            for listener in opened.values():
+                listener.close()
+            raise
+
+        old_table, self.table = self.table, table
+        self._targets = targets
+        for rule in table:
+            self._stats.setdefault(rule.name, RuleStats())
+            if old_table.lookup(rule.listen) != rule:
+                logger.info(f"전달 시작: {rule.name} -> {format_address(rule.target)}"
+                            f" ({'splice' if self.use_splice else '버퍼 복사'})")
+        for listen, listener in opened.items():
+            self._listeners[listen] = listener
+            if self._accepting:
+                self.loop.add_reader(listener.fileno(), self._on_accept, listener, listen)
+        for listen in [listen for listen in self._listeners if table.lookup(listen) is None]:
+            listener = self._listeners.pop(listen)
+            if self._accepting:
+                self.loop.remove_reader(listener.fileno())
+            listener.close()
+            logger.info(f"전달 중지: {format_address(listen)}")
+        self._sync_pools()
+        self._drain()
+
+    def _sync_pools(self) -> None:
+        """규칙마다 대상 연결 풀을 맞춥니다. 대상이 바뀌거나 빠진 규칙의 풀은 닫습니다."""
+        for listen in list(self._pools):
+            rule = self.table.lookup(listen)
+            if rule is None or self._pools[listen].target != self._targets[rule.target]:
+                self._pools.pop(listen).close()
+        if self.pool_size <= 0:
+            return
+        for rule in self.table:
+            if rule.listen not in self._pools:
+                pool = UpstreamPool(self.loop, self._targets[rule.target], self.pool_size,
+                                    self.pool_max_idle, self.connect_timeout)
+                self._pools[rule.listen] = pool
+                pool.start()
+
+    def _drain(self) -> None:
+        draining = [connection for connection in self._connections
+                    if self.table.lookup(connection.rule.listen) != connection.rule]
+        if not draining:
+            return
+        logger.info(f"바뀐 규칙의 기존 연결 {len(draining)}개는 끝날 때까지 유지합니다"
+                    + (f" (최대 {self.drain_timeout:g}초)" if self.drain_timeout is not None else ""))
+        if self.drain_timeout is not None:
+            self.loop.call_later(self.drain_timeout, self._abort_drained, draining)
+
+    def _abort_drained(self, draining: List[_Connection]) -> None:
+        remaining = [connection for connection in draining if not connection.closed]
+        if remaining:
+            logger.info(f"drain 제한 시간이 지나 연결 {len(remaining)}개를 끊습니다")
+        for connection in remaining:
+            connection.abort()
+
+    def _listen(self, listen: Address) -> socket.socket:
+        listener = socket.socket(address_family(listen[0]), socket.SOCK_STREAM)
+        try:
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            listener.bind(listen)
+            listener.listen(self.backlog)
+            listener.setblocking(False)
+        except OSError:
+            listener.close()
+            raise
+        return listener
+
+    async def stop(self) -> None:
+        """listen 소켓과 진행 중인 모든 연결을 닫습니다."""
+        self._pause_accepting()
+        for listener in self._listeners.values():
+            listener.close()
+        self._listeners.clear()
+        for pool in self._pools.values():
+            pool.close()
+        self._pools.clear()
+        for connection in list(self._connections):
+            connection.abort()
+        self.pipe_pool.close()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """규칙 이름(listen 주소)별 카운터"""
+        result = {name: stats.to_dict() for name, stats in self._stats.items()}
+        for listen, pool in self._pools.items():
+            result[format_address(listen)]["pool_idle"] = pool.idle
+        return result
+
+    def _resume_accepting(self) -> None:
+        if self._accepting:
+            return
+        self._accepting = True
+        for listen, listener in self._listeners.items():
+            self.loop.add_reader(listener.fileno(), self._on_accept, listener, listen)
+
+    def _pause_accepting(self) -> None:
+        if not self._accepting:
+            return
+        self._accepting = False
+        for listener in self._listeners.values():
+            self.loop.remove_reader(listener.fileno())
+
+    def _on_accept(self, listener: socket.socket, listen: Address) -> None:
+        for _ in range(_ACCEPT_BATCH):
+            if len(self._connections) >= self.max_connections:
+                # 연결 수 한도: 자리가 날 때까지 accept를 멈추고 나머지는 커널 backlog에 둡니다
+                logger.warning(f"동시 연결 한도({self.max_connections}) 도달, 새 연결 대기")
+                self._pause_accepting()
+                return
+            try:
+                client, _ = listener.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                # EMFILE 등: 로그만 남기고 다음 이벤트에서 다시 시도
+                logger.error(f"{format_address(listen)}: accept 실패: {e}")
+                return
+            accepted_at = time.perf_counter()
+            rule = self.table.lookup(listen)
+            if rule is None:
+                client.close()
+                continue
+            stats = self._stats[rule.name]
+            client.setblocking(False)
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            connection = _Connection(self, rule, stats, client, accepted_at)
+            self._connections.add(connection)
+            stats.connections += 1
+            stats.active += 1
+            pool = self._pools.get(listen)
+            upstream = pool.acquire() if pool is not None else None
+            if upstream is not None:
+                stats.pool_hits += 1
+                connection.start(upstream)
+            else:
+                if pool is not None:
+                    stats.pool_misses += 1
+                connection.connect(self._targets[rule.target])
+
+    def _on_connection_closed(self, connection: _Connection) -> None:
+        self._connections.discard(connection)
+        connection.stats.active -= 1
+        if not self._accepting and self._listeners and len(self._connections) < self.max_connections:
+            self._resume_accepting()
@@ -0,0 +1,207 @@
+import collections
+import errno
+import logging
+import socket
+import time
+from typing import Callable, Deque, Optional, Set, Tuple
+
+from devredirect.rules import Address, address_family, format_address
+
+logger = logging.getLogger(__name__)
+
+ConnectCallback = Callable[["PendingConnect", Optional[socket.socket], Optional[Exception]], None]
+
+
+class PendingConnect:
+    """
+    논블로킹 connect 하나. 끝나면 callback(self, socket, None) 또는 callback(self, None, 오류)를 부릅니다.
+
+    이벤트 루프의 add_writer와 call_later만 쓰므로 코루틴/Task를 만들지 않습니다.
+    바로 연결되거나 실패하면 생성자 안에서 callback이 불릴 수 있습니다.
+    """
+
+    __slots__ = ("loop", "sock", "fd", "timer", "callback", "timeout")
+
+    def __init__(self, loop, target: Address, timeout: float, callback: ConnectCallback):
+        self.loop = loop
+        self.callback = callback
+        self.timeout = timeout
+        self.timer = None
+        self.sock = socket.socket(address_family(target[0]), socket.SOCK_STREAM)
+        self.fd = self.sock.fileno()
+        self.sock.setblocking(False)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        err = self.sock.connect_ex(target)
+        if err == 0:
+            self._finish(None)
+        elif err in (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN):
+            loop.add_writer(self.fd, self._on_ready)
+            self.timer = loop.call_later(timeout, self._on_timeout)
+        else:
+            self._finish(OSError(err, errno.errorcode.get(err, str(err))))
+
+    def _on_ready(self) -> None:
+        self.loop.remove_writer(self.fd)
+        err = self.sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        self._finish(OSError(err, errno.errorcode.get(err, str(err))) if err else None)
+
+    def _on_timeout(self) -> None:
+        self.timer = None
+        self.loop.remove_writer(self.fd)
+        self._finish(TimeoutError(f"{self.timeout:g}초 안에 연결되지 않음"))
+
+    def _finish(self, error: Optional[Exception]) -> None:
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        callback, self.callback = self.callback, None
+        if callback is None:
+            return
+        if error is None:
+            callback(self, self.sock, None)
+        else:
+            self.sock.close()
+            callback(self, None, error)
+
+    def cancel(self) -> None:
+        """진행 중이면 멈추고 소켓을 닫습니다. callback은 부르지 않습니다."""
+        if self.callback is None:
+            return
+        self.callback = None
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        self.loop.remove_writer(self.fd)
+        self.sock.close()
+
+
+def is_alive(sock: socket.socket) -> bool:
+    """
+    대기 중인 소켓이 아직 쓸 만한지 MSG_PEEK로 확인합니다 (데이터는 소비하지 않음).
+
+    서버가 먼저 인사말을 보내는 프로토콜(MySQL 등)이면 읽을 데이터가 있어도 정상으로 보고,
+    그 데이터는 넘겨받은 클라이언트에게 그대로 전달됩니다.
+    """
+    try:
+        return sock.recv(1, socket.MSG_PEEK | socket.MSG_DONTWAIT) != b""
+    except BlockingIOError:
+        return True
+    except OSError:
+        return False
+
+
+class UpstreamPool:
+    """
+    규칙 하나의 대상에 미리 연결해 둔 소켓 모음.
+
+    accept 직후 acquire()로 연결된 소켓을 바로 넘겨받으면 대상과의 TCP 핸드셰이크(원격 DB라면
+    왕복 한 번 이상)를 기다리지 않습니다. 꺼낸 만큼 백그라운드에서 다시 채우고, max_idle초보다 오래
+    대기한 소켓은 닫고 새로 엽니다. PostgreSQL은 시작 메시지 없이 authentication_timeout(기본 60초)이
+    지나면 연결을 끊으므로 max_idle은 그보다 짧아야 합니다.
+    """
+
+    def __init__(self, loop, target: Address, size: int, max_idle: float = 30.0,
+                 connect_timeout: float = 5.0):
+        self.loop = loop
+        self.target = target
+        self.size = size
+        self.max_idle = max_idle
+        self.connect_timeout = connect_timeout
+        self.errors = 0
+        self._idle: Deque[Tuple[socket.socket, float]] = collections.deque()
+        self._connecting: Set[PendingConnect] = set()
+        self._failures = 0
+        self._retry_timer = None
+        self._sweep_timer = None
+        self._closed = False
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+    def start(self) -> None:
+        self._fill()
+        self._sweep_timer = self.loop.call_later(self.max_idle / 2, self._sweep)
+
+    def acquire(self) -> Optional[socket.socket]:
+        """
+        대기 중인 연결 하나. 없으면 None (호출한 쪽이 직접 연결합니다).
+
+        가장 최근에 연결된 소켓부터 꺼내고, 그 사이 대상이 끊은 소켓은 버립니다.
+        """
+        while self._idle:
+            sock, _ = self._idle.pop()
+            if is_alive(sock):
+                self._schedule_fill()
+                return sock
+            sock.close()
+        self._schedule_fill()
+        return None
+
+    def close(self) -> None:
+        self._closed = True
+        for timer in (self._retry_timer, self._sweep_timer):
+            if timer is not None:
+                timer.cancel()
+        for pending in list(self._connecting):
+            pending.cancel()
+        self._connecting.clear()
+        while self._idle:
+            self._idle.pop()[0].close()
+
+    def _schedule_fill(self) -> None:
+        # 지금 처리 중인 accept를 늦추지 않도록 다음 루프 차례에 채웁니다
+        if self._retry_timer is None:
+            self.loop.call_soon(self._fill)
+
+    def _fill(self) -> None:
+        if self._closed or self._retry_timer is not None:
+            return
+        while len(self._idle) + len(self._connecting) < self.size:
+            try:
+                pending = PendingConnect(self.loop, self.target, self.connect_timeout, self._on_connected)
+            except OSError as e:
+                # 소켓을 만들 수 없음 (EMFILE 등)
+                self._on_connected(None, None, e)
+                return
+            if pending.callback is not None:
+                self._connecting.add(pending)
+            elif self._retry_timer is not None:
+                return
+
+    def _on_connected(self, pending: Optional[PendingConnect], sock: Optional[socket.socket],
+                      error: Optional[Exception]) -> None:
+        self._connecting.discard(pending)
+        if self._closed:
+            if sock is not None:
+                sock.close()
+            return
+        if error is not None:
+            self.errors += 1
+            self._failures += 1
+            delay = min(30.0, 0.1 * 2 ** min(self._failures, 10))
+            if self._failures == 1 or self._failures % 10 == 0:
+                logger.warning(f"대상 {format_address(self.target)} 미리 연결 실패 ({self._failures}회), "
+                               f"{delay:.1f}초 뒤 재시도: {error}")
+            if self._retry_timer is None:
+                self._retry_timer = self.loop.call_later(delay, self._retry)
+            return
+        self._failures = 0
+        self._idle.append((sock, time.monotonic()))
+
+    def _retry(self) -> None:
+        self._retry_timer = None
+        self._fill()
+
+    def _sweep(self) -> None:
+        """max_idle을 넘긴 소켓을 닫고 다시 채웁니다."""
+        deadline = time.monotonic() - self.max_idle
+        expired = 0
+        while self._idle and self._idle[0][1] < deadline:
+            self._idle.popleft()[0].close()
+            expired += 1
+        if expired:
+            logger.debug(f"대상 {format_address(self.target)} 대기 연결 {expired}개 만료")
+            self._fill()
+        self._sweep_timer = self.loop.call_later(self.max_idle / 2, self._sweep)
@@ -0,0 +1,203 @@
+import fcntl
+import json
+import logging
+import os
+import re
+import signal
+import time
+from typing import List, Optional
+
+from devredirect.rules import Rule, TCP, format_address
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE = "default"
+
+_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+def home_dir() -> str:
+    """프로필과 pid 파일을 두는 디렉토리 (DEVREDIRECT_HOME, 기본 ~/.devredirect)"""
+    return os.getenv("DEVREDIRECT_HOME") or os.path.join(os.path.expanduser("~"), ".devredirect")
+
+
+def _check_name(name: str) -> str:
+    if not _NAME_PATTERN.match(name) or name.startswith("."):
+        raise ValueError(f"프로필 이름은 영문, 숫자, '-', '_', '.'만 쓸 수 있습니다: {name!r}")
+    return name
+
+
+def profile_path(name: str) -> str:
+    return os.path.join(home_dir(), f"{_check_name(name)}.json")
+
+
+def pid_path(name: str) -> str:
+    return os.path.join(home_dir(), f"{_check_name(name)}.pid")
+
+
+def list_profiles() -> List[str]:
+    try:
+        names = os.listdir(home_dir())
+    except FileNotFoundError:
+        return []
+    return sorted(name[:-5] for name in names if name.endswith(".json"))
+
+
+def load_profile(name: str) -> List[Rule]:
+    """
+    프로필의 규칙 목록. 파일이 없으면 빈 목록입니다.
+
+        {"rules": [{"listen": "203.0.113.5:5432", "target": "10.0.0.5:5432"},
+                   {"listen": "127.0.0.1:5353", "target": "10.0.0.2:53", "protocol": "udp"}]}
+
+    protocol이 없으면 TCP입니다.
+
+    Raises:
+        ValueError: 파일 형식이나 주소가 잘못된 경우
+    """
+    try:
+        with open(profile_path(name), encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return []
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise ValueError(f"프로필 {name}을 읽을 수 없습니다: {e}") from e
+
+    items = data.get("rules", []) if isinstance(data, dict) else None
+    if not isinstance(items, list):
+        raise ValueError(f"프로필 {name}의 형식이 잘못되었습니다: {{\"rules\": [...]}} 객체가 필요합니다")
+    rules = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            raise ValueError(f"프로필 {name}의 {index + 1}번째 규칙이 객체가 아닙니다: {item!r}")
+        fields = {key: item.get(key) for key in ("listen", "target")}
+        fields["protocol"] = item.get("protocol", TCP)
+        for key, value in fields.items():
+            if not isinstance(value, str):
+                raise ValueError(f"프로필 {name}의 {index + 1}번째 규칙에 {key} 문자열이 없습니다: {item!r}")
+        rules.append(Rule.parse(fields["listen"], fields["target"], fields["protocol"]))
+    return rules
+
+
+def save_profile(name: str, rules: List[Rule]) -> str:
+    """
+    프로필을 저장하고 경로를 반환합니다.
+
+    임시 파일에 쓴 뒤 os.replace로 바꿔 끼우므로, 실행 중인 포워더가 반쯤 쓰인 파일을 읽지 않습니다.
+    """
+    path = profile_path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = {"rules": [_rule_to_dict(rule) for rule in rules]}
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+    os.replace(temp_path, path)
+    return path
+
+
+def _rule_to_dict(rule: Rule) -> dict:
+    item = {"listen": format_address(rule.listen), "target": format_address(rule.target)}
+    if rule.protocol != TCP:
+        item["protocol"] = rule.protocol
+    return item
+
+
+class PidLock:
+    """
+    run이 실행되는 동안 pid 파일에 잡아 두는 flock.
+
+    pid 파일이 남아 있어도 잠금이 없으면 실행 중이 아닌 것으로 봅니다. 비정상 종료로 남은 pid 파일이나
+    그 pid를 다른 프로세스가 다시 쓰게 된 경우에도 잘못된 프로세스에 신호를 보내거나 run을 막지 않습니다.
+    잠금은 프로세스가 끝나면 커널이 풀어 줍니다.
+    """
+
+    __slots__ = ("path", "_fd")
+
+    def __init__(self, path: str, fd: int):
+        self.path = path
+        self._fd = fd
+
+    def release(self) -> None:
+        """pid 파일을 지우고 잠금을 풉니다 (잠금을 쥔 채로 지워 다음 run과 엇갈리지 않게 합니다)."""
+        if self._fd < 0:
+            return
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+        os.close(self._fd)
+        self._fd = -1
+
+
+def _try_lock(fd: int, attempts: int = 5) -> bool:
+    # read_pid()가 남은 pid 파일을 확인하느라 잠깐 공유 잠금을 쥐고 있을 수 있어 몇 번 다시 시도합니다
+    for attempt in range(attempts):
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            if attempt < attempts - 1:
+                time.sleep(0.02)
+    return False
+
+
+def lock_pid(name: str) -> Optional[PidLock]:
+    """
+    pid 파일을 잠그고 현재 pid를 기록합니다.
+
+    Returns:
+        잠금 (종료할 때 release()). 이미 다른 프로세스가 실행 중이면 None
+    """
+    path = pid_path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    while True:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_CLOEXEC, 0o644)
+        if not _try_lock(fd):
+            os.close(fd)
+            return None
+        try:
+            same_file = os.fstat(fd).st_ino == os.stat(path).st_ino
+        except FileNotFoundError:
+            same_file = False
+        if same_file:
+            break
+        # 잠그기 직전에 이전 run이 파일을 지웠음: 새 파일로 다시 시도
+        os.close(fd)
+
+    os.ftruncate(fd, 0)
+    os.write(fd, f"{os.getpid()}\n".encode())
+    return PidLock(path, fd)
+
+
+def read_pid(name: str) -> Optional[int]:
+    """프로필을 실행 중인 포워더의 pid. pid 파일이 잠겨 있지 않으면(실행 중이 아니면) None"""
+    try:
+        fd = os.open(pid_path(name), os.O_RDONLY | os.O_CLOEXEC)
+    except OSError:
+        return None
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+        except BlockingIOError:
+            pass  # run이 잠금을 쥐고 있음: 실행 중
+        else:
+            return None  # 남은 pid 파일
+        return int(os.read(fd, 32).decode().strip())
+    except (OSError, ValueError):
+        return None
+    finally:
+        os.close(fd)
+
+
+def notify_reload(name: str) -> Optional[int]:
+    """실행 중인 포워더에 SIGHUP을 보내 프로필을 다시 읽게 합니다. 보낸 pid를 반환합니다."""
+    pid = read_pid(name)
+    if pid is None or not hasattr(signal, "SIGHUP"):
+        return None
+    try:
+        os.kill(pid, signal.SIGHUP)
+    except OSError as e:
+        logger.warning(f"포워더(pid {pid})에 다시 읽기 신호를 보내지 못했습니다: {e}")
+        return None
+    return pid
@@ -0,0 +1,250 @@
+import errno
+import fcntl
+import logging
+import os
+import socket
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SPLICE_SUPPORTED = hasattr(os, "splice")
+
+_SPLICE_FLAGS = (os.SPLICE_F_MOVE | os.SPLICE_F_NONBLOCK) if SPLICE_SUPPORTED else 0
+
+# 한 번의 이벤트 루프 깨어남에서 한 방향으로 옮길 최대 바이트 (다른 연결이 굶지 않도록)
+MAX_BYTES_PER_WAKEUP = 256 * 1024
+
+
+class BufferPool:
+    """
+    고정 크기 bytearray의 재사용 목록.
+
+    splice를 쓸 수 없을 때 연결마다 버퍼를 새로 만들지 않고, 연결이 끝나면 돌려받아
+    다음 연결에 다시 씁니다. max_free개를 넘는 버퍼는 버립니다.
+    """
+
+    def __init__(self, size: int = 64 * 1024, max_free: int = 256):
+        self.size = size
+        self.max_free = max_free
+        self._free: List[bytearray] = []
+
+    def acquire(self) -> bytearray:
+        return self._free.pop() if self._free else bytearray(self.size)
+
+    def release(self, buffer: bytearray) -> None:
+        if len(self._free) < self.max_free:
+            self._free.append(buffer)
+
+
+class PipePool:
+    """
+    splice용 파이프 (읽기 fd, 쓰기 fd)의 재사용 목록.
+
+    비어 있는 상태로 돌려받은 파이프만 다시 쓰고, 데이터가 남은 채 끝난 연결의 파이프는 닫습니다.
+    """
+
+    def __init__(self, size: int = 0, max_free: int = 256):
+        self.size = size
+        self.max_free = max_free
+        self._free: List[Tuple[int, int]] = []
+
+    def acquire(self) -> Tuple[int, int]:
+        if self._free:
+            return self._free.pop()
+        read_fd, write_fd = os.pipe2(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.size:
+            try:
+                fcntl.fcntl(write_fd, fcntl.F_SETPIPE_SZ, self.size)
+            except OSError as e:
+                logger.debug(f"파이프 크기 변경 실패 ({self.size}바이트): {e}")
+        return read_fd, write_fd
+
+    def capacity(self, pipe: Tuple[int, int]) -> int:
+        try:
+            return fcntl.fcntl(pipe[1], fcntl.F_GETPIPE_SZ)
+        except OSError:
+            return 64 * 1024
+
+    def release(self, pipe: Tuple[int, int], clean: bool) -> None:
+        if clean and len(self._free) < self.max_free:
+            self._free.append(pipe)
+        else:
+            os.close(pipe[0])
+            os.close(pipe[1])
+
+    def close(self) -> None:
+        while self._free:
+            read_fd, write_fd = self._free.pop()
+            os.close(read_fd)
+            os.close(write_fd)
+
+
+class Pump:
+    """
+    한 방향(src → dst)의 바이트 전달.
+
+    src가 읽을 수 있으면 버퍼(또는 파이프)가 찰 때까지 읽고 바로 dst로 씁니다. dst가 다 받지
+    못하면 src 읽기를 멈추고 dst가 쓸 수 있을 때 이어서 씁니다 (배압). src가 EOF를 보내면 남은
+    데이터를 모두 쓴 뒤 dst에 SHUT_WR을 보내 반대 방향은 계속 열어 둡니다 (half-close).
+    """
+
+    __slots__ = ("loop", "src", "dst", "src_fd", "dst_fd", "pending", "capacity", "eof", "done",
+                 "reading", "writing", "on_bytes", "on_done", "on_error")
+
+    def __init__(self, loop, src: socket.socket, dst: socket.socket, capacity: int,
+                 on_bytes: Callable[[int], None], on_done: Callable[["Pump"], None],
+                 on_error: Callable[[OSError], None]):
+        self.loop = loop
+        self.src = src
+        self.dst = dst
+        self.src_fd = src.fileno()
+        self.dst_fd = dst.fileno()
+        self.pending = 0
+        self.capacity = capacity
+        self.eof = False
+        self.done = False
+        self.reading = False
+        self.writing = False
+        self.on_bytes = on_bytes
+        self.on_done = on_done
+        self.on_error = on_error
+
+    def start(self) -> None:
+        self.reading = True
+        self.loop.add_reader(self.src_fd, self._on_readable)
+
+    def stop(self) -> None:
+        if self.reading:
+            self.loop.remove_reader(self.src_fd)
+            self.reading = False
+        if self.writing:
+            self.loop.remove_writer(self.dst_fd)
+            self.writing = False
+
+    def _has_room(self) -> bool:
+        return self.pending < self.capacity
+
+    def _fill(self) -> Optional[int]:
+        """src에서 읽은 바이트 수. EOF면 0, 읽을 것이 없으면 None"""
+        raise NotImplementedError
+
+    def _drain(self) -> Optional[int]:
+        """dst에 쓴 바이트 수. dst가 받을 수 없으면 None"""
+        raise NotImplementedError
+
+    def _on_readable(self) -> None:
+        try:
+            budget = MAX_BYTES_PER_WAKEUP
+            while budget > 0 and self._has_room():
+                n = self._fill()
+                if n is None:
+                    break
+                if n == 0:
+                    self.eof = True
+                    self.loop.remove_reader(self.src_fd)
+                    self.reading = False
+                    break
+                self.pending += n
+                budget -= n
+                self.on_bytes(n)
+            self._flush()
+        except OSError as e:
+            self.on_error(e)
+
+    def _on_writable(self) -> None:
+        try:
+            self._flush()
+        except OSError as e:
+            self.on_error(e)
+
+    def _flush(self) -> None:
+        while self.pending:
+            n = self._drain()
+            if n is None:
+                break
+            self.pending -= n
+
+        if self.pending:
+            # 배압: dst가 밀려 있는 동안 src를 읽지 않습니다
+            if self.reading:
+                self.loop.remove_reader(self.src_fd)
+                self.reading = False
+            if not self.writing:
+                self.loop.add_writer(self.dst_fd, self._on_writable)
+                self.writing = True
+            return
+
+        if self.writing:
+            self.loop.remove_writer(self.dst_fd)
+            self.writing = False
+        if self.eof:
+            if not self.done:
+                self.done = True
+                try:
+                    self.dst.shutdown(socket.SHUT_WR)
+                except OSError as e:
+                    if e.errno != errno.ENOTCONN:
+                        raise
+                self.on_done(self)
+        elif not self.reading:
+            self.loop.add_reader(self.src_fd, self._on_readable)
+            self.reading = True
+
+
+class SplicePump(Pump):
+    """커널 파이프를 거쳐 socket → pipe → socket으로 옮깁니다 (사용자 공간 복사 없음, Linux)."""
+
+    __slots__ = ("pipe",)
+
+    def __init__(self, loop, src, dst, pipe: Tuple[int, int], capacity: int, on_bytes, on_done, on_error):
+        super().__init__(loop, src, dst, capacity, on_bytes, on_done, on_error)
+        self.pipe = pipe
+
+    def _fill(self) -> Optional[int]:
+        try:
+            return os.splice(self.src_fd, self.pipe[1], self.capacity - self.pending, flags=_SPLICE_FLAGS)
+        except BlockingIOError:
+            return None
+
+    def _drain(self) -> Optional[int]:
+        try:
+            return os.splice(self.pipe[0], self.dst_fd, self.pending, flags=_SPLICE_FLAGS)
+        except BlockingIOError:
+            return None
+
+
+class BufferPump(Pump):
+    """미리 할당한 버퍼 하나로 recv_into/send를 반복합니다 (splice를 쓸 수 없을 때)."""
+
+    __slots__ = ("buffer", "view", "start_index", "end_index")
+
+    def __init__(self, loop, src, dst, buffer: bytearray, on_bytes, on_done, on_error):
+        super().__init__(loop, src, dst, len(buffer), on_bytes, on_done, on_error)
+        self.buffer = buffer
+        self.view = memoryview(buffer)
+        self.start_index = 0
+        self.end_index = 0
+
+    def _has_room(self) -> bool:
+        return self.end_index < self.capacity
+
+    def _fill(self) -> Optional[int]:
+        try:
+            n = self.src.recv_into(self.view[self.end_index:])
+        except BlockingIOError:
+            return None
+        self.end_index += n
+        return n
+
+    def _drain(self) -> Optional[int]:
+        try:
+            n = self.dst.send(self.view[self.start_index:self.end_index])
+        except BlockingIOError:
+            return None
+        self.start_index += n
+        if self.start_index == self.end_index:
+            self.start_index = self.end_index = 0
+        return n
+
+    def release_view(self) -> None:
+        self.view.release()
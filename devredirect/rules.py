@@ -0,0 +1,87 @@
+import ipaddress
+import socket
+from typing import Tuple
+
+Address = Tuple[str, int]
+
+TCP = "tcp"
+UDP = "udp"
+PROTOCOLS = (TCP, UDP)
+
+
+def parse_address(text: str) -> Address:
+    """
+    "IP:PORT" 또는 "[IPv6]:PORT" 문자열을 (host, port)로 바꿉니다.
+
+    IP는 표준 표기로 바꿔 "::1"과 "0:0::1"처럼 같은 주소가 규칙 테이블에서 다른 키가 되지 않게 합니다.
+
+    Raises:
+        ValueError: 형식이 잘못되었거나 포트가 범위를 벗어난 경우
+    """
+    text = text.strip()
+    if text.startswith("["):
+        host, sep, port = text[1:].partition("]:")
+    else:
+        host, sep, port = text.rpartition(":")
+    if not sep or not host or not port.isdigit():
+        raise ValueError(f"주소 형식이 잘못되었습니다: {text!r} (예: 203.0.113.5:5432)")
+    port_number = int(port)
+    if not 0 < port_number < 65536:
+        raise ValueError(f"포트 범위를 벗어났습니다: {port_number}")
+    try:
+        host = ipaddress.ip_address(host).compressed
+    except ValueError:
+        pass  # 호스트 이름은 그대로 둡니다
+    return host, port_number
+
+
+def format_address(address: Address) -> str:
+    host, port = address[:2]
+    return f"[{host}]:{port}" if ":" in host else f"{host}:{port}"
+
+
+def address_family(host: str) -> int:
+    return socket.AF_INET6 if ":" in host else socket.AF_INET
+
+
+async def resolve(loop, address: Address, socktype: int) -> Address:
+    """
+    대상 호스트 이름을 IP 주소로 바꿉니다.
+
+    포워더는 규칙을 적용할 때만 이 함수를 불러, 연결(데이터그램)마다 DNS 조회를 하지 않습니다.
+    """
+    infos = await loop.getaddrinfo(address[0], address[1], type=socktype)
+    return infos[0][4][:2]
+
+
+class Rule:
+    """리다이렉트 규칙 하나: listen 주소로 들어온 연결(UDP는 데이터그램)을 target으로 전달합니다."""
+
+    __slots__ = ("listen", "target", "protocol")
+
+    def __init__(self, listen: Address, target: Address, protocol: str = TCP):
+        if protocol not in PROTOCOLS:
+            raise ValueError(f"지원하지 않는 프로토콜입니다: {protocol!r} (가능한 값: {', '.join(PROTOCOLS)})")
+        self.listen = listen
+        self.target = target
+        self.protocol = protocol
+
+    @classmethod
+    def parse(cls, listen: str, target: str, protocol: str = TCP) -> "Rule":
+        return cls(parse_address(listen), parse_address(target), protocol)
+
+    @property
+    def name(self) -> str:
+        """통계/로그용 이름. TCP는 listen 주소 그대로, UDP는 뒤에 /udp를 붙입니다."""
+        name = format_address(self.listen)
+        return name if self.protocol == TCP else f"{name}/{self.protocol}"
+
+    def __repr__(self) -> str:
+        return f"Rule({self.name} -> {format_address(self.target)})"
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, Rule) and self.listen == other.listen and self.target == other.target
+                and self.protocol == other.protocol)
+
+    def __hash__(self) -> int:
+        return hash((self.listen, self.target, self.protocol))
@@ -0,0 +1,87 @@
+import threading
+from array import array
+from typing import Dict, Any
+
+
+class RuleStats:
+    """
+    규칙 하나의 누적 카운터.
+
+    바이트 수는 포워더의 이벤트 루프 스레드에서만 더해지고, 연결 준비 시간은 최근
+    latency_window개만 고정 크기 배열에 보관해 백분위수를 계산합니다 (연결마다 할당 없음).
+    """
+
+    __slots__ = ("connections", "active", "connect_errors", "bytes_up", "bytes_down", "pool_hits", "pool_misses",
+                 "_latencies", "_latency_index", "_latency_count", "_lock")
+
+    def __init__(self, latency_window: int = 1024):
+        self.connections = 0
+        self.active = 0
+        self.connect_errors = 0
+        self.bytes_up = 0      # 클라이언트 → 대상
+        self.bytes_down = 0    # 대상 → 클라이언트
+        self.pool_hits = 0     # 미리 연결해 둔 소켓을 넘겨받은 연결
+        self.pool_misses = 0   # 풀이 비어 직접 연결한 연결
+        self._latencies = array("d", bytes(8 * latency_window))
+        self._latency_index = 0
+        self._latency_count = 0
+        self._lock = threading.Lock()
+
+    def record_setup(self, milliseconds: float) -> None:
+        """accept부터 대상 연결이 준비될 때까지 걸린 시간 (ms)"""
+        with self._lock:
+            self._latencies[self._latency_index] = milliseconds
+            self._latency_index = (self._latency_index + 1) % len(self._latencies)
+            self._latency_count = min(self._latency_count + 1, len(self._latencies))
+
+    def _percentile(self, ordered, q: float) -> float:
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            ordered = sorted(self._latencies[:self._latency_count])
+        return {
+            "connections": self.connections,
+            "active": self.active,
+            "connect_errors": self.connect_errors,
+            "bytes_up": self.bytes_up,
+            "bytes_down": self.bytes_down,
+            "pool_hits": self.pool_hits,
+            "pool_misses": self.pool_misses,
+            "setup_p50_ms": round(self._percentile(ordered, 50), 3),
+            "setup_p99_ms": round(self._percentile(ordered, 99), 3),
+            "setup_max_ms": round(ordered[-1], 3) if ordered else 0.0,
+        }
+
+
+class UdpRuleStats(RuleStats):
+    """
+    UDP 규칙 하나의 누적 카운터.
+
+    connections/active는 흐름(클라이언트 주소) 수이고, 받는 쪽 소켓 버퍼가 가득 차거나 흐름 한도에 걸려
+    버린 데이터그램은 dropped로 셉니다.
+    """
+
+    __slots__ = ("datagrams_up", "datagrams_down", "dropped", "evicted")
+
+    def __init__(self):
+        super().__init__(latency_window=1)
+        self.datagrams_up = 0
+        self.datagrams_down = 0
+        self.dropped = 0
+        self.evicted = 0   # 유휴 시간이 지나 정리된 흐름
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "flows": self.connections,
+            "active_flows": self.active,
+            "evicted": self.evicted,
+            "bytes_up": self.bytes_up,
+            "bytes_down": self.bytes_down,
+            "datagrams_up": self.datagrams_up,
+            "datagrams_down": self.datagrams_down,
+            "dropped": self.dropped,
+            "errors": self.connect_errors,
+        }
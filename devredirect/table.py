@@ -0,0 +1,59 @@
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from devredirect.rules import Address, Rule, TCP, format_address
+
+
+class RuleTable:
+    """
+    (프로토콜, listen 주소) → Rule 해시 색인. 한 번 만들면 바꾸지 않습니다.
+
+    규칙을 추가/삭제할 때는 with_rule/without으로 새 테이블을 만들어 통째로 바꿔 끼우므로,
+    전달 경로는 잠금 없이 lookup 한 번(dict 조회)으로 대상을 찾고 규칙 수와 무관하게 같은 비용이 듭니다.
+    TCP와 UDP 규칙은 같은 listen 주소를 함께 쓸 수 있습니다.
+    """
+
+    __slots__ = ("_index",)
+
+    def __init__(self, rules: Iterable[Rule] = ()):
+        index: Dict[str, Dict[Address, Rule]] = {}
+        for rule in rules:
+            by_listen = index.setdefault(rule.protocol, {})
+            if rule.listen in by_listen:
+                raise ValueError(f"listen 주소가 중복됩니다: {rule.name}")
+            by_listen[rule.listen] = rule
+        self._index = index
+
+    def lookup(self, listen: Address, protocol: str = TCP) -> Optional[Rule]:
+        by_listen = self._index.get(protocol)
+        return by_listen.get(listen) if by_listen is not None else None
+
+    def with_rule(self, rule: Rule) -> "RuleTable":
+        """rule을 추가한 새 테이블. 같은 프로토콜, 같은 listen 주소의 규칙이 있으면 대상만 바뀝니다."""
+        table = RuleTable()
+        table._index = {protocol: dict(by_listen) for protocol, by_listen in self._index.items()}
+        table._index.setdefault(rule.protocol, {})[rule.listen] = rule
+        return table
+
+    def without(self, listen: Address, protocol: str = TCP) -> "RuleTable":
+        """
+        listen 주소의 규칙을 뺀 새 테이블.
+
+        Raises:
+            KeyError: 해당 listen 주소의 규칙이 없는 경우
+        """
+        if self.lookup(listen, protocol) is None:
+            raise KeyError(format_address(listen))
+        table = RuleTable()
+        table._index = {key: dict(by_listen) for key, by_listen in self._index.items()}
+        del table._index[protocol][listen]
+        return table
+
+    def rules(self) -> List[Rule]:
+        return list(self)
+
+    def __iter__(self) -> Iterator[Rule]:
+        for by_listen in self._index.values():
+            yield from by_listen.values()
+
+    def __len__(self) -> int:
+        return sum(len(by_listen) for by_listen in self._index.values())
@@ -0,0 +1,210 @@
+"""
+TCP 포워더(Forwarder) 테스트: 127.0.0.1의 로컬 소켓만 사용합니다.
+
+    python -m pytest -q devredirect
+"""
+import asyncio
+import os
+import socket
+from typing import Tuple
+
+import pytest
+
+from devredirect.forwarder import Forwarder
+from devredirect.pump import SPLICE_SUPPORTED, BufferPump, SplicePump
+from devredirect.rules import Rule
+
+PUMPS = [
+    pytest.param(True, SplicePump, id="splice",
+                 marks=pytest.mark.skipif(not SPLICE_SUPPORTED, reason="splice 미지원")),
+    pytest.param(False, BufferPump, id="buffer"),
+]
+
+
+def free_port(kind: int = socket.SOCK_STREAM) -> int:
+    with socket.socket(socket.AF_INET, kind) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def start_upstream(trailer: bytes = b"BYE"):
+    """
+    받은 데이터를 그대로 돌려주고, 클라이언트가 쓰기를 닫으면(EOF) trailer를 보낸 뒤 닫는 서버.
+
+    Returns:
+        (서버, 포트, 받은 연결의 writer 리스트)
+    """
+    accepted = []
+
+    async def handle(reader, writer):
+        accepted.append(writer)
+        while True:
+            chunk = await reader.read(65536)
+            if not chunk:
+                break
+            writer.write(chunk)
+            await writer.drain()
+        writer.write(trailer)
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1], accepted
+
+
+async def start_forwarder(target_port: int, **options) -> Tuple[Forwarder, int]:
+    port = free_port()
+    forwarder = Forwarder([Rule.parse(f"127.0.0.1:{port}", f"127.0.0.1:{target_port}")], **options)
+    await forwarder.start()
+    return forwarder, port
+
+
+async def wait_for(condition, timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("조건을 기다리다 시간이 초과되었습니다")
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.parametrize("use_splice, pump_type", PUMPS)
+def test_round_trip_and_half_close(use_splice, pump_type):
+    """클라이언트가 쓰기를 닫은(half-close) 뒤에도 대상이 보내는 나머지 데이터를 끝까지 전달합니다."""
+
+    async def scenario():
+        server, upstream_port, _ = await start_upstream()
+        forwarder, port = await start_forwarder(upstream_port, use_splice=use_splice)
+        try:
+            payload = os.urandom(3 * 1024 * 1024)
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            await wait_for(lambda: any(connection.pumps for connection in forwarder._connections))
+            connection = next(iter(forwarder._connections))
+            assert all(isinstance(pump, pump_type) for pump in connection.pumps)
+
+            async def send():
+                writer.write(payload)
+                await writer.drain()
+                writer.write_eof()
+
+            sending = asyncio.ensure_future(send())
+            received = await asyncio.wait_for(reader.read(-1), 10)
+            await sending
+            writer.close()
+            assert received == payload + b"BYE"
+
+            await wait_for(lambda: not forwarder._connections)
+            stats = forwarder.stats()[f"127.0.0.1:{port}"]
+            assert stats["connections"] == 1 and stats["active"] == 0
+            assert stats["bytes_up"] == len(payload)
+            assert stats["bytes_down"] == len(payload) + 3
+        finally:
+            await forwarder.stop()
+            server.close()
+
+    asyncio.run(scenario())
+
+
+def test_unreachable_target_closes_client():
+    """대상에 연결할 수 없으면 클라이언트 연결을 닫고 connect_errors를 셉니다."""
+
+    async def scenario():
+        forwarder, port = await start_forwarder(free_port(), connect_timeout=1.0)
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            assert await asyncio.wait_for(reader.read(-1), 3) == b""
+            writer.close()
+            assert forwarder.stats()[f"127.0.0.1:{port}"]["connect_errors"] == 1
+        finally:
+            await forwarder.stop()
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("use_splice, pump_type", PUMPS)
+def test_max_connections_pauses_and_resumes_accept(use_splice, pump_type):
+    """동시 연결 한도에 닿으면 accept를 멈추고, 연결이 끝나 자리가 나면 다시 받습니다."""
+
+    async def scenario():
+        server, upstream_port, accepted = await start_upstream()
+        forwarder, port = await start_forwarder(upstream_port, use_splice=use_splice, max_connections=1)
+        try:
+            first_reader, first_writer = await asyncio.open_connection("127.0.0.1", port)
+            await wait_for(lambda: len(accepted) == 1)
+
+            # 두 번째 연결은 커널 backlog에서 기다리고 대상에는 연결되지 않음
+            second_reader, second_writer = await asyncio.open_connection("127.0.0.1", port)
+            second_writer.write(b"hello")
+            second_writer.write_eof()
+            await asyncio.sleep(0.2)
+            assert not forwarder._accepting
+            assert len(accepted) == 1
+
+            first_writer.write_eof()
+            assert await asyncio.wait_for(first_reader.read(-1), 3) == b"BYE"
+            first_writer.close()
+
+            assert await asyncio.wait_for(second_reader.read(-1), 3) == b"helloBYE"
+            second_writer.close()
+            assert len(accepted) == 2
+            await wait_for(lambda: forwarder._accepting and not forwarder._connections)
+        finally:
+            await forwarder.stop()
+            server.close()
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("use_splice, pump_type", PUMPS)
+def test_abort_sends_reset(use_splice, pump_type):
+    """abort()는 FIN 대신 RST로 양쪽 연결을 끊습니다."""
+
+    async def scenario():
+        server, upstream_port, _ = await start_upstream()
+        forwarder, port = await start_forwarder(upstream_port, use_splice=use_splice)
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"ping")
+            assert await asyncio.wait_for(reader.readexactly(4), 3) == b"ping"
+
+            connection = next(iter(forwarder._connections))
+            connection.abort()
+            assert connection.closed and not forwarder._connections
+
+            with pytest.raises(ConnectionResetError):
+                await asyncio.wait_for(reader.read(-1), 3)
+            writer.close()
+        finally:
+            await forwarder.stop()
+            server.close()
+
+    asyncio.run(scenario())
+
+
+def test_apply_keeps_existing_connections():
+    """규칙의 대상을 바꿔도 기존 연결은 이전 대상과 계속 주고받고, 새 연결만 새 대상으로 갑니다."""
+
+    async def scenario():
+        old_server, old_port, _ = await start_upstream(b"OLD")
+        new_server, new_port, _ = await start_upstream(b"NEW")
+        forwarder, port = await start_forwarder(old_port)
+        try:
+            old_reader, old_writer = await asyncio.open_connection("127.0.0.1", port)
+            old_writer.write(b"a")
+            assert await asyncio.wait_for(old_reader.readexactly(1), 3) == b"a"
+
+            await forwarder.apply([Rule.parse(f"127.0.0.1:{port}", f"127.0.0.1:{new_port}")])
+
+            new_reader, new_writer = await asyncio.open_connection("127.0.0.1", port)
+            new_writer.write_eof()
+            assert await asyncio.wait_for(new_reader.read(-1), 3) == b"NEW"
+            new_writer.close()
+
+            old_writer.write_eof()
+            assert await asyncio.wait_for(old_reader.read(-1), 3) == b"OLD"
+            old_writer.close()
+        finally:
+            await forwarder.stop()
+            old_server.close()
+            new_server.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,98 @@
+"""
+프로필과 pid 파일(devredirect.profiles) 테스트. DEVREDIRECT_HOME을 임시 디렉토리로 바꿔 실행합니다.
+
+    python -m pytest -q devredirect
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+from devredirect import profiles
+
+
+@pytest.fixture(autouse=True)
+def home(tmp_path, monkeypatch):
+    monkeypatch.setenv("DEVREDIRECT_HOME", str(tmp_path))
+    return tmp_path
+
+
+def _in_other_process(code: str) -> str:
+    """다른 프로세스에서 profiles를 불러 code를 실행하고 출력을 반환합니다 (flock은 프로세스 단위)."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = f"import sys; sys.path.insert(0, {root!r}); from devredirect import profiles; {code}"
+    return subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True,
+                          env=os.environ.copy()).stdout.strip()
+
+
+def test_stale_pid_file_is_ignored(home):
+    """잠금 없이 남은 pid 파일은 실행 중이 아닌 것으로 보고, 그 pid에 신호를 보내지 않습니다."""
+    # pid 1(init)처럼 살아 있는 다른 프로세스의 pid가 남아 있어도
+    (home / "default.pid").write_text("1\n")
+    assert profiles.read_pid("default") is None
+    assert profiles.notify_reload("default") is None
+
+    lock = profiles.lock_pid("default")
+    assert lock is not None
+    lock.release()
+
+
+def test_running_profile_is_locked(home):
+    """run이 잠금을 쥐고 있는 동안 다른 프로세스는 pid를 읽을 수 있고, 같은 프로필로 실행할 수 없습니다."""
+    lock = profiles.lock_pid("default")
+    try:
+        assert (home / "default.pid").read_text() == f"{os.getpid()}\n"
+        seen = _in_other_process("print(profiles.read_pid('default'), profiles.lock_pid('default'))")
+        assert seen == f"{os.getpid()} None"
+    finally:
+        lock.release()
+
+    assert not (home / "default.pid").exists()
+    assert profiles.read_pid("default") is None
+    assert _in_other_process("print(profiles.lock_pid('default') is not None)") == "True"
+
+
+def test_release_is_idempotent(home):
+    lock = profiles.lock_pid("staging")
+    lock.release()
+    lock.release()
+    assert profiles.read_pid("staging") is None
+
+
+def test_profile_round_trip(home):
+    from devredirect.rules import Rule, UDP
+
+    rules = [Rule.parse("127.0.0.1:15432", "10.0.0.5:5432"), Rule.parse("127.0.0.1:5353", "10.0.0.2:53", UDP)]
+    profiles.save_profile("default", rules)
+    assert profiles.load_profile("default") == rules
+    assert profiles.load_profile("missing") == []
+    assert profiles.list_profiles() == ["default"]
+
+
+@pytest.mark.parametrize("content", [
+    "[]",
+    '"rules"',
+    '{"rules": {"listen": "127.0.0.1:1"}}',
+    '{"rules": ["127.0.0.1:1 10.0.0.1:1"]}',
+    '{"rules": [{"target": "10.0.0.1:1"}]}',
+    '{"rules": [{"listen": "127.0.0.1:1"}]}',
+    '{"rules": [{"listen": 5432, "target": "10.0.0.1:1"}]}',
+    '{"rules": [{"listen": "127.0.0.1:1", "target": "10.0.0.1:1", "protocol": "sctp"}]}',
+    '{"rules": [{"listen": "127.0.0.1", "target": "10.0.0.1:1"}]}',
+    "{not json",
+])
+def test_invalid_profile_raises_value_error(home, content):
+    """형식이 잘못된 프로필은 KeyError/TypeError가 아니라 ValueError로 알립니다 (reload/add/list가 처리)."""
+    (home / "default.json").write_text(content)
+    with pytest.raises(ValueError):
+        profiles.load_profile("default")
+
+
+def test_cli_reports_invalid_profile(home):
+    from devredirect import cli
+
+    (home / "default.json").write_text('{"rules": [{"listen": "127.0.0.1:1"}]}')
+    assert cli.main(["list"]) == 2
+    assert cli.main(["add", "127.0.0.1:2", "10.0.0.1:2"]) == 2
+    assert (home / "default.json").read_text() == '{"rules": [{"listen": "127.0.0.1:1"}]}'
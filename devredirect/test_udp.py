@@ -0,0 +1,184 @@
+"""
+UDP 포워더(UdpForwarder) 테스트: 127.0.0.1의 로컬 소켓만 사용합니다.
+
+    python -m pytest -q devredirect
+"""
+import asyncio
+import socket
+from typing import List, Tuple
+
+from devredirect.rules import Rule, TCP, UDP
+from devredirect.test_forwarder import free_port, wait_for
+from devredirect.udp import UdpForwarder
+
+
+class _Echo(asyncio.DatagramProtocol):
+    """받은 데이터그램 앞에 tag를 붙여 돌려보냅니다."""
+
+    def __init__(self, tag: bytes):
+        self.tag = tag
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.transport.sendto(self.tag + data, addr)
+
+
+async def start_echo(tag: bytes) -> Tuple[asyncio.DatagramTransport, int]:
+    transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+        lambda: _Echo(tag), local_addr=("127.0.0.1", 0))
+    return transport, transport.get_extra_info("sockname")[1]
+
+
+async def start_forwarder(target_port: int, **options) -> Tuple[UdpForwarder, int]:
+    port = free_port(socket.SOCK_DGRAM)
+    forwarder = UdpForwarder([Rule.parse(f"127.0.0.1:{port}", f"127.0.0.1:{target_port}", UDP)], **options)
+    await forwarder.start()
+    return forwarder, port
+
+
+def open_clients(port: int, count: int) -> List[socket.socket]:
+    clients = []
+    for _ in range(count):
+        client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        client.setblocking(False)
+        client.connect(("127.0.0.1", port))
+        clients.append(client)
+    return clients
+
+
+async def round_trip(client: socket.socket, data: bytes, timeout: float = 2.0) -> bytes:
+    client.send(data)
+    return await asyncio.wait_for(asyncio.get_running_loop().sock_recv(client, 65535), timeout)
+
+
+def test_flow_per_client():
+    """클라이언트 주소마다 흐름을 하나씩 만들고 응답을 그 클라이언트에게 돌려줍니다."""
+
+    async def scenario():
+        echo, echo_port = await start_echo(b"A:")
+        forwarder, port = await start_forwarder(echo_port)
+        clients = open_clients(port, 3)
+        try:
+            for index, client in enumerate(clients):
+                for _ in range(2):
+                    assert await round_trip(client, b"%d" % index) == b"A:%d" % index
+
+            stats = forwarder.stats()[f"127.0.0.1:{port}/udp"]
+            assert stats["flows"] == 3 and stats["active_flows"] == 3
+            assert stats["datagrams_up"] == 6 and stats["datagrams_down"] == 6
+            assert stats["bytes_up"] == 6 and stats["bytes_down"] == 18
+            assert stats["dropped"] == 0 and stats["errors"] == 0
+        finally:
+            for client in clients:
+                client.close()
+            await forwarder.stop()
+            echo.close()
+
+    asyncio.run(scenario())
+
+
+def test_ignores_tcp_rules():
+    """같은 주소의 TCP 규칙은 UDP 포워더가 열지 않습니다."""
+
+    async def scenario():
+        echo, echo_port = await start_echo(b"A:")
+        port = free_port(socket.SOCK_DGRAM)
+        forwarder = UdpForwarder([Rule.parse(f"127.0.0.1:{port}", f"127.0.0.1:{echo_port}", TCP)])
+        await forwarder.start()
+        try:
+            assert forwarder.rules == [] and forwarder.stats() == {}
+        finally:
+            await forwarder.stop()
+            echo.close()
+
+    asyncio.run(scenario())
+
+
+def test_idle_flows_are_evicted():
+    """idle_timeout 동안 오가는 데이터가 없는 흐름은 정리되고, 다음 데이터그램에서 새 흐름을 만듭니다."""
+
+    async def scenario():
+        echo, echo_port = await start_echo(b"A:")
+        forwarder, port = await start_forwarder(echo_port, idle_timeout=0.2)
+        name = f"127.0.0.1:{port}/udp"
+        client, = open_clients(port, 1)
+        try:
+            assert await round_trip(client, b"x") == b"A:x"
+            assert forwarder.stats()[name]["active_flows"] == 1
+
+            # 정리 주기는 최소 0.5초
+            await wait_for(lambda: forwarder.stats()[name]["active_flows"] == 0, timeout=3.0)
+            assert forwarder.stats()[name]["evicted"] == 1
+            assert forwarder._flow_count == 0
+
+            assert await round_trip(client, b"y") == b"A:y"
+            stats = forwarder.stats()[name]
+            assert stats["flows"] == 2 and stats["active_flows"] == 1
+        finally:
+            client.close()
+            await forwarder.stop()
+            echo.close()
+
+    asyncio.run(scenario())
+
+
+def test_max_flows_drops_new_clients():
+    """흐름 한도에 닿으면 새 클라이언트의 데이터그램은 버리고, 기존 흐름은 계속 전달합니다."""
+
+    async def scenario():
+        echo, echo_port = await start_echo(b"A:")
+        forwarder, port = await start_forwarder(echo_port, max_flows=2)
+        name = f"127.0.0.1:{port}/udp"
+        clients = open_clients(port, 3)
+        try:
+            assert await round_trip(clients[0], b"0") == b"A:0"
+            assert await round_trip(clients[1], b"1") == b"A:1"
+
+            clients[2].send(b"2")
+            await wait_for(lambda: forwarder.stats()[name]["dropped"] == 1)
+            assert forwarder.stats()[name]["active_flows"] == 2
+
+            assert await round_trip(clients[0], b"0") == b"A:0"
+            assert forwarder.stats()[name]["dropped"] == 1
+        finally:
+            for client in clients:
+                client.close()
+            await forwarder.stop()
+            echo.close()
+
+    asyncio.run(scenario())
+
+
+def test_apply_closes_changed_and_removed_flows():
+    """대상이 바뀐 규칙의 흐름은 바로 정리하고 새 대상으로 다시 만들며, 빠진 규칙은 흐름과 소켓을 닫습니다."""
+
+    async def scenario():
+        old_echo, old_port = await start_echo(b"A:")
+        new_echo, new_port = await start_echo(b"B:")
+        forwarder, port = await start_forwarder(old_port)
+        name = f"127.0.0.1:{port}/udp"
+        client, = open_clients(port, 1)
+        try:
+            assert await round_trip(client, b"x") == b"A:x"
+            old_upstream = next(iter(forwarder._flows[("127.0.0.1", port)].values())).upstream
+
+            await forwarder.apply([Rule.parse(f"127.0.0.1:{port}", f"127.0.0.1:{new_port}", UDP)])
+            assert forwarder.stats()[name]["active_flows"] == 0
+            assert old_upstream.fileno() == -1
+            assert await round_trip(client, b"y") == b"B:y"
+            assert forwarder.stats()[name]["active_flows"] == 1
+
+            await forwarder.apply([])
+            assert forwarder._flow_count == 0
+            assert not forwarder._flows and not forwarder._listeners
+            assert forwarder.stats()[name]["active_flows"] == 0
+        finally:
+            client.close()
+            await forwarder.stop()
+            old_echo.close()
+            new_echo.close()
+
+    asyncio.run(scenario())
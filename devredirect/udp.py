@@ -0,0 +1,263 @@
+import asyncio
+import logging
+import socket
+import time
+from typing import Dict, Any, Iterable, List, Optional
+
+from devredirect.rules import Address, Rule, UDP, address_family, format_address, resolve
+from devredirect.stats import UdpRuleStats
+from devredirect.table import RuleTable
+
+logger = logging.getLogger(__name__)
+
+
+class _Flow:
+    """클라이언트 주소 하나의 세션: 대상에 connect한 UDP 소켓으로 주고받습니다 (NAT 매핑과 같은 역할)."""
+
+    __slots__ = ("rule", "stats", "client", "listener", "upstream", "fd", "last_seen")
+
+    def __init__(self, rule: Rule, stats: UdpRuleStats, client: Address, listener: socket.socket,
+                 upstream: socket.socket, now: float):
+        self.rule = rule
+        self.stats = stats
+        self.client = client
+        self.listener = listener
+        self.upstream = upstream
+        self.fd = upstream.fileno()
+        self.last_seen = now
+
+
+class UdpForwarder:
+    """
+    UDP 규칙의 데이터그램을 대상으로 전달합니다.
+
+    클라이언트 주소마다 대상에 connect한 소켓(흐름)을 하나씩 만들어 응답을 그 클라이언트에게 돌려주고,
+    idle_timeout초 동안 오가는 데이터가 없는 흐름은 정리합니다. Python에는 recvmmsg/sendmmsg가 없으므로
+    이벤트 한 번에 EAGAIN이 날 때까지(최대 batch개) 연속으로 받아 보내는 방식으로 깨어남 비용을 나눕니다.
+    모든 데이터그램은 미리 할당한 버퍼 하나로 recvfrom_into/recv_into한 뒤 memoryview로 바로 보내므로
+    데이터그램마다 bytes 객체를 만들지 않습니다.
+
+    TCP의 Forwarder와 같이 apply()로 규칙을 실행 중에 바꿀 수 있습니다.
+    """
+
+    def __init__(self, rules: Iterable[Rule] = (), idle_timeout: float = 60.0, max_flows: int = 4096,
+                 batch: int = 64, buffer_size: int = 65535):
+        self.table = RuleTable(rule for rule in rules if rule.protocol == UDP)
+        self.idle_timeout = idle_timeout
+        self.max_flows = max_flows
+        self.batch = batch
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._buffer = bytearray(buffer_size)
+        self._view = memoryview(self._buffer)
+        self._listeners: Dict[Address, socket.socket] = {}
+        self._flows: Dict[Address, Dict[Address, _Flow]] = {}
+        self._flow_count = 0
+        self._targets: Dict[Address, Address] = {}
+        self._stats: Dict[str, UdpRuleStats] = {}
+        self._sweep_timer = None
+        self._full_warned = False
+
+    @property
+    def rules(self) -> List[Rule]:
+        return self.table.rules()
+
+    async def start(self) -> None:
+        """
+        listen 소켓을 엽니다.
+
+        Raises:
+            OSError: listen 주소에 바인드할 수 없거나 대상 호스트 이름을 확인할 수 없는 경우
+        """
+        self.loop = asyncio.get_running_loop()
+        table, self.table = self.table, RuleTable()
+        await self.apply(table.rules())
+        self._sweep_timer = self.loop.call_later(self._sweep_interval(), self._sweep)
+
+    async def apply(self, rules: Iterable[Rule]) -> None:
+        """
+        규칙 전체를 바꿉니다. UDP 규칙만 사용하고 다른 프로토콜의 규칙은 무시합니다.
+
+        새 listen 소켓을 모두 연 다음에 테이블을 한 번에 바꿉니다. 삭제되거나 대상이 바뀐 규칙의 흐름은
+        바로 정리하고, 그 클라이언트의 다음 데이터그램부터 새 규칙으로 새 흐름을 만듭니다.
+
+        Raises:
+            ValueError: listen 주소가 중복된 경우
+            OSError: 새 listen 주소에 바인드할 수 없거나 대상을 확인할 수 없는 경우 (기존 규칙 유지)
+        """
+        table = RuleTable(rule for rule in rules if rule.protocol == UDP)
+        targets: Dict[Address, Address] = {}
+        for rule in table:
+            if rule.target not in targets:
+                targets[rule.target] = await resolve(self.loop, rule.target, socket.SOCK_DGRAM)
+
+        opened: Dict[Address, socket.socket] = {}
+        try:
+            for rule in table:
+                if rule.listen not in self._listeners:
+                    opened[rule.listen] = self._bind(rule.listen)
+        except OSError:
+            for listener in opened.values():
+                listener.close()
+            raise
+
+        old_table, self.table = self.table, table
+        self._targets = targets
+        for rule in table:
+            self._stats.setdefault(rule.name, UdpRuleStats())
+            if old_table.lookup(rule.listen, UDP) != rule:
+                logger.info(f"전달 시작: {rule.name} -> {format_address(rule.target)}")
+        for listen, listener in opened.items():
+            self._listeners[listen] = listener
+            self._flows[listen] = {}
+            self.loop.add_reader(listener.fileno(), self._on_client, listener, listen)
+
+        for listen, flows in list(self._flows.items()):
+            rule = table.lookup(listen, UDP)
+            for flow in [flow for flow in flows.values() if flow.rule != rule]:
+                self._close_flow(flow)
+            if rule is None:
+                del self._flows[listen]
+                listener = self._listeners.pop(listen)
+                self.loop.remove_reader(listener.fileno())
+                listener.close()
+                logger.info(f"전달 중지: {format_address(listen)}/udp")
+
+    async def stop(self) -> None:
+        """listen 소켓과 모든 흐름을 닫습니다."""
+        if self._sweep_timer is not None:
+            self._sweep_timer.cancel()
+            self._sweep_timer = None
+        for flows in self._flows.values():
+            for flow in list(flows.values()):
+                self._close_flow(flow)
+        self._flows.clear()
+        for listener in self._listeners.values():
+            self.loop.remove_reader(listener.fileno())
+            listener.close()
+        self._listeners.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """규칙 이름(listen 주소/udp)별 카운터"""
+        return {name: stats.to_dict() for name, stats in self._stats.items()}
+
+    def _bind(self, listen: Address) -> socket.socket:
+        listener = socket.socket(address_family(listen[0]), socket.SOCK_DGRAM)
+        try:
+            listener.bind(listen)
+            listener.setblocking(False)
+        except OSError:
+            listener.close()
+            raise
+        return listener
+
+    def _on_client(self, listener: socket.socket, listen: Address) -> None:
+        """클라이언트 → 대상. 소켓이 빌 때까지(최대 batch개) 받아 흐름별 대상 소켓으로 보냅니다."""
+        rule = self.table.lookup(listen, UDP)
+        if rule is None:
+            return
+        stats = self._stats[rule.name]
+        flows = self._flows[listen]
+        view = self._view
+        now = time.monotonic()
+        for _ in range(self.batch):
+            try:
+                n, client = listener.recvfrom_into(view)
+            except BlockingIOError:
+                return
+            except OSError as e:
+                stats.connect_errors += 1
+                logger.debug(f"{rule.name}: 수신 오류: {e}")
+                continue
+            flow = flows.get(client)
+            if flow is None:
+                flow = self._open_flow(rule, stats, listener, client, now)
+                if flow is None:
+                    stats.dropped += 1
+                    continue
+                flows[client] = flow
+            flow.last_seen = now
+            try:
+                flow.upstream.send(view[:n])
+            except BlockingIOError:
+                stats.dropped += 1
+                continue
+            except OSError as e:
+                # 이전 데이터그램에 대한 ICMP port unreachable 등
+                stats.connect_errors += 1
+                logger.debug(f"{rule.name}: 대상 전송 오류: {e}")
+                continue
+            stats.datagrams_up += 1
+            stats.bytes_up += n
+
+    def _on_upstream(self, flow: _Flow) -> None:
+        """대상 → 클라이언트. 흐름의 대상 소켓이 빌 때까지(최대 batch개) 받아 listen 소켓으로 돌려보냅니다."""
+        stats = flow.stats
+        view = self._view
+        for _ in range(self.batch):
+            try:
+                n = flow.upstream.recv_into(view)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                stats.connect_errors += 1
+                logger.debug(f"{flow.rule.name}: 대상 수신 오류: {e}")
+                continue
+            try:
+                flow.listener.sendto(view[:n], flow.client)
+            except BlockingIOError:
+                stats.dropped += 1
+                continue
+            except OSError as e:
+                stats.connect_errors += 1
+                logger.debug(f"{flow.rule.name}: 클라이언트 전송 오류: {e}")
+                continue
+            stats.datagrams_down += 1
+            stats.bytes_down += n
+        flow.last_seen = time.monotonic()
+
+    def _open_flow(self, rule: Rule, stats: UdpRuleStats, listener: socket.socket, client: Address,
+                   now: float) -> Optional[_Flow]:
+        if self._flow_count >= self.max_flows:
+            if not self._full_warned:
+                logger.warning(f"UDP 흐름 한도({self.max_flows}) 도달, 새 흐름의 데이터그램을 버립니다")
+                self._full_warned = True
+            return None
+        target = self._targets[rule.target]
+        upstream = socket.socket(address_family(target[0]), socket.SOCK_DGRAM)
+        try:
+            upstream.setblocking(False)
+            upstream.connect(target)
+        except OSError as e:
+            upstream.close()
+            stats.connect_errors += 1
+            logger.warning(f"{rule.name}: 대상 {format_address(rule.target)} 소켓을 열 수 없습니다: {e}")
+            return None
+        flow = _Flow(rule, stats, client, listener, upstream, now)
+        self.loop.add_reader(flow.fd, self._on_upstream, flow)
+        self._flow_count += 1
+        stats.connections += 1
+        stats.active += 1
+        return flow
+
+    def _close_flow(self, flow: _Flow) -> None:
+        flows = self._flows.get(flow.rule.listen)
+        if flows is not None and flows.get(flow.client) is flow:
+            del flows[flow.client]
+        self.loop.remove_reader(flow.fd)
+        flow.upstream.close()
+        self._flow_count -= 1
+        flow.stats.active -= 1
+
+    def _sweep_interval(self) -> float:
+        return max(0.5, min(self.idle_timeout / 2, 10.0))
+
+    def _sweep(self) -> None:
+        """idle_timeout 동안 오가는 데이터가 없던 흐름을 정리합니다."""
+        deadline = time.monotonic() - self.idle_timeout
+        for flows in self._flows.values():
+            for flow in [flow for flow in flows.values() if flow.last_seen < deadline]:
+                flow.stats.evicted += 1
+                self._close_flow(flow)
+        if self._flow_count < self.max_flows:
+            self._full_warned = False
+        self._sweep_timer = self.loop.call_later(self._sweep_interval(), self._sweep)
@@ -0,0 +1,11 @@
+"""
+체크/저장 파이프라인 벤치마크
+
+인터넷과 실제 DB 없이 가짜 ICMP/HTTP 응답기, 가짜 speedtest 서버, psycopg2 연결 기록기로
+check_router/check_targets, check_speed, save_result/save_results, run_checks를 반복 실행하고
+처리량, 틱 소요 시간 p99, 메모리 할당, 결과당 DB 왕복 횟수를 측정합니다.
+
+    python -m benchmarks.run --targets 1,8,32 --tick-rate 2 --ticks 20
+    python -m benchmarks.run --save-baseline     # benchmarks/baselines/default.json 갱신
+    python -m benchmarks.run --compare           # 기준값보다 나빠지면 종료 코드 1
+"""
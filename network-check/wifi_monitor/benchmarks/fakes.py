@@ -0,0 +1,289 @@
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Iterator, List, Optional
+
+import psycopg2
+import psycopg2.extensions
+
+from checks.icmp_engine import summarize_rtts
+
+_RANDOM_IMAGE_PATH = re.compile(r"^/speedtest/random(\d+)x\d+\.jpg$")
+
+
+class _FakeHandler(BaseHTTPRequestHandler):
+    """
+    대역폭 측정과 speedtest-cli가 쓰는 경로만 흉내 내는 HTTP 핸들러.
+
+    - GET /bytes?n=N (Range 헤더 지원): N바이트
+    - GET /speedtest/latency.txt: "test=test"
+    - GET /speedtest/randomSxS.jpg: download_bytes바이트
+    - POST /upload, /speedtest/upload.php: 본문을 읽고 "size=N"
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, body: bytes, content_type: str = "application/octet-stream") -> None:
+        delay = self.server.response_delay
+        if delay:
+            time.sleep(delay)
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.requests += 1
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        if path == "/speedtest/latency.txt":
+            self._send(b"test=test", "text/plain")
+        elif _RANDOM_IMAGE_PATH.match(path):
+            self._send(self.server.payload[:self.server.download_bytes], "image/jpeg")
+        elif path == "/bytes":
+            size = self.server.download_bytes
+            for pair in query.split("&"):
+                if pair.startswith("n="):
+                    size = int(pair[2:])
+            range_header = self.headers.get("Range", "")
+            if range_header.startswith("bytes=0-"):
+                size = min(size, int(range_header[8:]) + 1)
+            self._send(self.server.payload[:size])
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        remaining = length
+        while remaining > 0:
+            chunk = self.rfile.read(min(remaining, 64 * 1024))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+        self._send(f"size={length - remaining}".encode(), "text/plain")
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeHTTPServer:
+    """
+    127.0.0.1의 임의 포트에서 동작하는 가짜 HTTP 서버 (대역폭 측정/speedtest 응답기).
+
+    Args:
+        download_bytes: 다운로드 응답의 기본 크기
+        response_delay: 응답 전에 기다릴 시간 (초, 느린 서버 흉내)
+    """
+
+    def __init__(self, download_bytes: int = 1_000_000, response_delay: float = 0.0):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeHandler)
+        self._server.daemon_threads = True
+        self._server.payload = bytes(max(download_bytes, 4 * 1024 * 1024))
+        self._server.download_bytes = download_bytes
+        self._server.response_delay = response_delay
+        self._server.requests = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def requests(self) -> int:
+        return self._server.requests
+
+    def start(self) -> "FakeHTTPServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-http", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def write_speedtest_cache(path: str, server_url: str) -> None:
+    """
+    check_speed()가 읽는 서버 선택 캐시를 가짜 서버를 가리키도록 씁니다.
+
+    캐시가 있으면 speedtest-cli는 speedtest.net 설정/서버 목록을 받지 않으므로,
+    latency.txt, 다운로드 1회, 업로드 1회가 모두 가짜 서버로 갑니다.
+    """
+    config = {
+        "client": {"ip": "127.0.0.1", "lat": "37.5", "lon": "127.0", "isp": "benchmark", "country": "KR"},
+        "ignore_servers": [],
+        "sizes": {"upload": [32768], "download": [350]},
+        "counts": {"upload": 1, "download": 1},
+        "threads": {"upload": 1, "download": 1},
+        "length": {"upload": 10, "download": 10},
+        "upload_max": 1,
+    }
+    server = {
+        "url": f"{server_url}/speedtest/upload.php",
+        "lat": "37.5", "lon": "127.0", "name": "benchmark", "country": "KR", "cc": "KR",
+        "sponsor": "benchmark", "id": "1", "host": server_url.split("://", 1)[1], "d": 0.0,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"saved_at": time.time(), "config": config, "server": server}, f)
+
+
+class SimulatedPinger:
+    """
+    async_ping()을 대신하는 가짜 ICMP 응답기.
+
+    대상마다 latency_ms ± jitter_ms의 RTT와 loss 확률의 손실을 만들고,
+    실제 엔진처럼 (count - 1) * interval + 가장 늦은 응답 시간만큼 기다립니다.
+    seed가 같으면 같은 결과가 나옵니다.
+    """
+
+    def __init__(self, latency_ms: float = 2.0, jitter_ms: float = 0.5, loss: float = 0.0, seed: int = 1):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.loss = loss
+        self._random = random.Random(seed)
+        self.calls = 0
+
+    async def __call__(self, host: str, count: int = 4, interval: float = 0.2, timeout: float = 5.0,
+                       mode: str = "auto", tcp_port: int = 80) -> Dict[str, Any]:
+        self.calls += 1
+        rtts: List[Optional[float]] = []
+        for _ in range(count):
+            if self._random.random() < self.loss:
+                rtts.append(None)
+            else:
+                rtts.append(max(0.01, self._random.gauss(self.latency_ms, self.jitter_ms)))
+
+        slowest = max((rtt for rtt in rtts if rtt is not None), default=timeout * 1000)
+        await asyncio.sleep((count - 1) * interval + slowest / 1000)
+
+        stats = summarize_rtts(rtts)
+        stats["method"] = "simulated"
+        return stats
+
+
+class _ConnectionInfo:
+    transaction_status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+
+class RecordingCursor:
+    """쿼리를 실행하지 않고 왕복 횟수와 행 수만 기록하는 커서."""
+
+    def __init__(self, connection: "RecordingConnection"):
+        self.connection = connection
+        self.rowcount = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def execute(self, query, vars=None) -> None:
+        self.connection.database.record_query(query)
+
+    def executemany(self, query, vars_list) -> None:
+        # psycopg2의 executemany는 행마다 한 번씩 왕복합니다
+        for _ in vars_list:
+            self.connection.database.record_query(query)
+
+    def mogrify(self, query, vars=None) -> bytes:
+        return repr(vars).encode()
+
+    def copy_expert(self, sql, file, size: int = 8192) -> None:
+        data = file.read()
+        self.rowcount = data.count("\n")
+        self.connection.database.record_query(sql, rows=self.rowcount)
+
+    def fetchone(self):
+        return None
+
+    def fetchall(self):
+        return []
+
+    def close(self) -> None:
+        pass
+
+
+class RecordingConnection:
+    """psycopg2 연결 대신 쓰는 기록용 연결 (풀의 putconn이 요구하는 속성 포함)."""
+
+    encoding = "UTF8"
+
+    def __init__(self, database: "RecordingDatabase"):
+        self.database = database
+        self.closed = 0
+        self.info = _ConnectionInfo()
+        self.autocommit = False
+
+    def cursor(self, *args, **kwargs) -> RecordingCursor:
+        return RecordingCursor(self)
+
+    def commit(self) -> None:
+        self.database.record_round_trip("commit")
+
+    def rollback(self) -> None:
+        self.database.record_round_trip("rollback")
+
+    def close(self) -> None:
+        self.closed = 1
+
+
+class RecordingDatabase:
+    """
+    로컬 PostgreSQL 대신 쓰는 기록기. install() 동안 psycopg2.connect를 가로채므로
+    커넥션 풀, 재연결 백오프, COPY 경로는 실제 코드 그대로 실행됩니다.
+
+    Args:
+        round_trip_ms: 왕복마다 기다릴 시간 (WAN 너머 DB 흉내)
+    """
+
+    def __init__(self, round_trip_ms: float = 0.0):
+        self.round_trip_ms = round_trip_ms
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.connections = 0
+            self.round_trips = 0
+            self.rows = 0
+            self.statements: Dict[str, int] = {}
+
+    def record_round_trip(self, kind: str) -> None:
+        if self.round_trip_ms:
+            time.sleep(self.round_trip_ms / 1000)
+        with self._lock:
+            self.round_trips += 1
+            self.statements[kind] = self.statements.get(kind, 0) + 1
+
+    def record_query(self, query, rows: int = 0) -> None:
+        if isinstance(query, bytes):
+            query = query.decode("utf-8", "replace")
+        kind = query.strip().split(None, 1)[0].upper() if query.strip() else "EMPTY"
+        self.record_round_trip(kind)
+        with self._lock:
+            self.rows += rows
+
+    def connect(self, *args, **kwargs) -> RecordingConnection:
+        self.record_round_trip("connect")
+        with self._lock:
+            self.connections += 1
+        return RecordingConnection(self)
+
+    @contextmanager
+    def install(self) -> Iterator["RecordingDatabase"]:
+        original = psycopg2.connect
+        psycopg2.connect = self.connect
+        try:
+            yield self
+        finally:
+            psycopg2.connect = original
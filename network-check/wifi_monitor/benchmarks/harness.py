@@ -0,0 +1,166 @@
+import gc
+import json
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, Any, List, Optional
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+# 지표 이름 접미사별 좋은 방향 (높을수록 좋은 지표만 적고 나머지는 낮을수록 좋음)
+_HIGHER_IS_BETTER = ("samples_per_second",)
+
+# 실행할 때마다 흔들리는 타이밍 지표 (timing_tolerance로 비교)
+_TIMING = ("_ms", "samples_per_second")
+
+# 기준값과 비교하지 않는 지표 (환경 설명용)
+_INFORMATIONAL = ("ticks", "samples", "targets", "tick_rate", "late_ticks")
+
+
+def percentile(values: List[float], q: float) -> float:
+    """nearest-rank 백분위수 (q는 0~100)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def run_ticks(tick: Callable[[], int], ticks: int, tick_rate: float) -> Dict[str, Any]:
+    """
+    tick을 tick_rate(초당 틱 수)의 고정 주기로 ticks번 실행합니다.
+
+    tick은 이번 틱에 만든 결과 수를 반환해야 합니다. 틱이 주기보다 오래 걸리면
+    다음 틱은 바로 실행되고 late_ticks로 집계됩니다 (FixedRateScheduler의 queue 정책과 같음).
+
+    Returns:
+        {"ticks", "tick_rate", "samples", "samples_per_second", "tick_p50_ms", "tick_p99_ms", "tick_max_ms", "late_ticks"}
+    """
+    period = 1.0 / tick_rate if tick_rate > 0 else 0.0
+    durations: List[float] = []
+    samples = 0
+    late = 0
+
+    started = time.perf_counter()
+    deadline = started
+    for _ in range(ticks):
+        now = time.perf_counter()
+        if now < deadline:
+            time.sleep(deadline - now)
+        elif now - deadline > period and period:
+            late += 1
+        tick_started = time.perf_counter()
+        samples += tick()
+        durations.append((time.perf_counter() - tick_started) * 1000)
+        deadline += period
+    elapsed = time.perf_counter() - started
+
+    return {
+        "ticks": ticks,
+        "tick_rate": tick_rate,
+        "samples": samples,
+        "samples_per_second": round(samples / elapsed, 2) if elapsed > 0 else 0.0,
+        "tick_p50_ms": round(percentile(durations, 50), 3),
+        "tick_p99_ms": round(percentile(durations, 99), 3),
+        "tick_max_ms": round(max(durations), 3) if durations else 0.0,
+        "late_ticks": late,
+    }
+
+
+def measure_allocations(tick: Callable[[], int], ticks: int) -> Dict[str, Any]:
+    """
+    tracemalloc으로 틱마다 할당된 최대 메모리와, 모든 틱이 끝난 뒤 남은 메모리를 결과당 값으로 잽니다.
+
+    타이밍 측정과 따로 실행해야 합니다 (tracemalloc은 실행 속도를 몇 배 늦춥니다).
+    retained_bytes_per_sample이 계속 커지면 결과를 어딘가에 쌓아두고 있다는 뜻입니다.
+    """
+    tick()  # 첫 실행의 import/캐시 할당은 제외
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        blocks_before = sys.getallocatedblocks()
+        samples = 0
+        peaks: List[int] = []
+        for _ in range(ticks):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            count = tick()
+            _, peak = tracemalloc.get_traced_memory()
+            samples += count
+            peaks.append((peak - before) / max(count, 1))
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+        blocks_after = sys.getallocatedblocks()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "alloc_peak_bytes_per_sample": round(percentile(peaks, 50)),
+        "retained_bytes_per_sample": round(max(0, current - baseline) / max(samples, 1)),
+        "retained_blocks_per_sample": round(max(0, blocks_after - blocks_before) / max(samples, 1), 2),
+    }
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def baseline_path(name: str) -> str:
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def save_baseline(name: str, results: Dict[str, Dict[str, Any]]) -> str:
+    """결과를 benchmarks/baselines/<name>.json에 저장하고 경로를 반환합니다."""
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    path = baseline_path(name)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2, sort_keys=True)
+        f.write("\n")
+    return path
+
+
+def load_baseline(name: str) -> Optional[Dict[str, Dict[str, Any]]]:
+    try:
+        with open(baseline_path(name), encoding="utf-8") as f:
+            return json.load(f)["results"]
+    except FileNotFoundError:
+        return None
+
+
+def compare(baseline: Dict[str, Dict[str, Any]], results: Dict[str, Dict[str, Any]],
+            tolerance: float = 0.2, timing_tolerance: float = 0.5,
+            min_delta: Optional[Dict[str, float]] = None) -> List[str]:
+    """
+    기준값보다 tolerance 비율(타이밍 지표는 timing_tolerance) 넘게 나빠진 지표 목록을 반환합니다.
+
+    DB 왕복 횟수와 할당량은 실행마다 거의 같으므로 좁게, 처리량과 틱 시간은 넓게 봅니다.
+    min_delta는 지표 접미사별 최소 절대 차이입니다. 타이밍처럼 값이 작고 흔들리는 지표가
+    0.1ms 차이로 회귀 판정을 받지 않도록 합니다.
+    """
+    min_delta = min_delta or {}
+    regressions = []
+    for case, metrics in results.items():
+        expected = baseline.get(case)
+        if expected is None:
+            continue
+        for metric, value in metrics.items():
+            if metric in _INFORMATIONAL or metric not in expected:
+                continue
+            old = expected[metric]
+            if not isinstance(value, (int, float)) or not isinstance(old, (int, float)):
+                continue
+            floor = next((delta for suffix, delta in min_delta.items() if metric.endswith(suffix)), 0.0)
+            ratio = timing_tolerance if metric.endswith(_TIMING) else tolerance
+            worse = old - value if metric.endswith(_HIGHER_IS_BETTER) else value - old
+            if worse > max(abs(old) * ratio, floor):
+                regressions.append(f"{case}.{metric}: {old} -> {value}")
+    return regressions
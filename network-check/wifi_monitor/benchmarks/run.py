@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+체크/저장 파이프라인 벤치마크 실행 스크립트
+
+wifi_monitor 디렉토리에서 실행합니다:
+
+    python -m benchmarks.run                              # 전체 실행 후 표 출력
+    python -m benchmarks.run --only check_targets,save --targets 1,16,64
+    python -m benchmarks.run --ping loopback              # 실제 ICMP 엔진으로 127.0.0.x에 ping (root 필요)
+    python -m benchmarks.run --db-rtt-ms 30               # DB 왕복마다 30ms (원격 Supabase 흉내)
+    python -m benchmarks.run --save-baseline              # 기준값 저장
+    python -m benchmarks.run --compare                    # 기준값보다 나빠지면 종료 코드 1
+    python -m benchmarks.run --only startup               # import 시간과 main.py --once 콜드 스타트
+
+로그는 기본적으로 WARNING 이상만 남깁니다. 로그 비용까지 재려면 LOG_LEVEL=INFO로 실행합니다.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# 설정 모듈을 불러오기 전에 로그/버퍼/캐시 경로를 임시 디렉토리로 돌립니다
+_WORK_DIR = tempfile.mkdtemp(prefix="wifi_monitor_bench_")
+os.environ["LOG_FILE"] = os.path.join(_WORK_DIR, "bench.log")
+os.environ["SPEEDTEST_CACHE_PATH"] = os.path.join(_WORK_DIR, "speedtest_cache.json")
+os.environ["OUTBOX_PATH"] = os.path.join(_WORK_DIR, "outbox.db")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("METRICS_ENABLED", "false")
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _ROOT)
+
+from datetime import datetime
+from typing import Callable, Dict, Any, List
+
+from config import DB_CONFIG, SPEEDTEST_CACHE_PATH
+from checks import router_check
+from checks.result import CheckResult
+from benchmarks.fakes import FakeHTTPServer, RecordingDatabase, SimulatedPinger, write_speedtest_cache
+from benchmarks.harness import percentile, run_ticks, measure_allocations, save_baseline, load_baseline, compare
+
+CASES = ("check_router", "check_targets", "check_speed", "save", "run_checks", "startup")
+
+# import main 뒤에 불러와져 있는지 확인할 무거운 모듈 (켜진 체크에서만 불러와야 함)
+_HEAVY_MODULES = ("speedtest", "multiprocessing", "asyncio", "ssl", "urllib.request", "http.server", "dotenv",
+                  "psycopg2")
+
+# 체크 모듈별 import 비용 (main을 불러온 뒤 추가로 드는 시간)
+_CHECK_BACKENDS = ("checks.probe_scheduler", "checks.speed_worker", "checks.bandwidth_check", "checks.http_check")
+
+# 타이밍 지표는 이보다 작은 차이를 회귀로 보지 않습니다
+_MIN_DELTA = {"_ms": 2.0, "samples_per_second": 5.0, "_bytes_per_sample": 512, "_blocks_per_sample": 5.0}
+
+
+def _targets(count: int, loopback: bool) -> List[str]:
+    if loopback:
+        # 127.0.0.0/8 전체가 루프백이므로 대상마다 다른 주소를 씁니다
+        return [f"127.0.{i // 250}.{i % 250 + 1}" for i in range(count)]
+    return [f"10.0.{i // 250}.{i % 250 + 1}" for i in range(count)]
+
+
+def _sample_results(count: int) -> List[CheckResult]:
+    now = datetime.now()
+    return [CheckResult(now, "router", f"10.0.0.{i % 250 + 1}", True, latency_ms=1.5 + i % 7, packet_loss=0.0)
+            for i in range(count)]
+
+
+def _measure(name: str, tick: Callable[[], int], args, ticks: int, tick_rate: float,
+             database: RecordingDatabase, **extra) -> Dict[str, Any]:
+    """타이밍 측정 → DB 왕복 집계 → (별도 실행) 할당 측정"""
+    tick()  # 워밍업 (커넥션 풀 생성, import, 캐시)
+    database.reset()
+    result = run_ticks(tick, ticks, tick_rate)
+    samples = max(result["samples"], 1)
+    result["db_round_trips_per_sample"] = round(database.round_trips / samples, 3)
+    result["db_connections"] = database.connections
+    if not args.no_alloc:
+        result.update(measure_allocations(tick, max(3, min(ticks, args.alloc_ticks))))
+    result.update(extra)
+    print(f"  {name}: {result['samples_per_second']} 결과/초, p99 {result['tick_p99_ms']}ms, "
+          f"DB 왕복 {result['db_round_trips_per_sample']}/결과", flush=True)
+    return result
+
+
+def bench_check_router(args, pinger, database) -> Dict[str, Dict[str, Any]]:
+    target = _targets(1, args.ping == "loopback")[0]
+
+    def tick() -> int:
+        router_check.check_router(target, args.ping_count, args.ping_timeout, args.ping_interval)
+        return 1
+
+    return {"check_router": _measure("check_router", tick, args, args.ticks, args.tick_rate, database)}
+
+
+def bench_check_targets(args, pinger, database) -> Dict[str, Dict[str, Any]]:
+    from checks.probe_scheduler import check_targets
+
+    results = {}
+    for count in args.targets:
+        targets = _targets(count, args.ping == "loopback")
+
+        def tick(targets=targets) -> int:
+            return len(check_targets(targets, args.ping_count, args.ping_timeout, args.ping_interval,
+                                     concurrency=args.concurrency))
+
+        name = f"check_targets[{count}]"
+        results[name] = _measure(name, tick, args, args.ticks, args.tick_rate, database, targets=count)
+    return results
+
+
+def bench_check_speed(args, pinger, database) -> Dict[str, Dict[str, Any]]:
+    from checks.speed_check import check_speed
+
+    def tick() -> int:
+        # 측정이 실패하면 캐시가 삭제되므로 매번 다시 씁니다
+        write_speedtest_cache(SPEEDTEST_CACHE_PATH, args.http_url)
+        result = check_speed(timeout=30, cache_path=SPEEDTEST_CACHE_PATH)
+        if not result.reachable:
+            raise RuntimeError(f"가짜 speedtest 서버 측정 실패: {result.error_message}")
+        return 1
+
+    ticks = min(args.ticks, args.speed_ticks)
+    return {"check_speed": _measure("check_speed", tick, args, ticks, 0, database)}
+
+
+def bench_save(args, pinger, database) -> Dict[str, Dict[str, Any]]:
+    from database.db import save_result, save_results
+
+    results = {}
+    for count in args.targets:
+        batch = _sample_results(count)
+
+        def one_by_one(batch=batch) -> int:
+            for result in batch:
+                if not save_result(result, DB_CONFIG):
+                    raise RuntimeError("save_result 실패")
+            return len(batch)
+
+        def batched(batch=batch) -> int:
+            if not save_results(batch, DB_CONFIG):
+                raise RuntimeError("save_results 실패")
+            return len(batch)
+
+        name = f"save_result[{count}]"
+        results[name] = _measure(name, one_by_one, args, args.ticks, 0, database, targets=count)
+        name = f"save_results[{count}]"
+        results[name] = _measure(name, batched, args, args.ticks, 0, database, targets=count)
+    return results
+
+
+def bench_run_checks(args, pinger, database) -> Dict[str, Dict[str, Any]]:
+    import main
+    from database.outbox import Outbox, OutboxFlusher
+
+    outbox = Outbox(os.environ["OUTBOX_PATH"])
+    flusher = OutboxFlusher(outbox, DB_CONFIG)
+    results = {}
+    try:
+        for count in args.targets:
+            targets = _targets(count, args.ping == "loopback")
+
+            def tick(targets=targets) -> int:
+                write_speedtest_cache(SPEEDTEST_CACHE_PATH, args.http_url)
+                before = database.rows
+                main.run_checks(targets, outbox, flusher)
+                # 백그라운드 스레드 대신 틱 안에서 전송해 DB 쓰기까지 포함해 잽니다
+                flusher.flush()
+                return database.rows - before
+
+            name = f"run_checks[{count}]"
+            ticks = min(args.ticks, args.speed_ticks)
+            results[name] = _measure(name, tick, args, ticks, 0, database, targets=count)
+    finally:
+        outbox.close()
+    return results
+
+
+def _spawn(argv: List[str], env: Dict[str, str]) -> subprocess.CompletedProcess:
+    result = subprocess.run([sys.executable] + argv, cwd=_ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(argv)} 실패 (종료 코드 {result.returncode}): {result.stderr[-500:]}")
+    return result
+
+
+def _timed_import(setup: str, module: str, env: Dict[str, str], runs: int) -> Dict[str, Any]:
+    """새 인터프리터에서 setup을 실행한 뒤 module을 불러오는 시간 (p50 ms)과 불러와진 무거운 모듈"""
+    code = (f"import sys, time\n{setup}\nstarted = time.perf_counter()\nimport {module}\n"
+            f"print((time.perf_counter() - started) * 1000)\n"
+            f"print(','.join(name for name in {_HEAVY_MODULES!r} if name in sys.modules))")
+    times = []
+    loaded = ""
+    for _ in range(runs):
+        lines = _spawn(["-c", code], env).stdout.splitlines()
+        times.append(float(lines[-2]))
+        loaded = lines[-1]
+    return {"ms": round(percentile(times, 50), 3), "loaded": [name for name in loaded.split(",") if name]}
+
+
+def _timed_run(argv: List[str], env: Dict[str, str], runs: int) -> float:
+    """프로세스 생성부터 종료까지의 시간 p50 (ms)"""
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        _spawn(argv, env)
+        times.append((time.perf_counter() - started) * 1000)
+    return round(percentile(times, 50), 3)
+
+
+def bench_startup(args, pinger, database) -> Dict[str, Dict[str, Any]]:
+    """
+    import 시간과 콜드 스타트(main.py --once: 프로세스 시작부터 한 틱 실행, 전송 시도, 종료까지).
+
+    자식 프로세스에서 재므로 가짜 ICMP/DB를 쓸 수 없습니다. 공유기 체크는 127.0.0.1에 TCP 방식,
+    DB는 닫힌 포트를 가리켜 연결 실패가 바로 나게 하고(결과는 로컬 버퍼에 남음), HTTP 체크와
+    대역폭 측정은 가짜 HTTP 서버를 씁니다.
+    """
+    env = dict(os.environ)
+    env.update({
+        "METRICS_ENABLED": "false",
+        "DB_HOST": "127.0.0.1",
+        "DB_PORT": "1",
+        "PROBE_TARGETS": "127.0.0.1",
+        "PING_MODE": "tcp",
+        "PING_COUNT": str(args.ping_count),
+        "PING_INTERVAL_SECONDS": str(args.ping_interval),
+        "SPEED_TEST_INTERVAL_SECONDS": "0",
+        "BANDWIDTH_PROBE_URL": "",
+        "HTTP_PROBE_URLS": "",
+    })
+    probes_env = dict(env, BANDWIDTH_PROBE_URL=f"{args.http_url}/bytes",
+                      HTTP_PROBE_URLS=f"{args.http_url}/speedtest/latency.txt")
+    runs = args.startup_runs
+
+    interpreter_ms = _timed_run(["-c", "pass"], env, runs)
+    imported = _timed_import("", "main", env, runs)
+    result: Dict[str, Any] = {
+        "interpreter_ms": interpreter_ms,
+        "import_main_ms": imported["ms"],
+        "main_loaded_modules": imported["loaded"],
+    }
+    backends = {}
+    for module in _CHECK_BACKENDS:
+        name = module.split(".")[-1]
+        backends[name] = result[f"import_{name}_ms"] = _timed_import("import main", module, env, runs)["ms"]
+    result["cold_start_router_ms"] = _timed_run(["main.py", "--once"], env, runs)
+    result["cold_start_probes_ms"] = _timed_run(["main.py", "--once"], probes_env, runs)
+
+    print(f"  인터프리터 {interpreter_ms}ms, import main {result['import_main_ms']}ms "
+          f"(불러온 무거운 모듈: {', '.join(imported['loaded']) or '없음'})", flush=True)
+    print("  체크 모듈 추가 import: " + ", ".join(f"{name} {ms}ms" for name, ms in backends.items()), flush=True)
+    print(f"  콜드 스타트 (--once): 공유기만 {result['cold_start_router_ms']}ms, "
+          f"공유기+HTTP+대역폭 {result['cold_start_probes_ms']}ms", flush=True)
+    return {"startup": result}
+
+
+_BENCHES = {
+    "check_router": bench_check_router,
+    "check_targets": bench_check_targets,
+    "check_speed": bench_check_speed,
+    "save": bench_save,
+    "run_checks": bench_run_checks,
+    "startup": bench_startup,
+}
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="WiFi 모니터 체크/저장 파이프라인 벤치마크")
+    parser.add_argument("--only", default=",".join(CASES), help=f"실행할 항목 (쉼표 구분: {', '.join(CASES)})")
+    parser.add_argument("--targets", default="1,8,32", help="대상 수 목록 (쉼표 구분)")
+    parser.add_argument("--ticks", type=int, default=20, help="항목별 틱 수")
+    parser.add_argument("--tick-rate", type=float, default=0, help="초당 틱 수 (0이면 쉬지 않고 실행)")
+    parser.add_argument("--speed-ticks", type=int, default=5, help="속도 테스트가 포함된 항목의 최대 틱 수")
+    parser.add_argument("--alloc-ticks", type=int, default=10, help="할당 측정 틱 수")
+    parser.add_argument("--no-alloc", action="store_true", help="할당 측정 생략")
+    parser.add_argument("--ping", choices=("simulated", "loopback"), default="simulated",
+                        help="simulated: 가짜 ICMP 응답기, loopback: 실제 엔진으로 127.0.0.x")
+    parser.add_argument("--ping-count", type=int, default=3)
+    parser.add_argument("--ping-interval", type=float, default=0.01)
+    parser.add_argument("--ping-timeout", type=float, default=1.0)
+    parser.add_argument("--ping-latency-ms", type=float, default=2.0, help="simulated 응답 시간")
+    parser.add_argument("--ping-loss", type=float, default=0.0, help="simulated 손실 확률")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--startup-runs", type=int, default=5, help="startup 항목의 프로세스 실행 횟수 (p50)")
+    parser.add_argument("--download-bytes", type=int, default=1_000_000, help="가짜 서버 다운로드 응답 크기")
+    parser.add_argument("--db-rtt-ms", type=float, default=0.0, help="DB 왕복마다 추가할 지연")
+    parser.add_argument("--baseline", default="default", help="기준값 이름 (benchmarks/baselines/<이름>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="결과를 기준값으로 저장")
+    parser.add_argument("--compare", action="store_true", help="기준값과 비교해 회귀가 있으면 종료 코드 1")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용하는 악화 비율 (DB 왕복, 할당)")
+    parser.add_argument("--timing-tolerance", type=float, default=0.5, help="허용하는 악화 비율 (처리량, 틱 시간)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+    args.only = [name.strip() for name in args.only.split(",") if name.strip()]
+    args.targets = [int(count) for count in args.targets.split(",") if count.strip()]
+    unknown = set(args.only) - set(CASES)
+    if unknown:
+        parser.error(f"알 수 없는 항목: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+
+    pinger = SimulatedPinger(args.ping_latency_ms, args.ping_latency_ms / 4, args.ping_loss)
+    if args.ping == "simulated":
+        router_check.async_ping = pinger
+
+    server = FakeHTTPServer(args.download_bytes).start()
+    args.http_url = server.url
+    database = RecordingDatabase(args.db_rtt_ms)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    try:
+        with database.install():
+            for name in args.only:
+                print(f"[{name}]", flush=True)
+                results.update(_BENCHES[name](args, pinger, database))
+    finally:
+        server.stop()
+
+    if args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+
+    if args.save_baseline:
+        print(f"기준값 저장: {save_baseline(args.baseline, results)}")
+
+    if args.compare:
+        baseline = load_baseline(args.baseline)
+        if baseline is None:
+            print(f"기준값이 없습니다: {args.baseline} (--save-baseline으로 먼저 저장하세요)")
+            return 1
+        regressions = compare(baseline, results, args.tolerance, args.timing_tolerance, _MIN_DELTA)
+        if regressions:
+            print("기준값보다 나빠진 지표:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("기준값 대비 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
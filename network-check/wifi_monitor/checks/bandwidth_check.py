@@ -0,0 +1,175 @@
+import http.client
+import logging
+import ssl
+import time
+import urllib.parse
+import urllib.request
+from datetime import datetime
+from typing import Dict, Optional
+
+from checks.result import CheckResult
+
+logger = logging.getLogger(__name__)
+
+_CHUNK_SIZE = 64 * 1024
+# 이보다 적게 보내거나 받았으면 전송 시간이 타이머 해상도/버퍼링에 묻혀 속도를 계산하지 않습니다
+_MIN_MEASURE_BYTES = 64 * 1024
+
+try:
+    import fcntl
+    import termios
+    _SIOCOUTQ = termios.TIOCOUTQ  # Linux: 소켓 송신 큐에 남은(상대가 아직 ACK하지 않은) 바이트
+except (ImportError, AttributeError):
+    fcntl = None
+    _SIOCOUTQ = None
+
+
+def _measure_download(url: str, max_bytes: int, timeout: float) -> Dict[str, float]:
+    """
+    url에서 최대 max_bytes만큼 받고 (응답시간 ms, 받은 바이트, 전송 시간 초)를 반환합니다.
+
+    전송 시간은 응답 헤더를 받은 시점부터 계산하므로 연결/TLS 시간은 포함되지 않습니다.
+    """
+    request = urllib.request.Request(url, headers={"Range": f"bytes=0-{max_bytes - 1}"})
+    buffer = bytearray(_CHUNK_SIZE)
+    view = memoryview(buffer)
+
+    started = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        headers_at = time.perf_counter()
+        deadline = started + timeout
+        received = 0
+        while received < max_bytes and time.perf_counter() < deadline:
+            n = response.readinto(view[:min(_CHUNK_SIZE, max_bytes - received)])
+            if not n:
+                break
+            received += n
+        finished = time.perf_counter()
+
+    return {
+        "latency_ms": (headers_at - started) * 1000,
+        "bytes": received,
+        "seconds": finished - headers_at,
+    }
+
+
+def _unsent_bytes(sock) -> int:
+    """송신 큐에 남아 상대가 아직 받지 않은 바이트 수 (알 수 없으면 0)"""
+    if _SIOCOUTQ is None:
+        return 0
+    try:
+        return int.from_bytes(fcntl.ioctl(sock.fileno(), _SIOCOUTQ, bytes(4)), "little", signed=True)
+    except OSError:
+        return 0
+
+
+def _measure_upload(url: str, max_bytes: int, timeout: float) -> Dict[str, float]:
+    """
+    url로 max_bytes를 POST하고 (보낸 바이트, 전송 시간 초)를 반환합니다.
+
+    다운로드와 같은 기준이 되도록 연결/TLS와 요청 헤더 전송을 마친 뒤 본문의 첫 바이트부터
+    마지막 바이트가 상대에게 전달될 때까지(송신 큐가 빌 때까지)만 재고, 서버의 응답 대기 시간은 뺍니다.
+    """
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme == "https":
+        conn = http.client.HTTPSConnection(parts.hostname, parts.port, timeout=timeout,
+                                           context=ssl.create_default_context())
+    elif parts.scheme == "http":
+        conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=timeout)
+    else:
+        raise ValueError(f"지원하지 않는 업로드 URL: {url}")
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+
+    payload = memoryview(bytes(max_bytes))
+    try:
+        conn.connect()
+        conn.putrequest("POST", path)
+        conn.putheader("Content-Type", "application/octet-stream")
+        conn.putheader("Content-Length", str(max_bytes))
+        conn.endheaders()
+
+        started = time.perf_counter()
+        deadline = started + timeout
+        sent = 0
+        while sent < max_bytes:
+            if time.perf_counter() >= deadline:
+                raise TimeoutError(f"업로드 타임아웃: {timeout}초 초과")
+            chunk = payload[sent:sent + _CHUNK_SIZE]
+            conn.sock.sendall(chunk)
+            sent += len(chunk)
+        while _unsent_bytes(conn.sock) > 0 and time.perf_counter() < deadline:
+            time.sleep(0.001)
+        finished = time.perf_counter()
+
+        response = conn.getresponse()
+        response.read()
+        if response.status >= 400:
+            raise http.client.HTTPException(f"HTTP {response.status}")
+    finally:
+        conn.close()
+
+    return {"bytes": sent, "seconds": finished - started}
+
+
+def _to_mbps(num_bytes: float, seconds: float) -> Optional[float]:
+    if seconds <= 0 or num_bytes < _MIN_MEASURE_BYTES:
+        return None
+    return round(num_bytes * 8 / seconds / 1_000_000, 2)
+
+
+def check_bandwidth(url: str, max_bytes: int = 2_000_000, timeout: float = 10,
+                    upload_url: Optional[str] = None, upload_bytes: int = 500_000) -> CheckResult:
+    """
+    바이트 수를 제한한 짧은 HTTP 전송으로 대역폭을 추정합니다.
+
+    전체 속도 테스트(check_speed)처럼 회선을 수십 초 동안 포화시키지 않으므로
+    자주 실행할 수 있습니다. 결과는 check_type="bandwidth_probe"로 저장됩니다.
+
+    Args:
+        url: 다운로드할 URL (Range 요청 지원 권장, 예: "https://speed.cloudflare.com/__down?bytes=2000000")
+        max_bytes: 최대 다운로드 바이트
+        timeout: 타임아웃 시간 (초)
+        upload_url: 업로드를 측정할 URL (None이면 업로드 측정 안 함)
+        upload_bytes: 업로드할 바이트
+
+    Returns:
+        CheckResult (dict처럼 result["latency_ms"]로도 읽을 수 있음)
+        {
+            "timestamp": "2025-10-25 14:30:05",
+            "check_type": "bandwidth_probe",
+            "target": "https://speed.cloudflare.com/__down?bytes=2000000",
+            "reachable": True,
+            "latency_ms": 35.1,
+            "download_mbps": 81.3,
+            "upload_mbps": None,
+            "error_message": None
+        }
+    """
+    timestamp = datetime.now()
+
+    try:
+        logger.info(f"대역폭 측정 시작: {url} (최대 {max_bytes}바이트)")
+
+        download = _measure_download(url, max_bytes, timeout)
+        download_mbps = _to_mbps(download["bytes"], download["seconds"])
+
+        upload_mbps = None
+        if upload_url:
+            upload = _measure_upload(upload_url, upload_bytes, timeout)
+            upload_mbps = _to_mbps(upload["bytes"], upload["seconds"])
+
+        logger.info(
+            f"대역폭 측정 완료: 다운로드={download_mbps}Mbps ({download['bytes']}바이트), "
+            f"업로드={upload_mbps}Mbps, 응답시간={download['latency_ms']:.2f}ms"
+        )
+
+        return CheckResult(timestamp, "bandwidth_probe", url[:100], True, latency_ms=download["latency_ms"],
+                           download_mbps=download_mbps, upload_mbps=upload_mbps)
+
+    except Exception as e:
+        error_message = f"대역폭 측정 오류: {str(e)}"
+        logger.error(error_message)
+
+        return CheckResult.failure(timestamp, "bandwidth_probe", url[:100], error_message)
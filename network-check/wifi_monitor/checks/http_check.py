@@ -0,0 +1,383 @@
+import asyncio
+import ipaddress
+import logging
+import socket
+import ssl
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from checks.result import CheckResult
+from utils import tracing
+
+logger = logging.getLogger(__name__)
+
+# 단계별 check_type (network_checks의 한 행씩)
+HTTP_DNS = "http_dns"
+HTTP_CONNECT = "http_connect"
+HTTP_TLS = "http_tls"
+HTTP_TTFB = "http_ttfb"
+
+# 이보다 긴 응답 본문은 다 읽지 않고 연결을 닫습니다 (다음 URL은 새 연결로 요청)
+_MAX_DRAIN_BYTES = 1024 * 1024
+_CHUNK_SIZE = 64 * 1024
+_MAX_HEADER_LINES = 100
+
+Origin = Tuple[str, str, int]
+
+
+class _PhaseError(Exception):
+    """단계 하나가 실패함 (phase: 실패한 단계의 check_type, connect_ms: TLS 실패 전의 TCP 연결 시간)"""
+
+    def __init__(self, phase: str, message: str, connect_ms: Optional[float] = None):
+        super().__init__(message)
+        self.phase = phase
+        self.connect_ms = connect_ms
+
+
+def _parse_url(url: str) -> Tuple[Origin, str]:
+    """URL을 ((scheme, host, port), 요청 경로)로 나눕니다."""
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError(f"http/https URL이 아닙니다: {url}")
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    return (parts.scheme, parts.hostname, port), path
+
+
+def _origin_name(origin: Origin) -> str:
+    _, host, port = origin
+    return f"[{host}]:{port}" if ":" in host else f"{host}:{port}"
+
+
+def _is_ip_literal(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
+
+
+async def _resolve(host: str, timeout: float) -> Tuple[List[tuple], float]:
+    """host의 주소 목록과 걸린 시간(ms)"""
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    with tracing.span("http.dns", target=host):
+        try:
+            infos = await asyncio.wait_for(
+                loop.getaddrinfo(host, None, type=socket.SOCK_STREAM, proto=socket.IPPROTO_TCP), timeout)
+        except asyncio.TimeoutError:
+            raise _PhaseError(HTTP_DNS, f"DNS 조회 타임아웃: {timeout}초 초과")
+        except OSError as e:
+            raise _PhaseError(HTTP_DNS, f"DNS 조회 실패: {e}")
+    return infos, (time.perf_counter() - started) * 1000
+
+
+async def _connect(infos: List[tuple], port: int, timeout: float) -> Tuple[socket.socket, float]:
+    """
+    주소 목록을 순서대로 시도해 처음 연결된 소켓과 그 연결에 걸린 시간(ms)을 반환합니다.
+
+    앞 주소의 실패 시간은 포함하지 않습니다 (IPv6가 막힌 회선에서도 TCP 핸드셰이크 시간만 기록).
+    """
+    loop = asyncio.get_running_loop()
+    errors = []
+    for family, socktype, proto, _, sockaddr in infos:
+        sock = socket.socket(family, socktype, proto)
+        sock.setblocking(False)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(loop.sock_connect(sock, (sockaddr[0], port) + tuple(sockaddr[2:])), timeout)
+        except (OSError, asyncio.TimeoutError) as e:
+            sock.close()
+            errors.append(f"{sockaddr[0]}: {str(e) or '타임아웃'}")
+            continue
+        return sock, (time.perf_counter() - started) * 1000
+    raise _PhaseError(HTTP_CONNECT, f"TCP 연결 실패: {', '.join(errors)}")
+
+
+class _Connection:
+    """origin 하나에 연결된 스트림 (keep-alive로 여러 URL을 차례로 요청)"""
+
+    __slots__ = ("reader", "writer", "host_header", "reusable")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, host_header: str):
+        self.reader = reader
+        self.writer = writer
+        self.host_header = host_header
+        self.reusable = True
+
+    def close(self) -> None:
+        self.writer.close()
+
+    async def request(self, path: str, timeout: float) -> Tuple[int, float]:
+        """
+        GET을 보내고 (상태 코드, 요청을 보낸 뒤 첫 바이트까지 걸린 시간 ms)를 반환합니다.
+
+        다음 요청이 같은 연결을 쓸 수 있도록 본문을 끝까지 읽고, 그럴 수 없으면 reusable을 끕니다.
+        """
+        self.writer.write(
+            f"GET {path} HTTP/1.1\r\nHost: {self.host_header}\r\nUser-Agent: wifi-monitor\r\n"
+            f"Accept: */*\r\nConnection: keep-alive\r\n\r\n".encode("latin-1")
+        )
+        started = time.perf_counter()
+        await self.writer.drain()
+        first = await asyncio.wait_for(self.reader.read(1), timeout)
+        ttfb_ms = (time.perf_counter() - started) * 1000
+        if not first:
+            self.reusable = False
+            raise ConnectionError("응답 없이 연결이 닫힘")
+
+        status_line = first + await asyncio.wait_for(self.reader.readline(), timeout)
+        while True:
+            status = self._parse_status(status_line)
+            headers = await self._read_headers(timeout)
+            # 103 Early Hints 같은 중간 응답은 건너뛰고 최종 응답을 읽습니다 (101은 프로토콜 전환이라 최종 응답)
+            if not 100 <= status < 200 or status == 101:
+                break
+            status_line = await asyncio.wait_for(self.reader.readline(), timeout)
+        keep_alive_default = not status_line.startswith(b"HTTP/1.0")
+        await asyncio.wait_for(self._drain_body(status, headers, keep_alive_default, timeout), timeout)
+        return status, ttfb_ms
+
+    def _parse_status(self, status_line: bytes) -> int:
+        try:
+            return int(status_line.split(None, 2)[1])
+        except (IndexError, ValueError):
+            self.reusable = False
+            raise ValueError(f"HTTP 응답이 아닙니다: {status_line[:40]!r}")
+
+    async def _read_headers(self, timeout: float) -> Dict[str, str]:
+        """빈 줄까지 헤더를 읽습니다 (헤더가 하나도 없는 응답도 처리)."""
+        headers = {}
+        for _ in range(_MAX_HEADER_LINES):
+            line = await asyncio.wait_for(self.reader.readline(), timeout)
+            if not line:
+                self.reusable = False
+                raise ConnectionError("헤더를 받는 중 연결이 닫힘")
+            if line in (b"\r\n", b"\n"):
+                return headers
+            name, sep, value = line.decode("latin-1").partition(":")
+            if sep:
+                headers[name.strip().lower()] = value.strip().lower()
+        self.reusable = False
+        raise ValueError(f"헤더가 {_MAX_HEADER_LINES}줄을 넘습니다")
+
+    async def _drain_body(self, status: int, headers: Dict[str, str], keep_alive_default: bool,
+                          timeout: float) -> None:
+        # HTTP/1.0은 keep-alive를 밝힌 경우에만 연결을 다시 씁니다
+        connection = headers.get("connection", "keep-alive" if keep_alive_default else "close")
+        if connection != "keep-alive":
+            self.reusable = False
+        if status == 101:
+            self.reusable = False
+            return
+        if status in (204, 304):
+            return
+        if "chunked" in headers.get("transfer-encoding", ""):
+            drained = 0
+            while drained <= _MAX_DRAIN_BYTES:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await self._read_headers(timeout)  # 트레일러와 끝의 빈 줄
+                    return
+                await self.reader.readexactly(size + 2)
+                drained += size
+        elif "content-length" in headers:
+            remaining = int(headers["content-length"])
+            if remaining <= _MAX_DRAIN_BYTES:
+                while remaining:
+                    chunk = await self.reader.read(min(remaining, _CHUNK_SIZE))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                if not remaining:
+                    return
+        # 길이를 모르거나 너무 긴 본문: 연결을 닫을 때까지 읽지 않고 버림
+        self.reusable = False
+
+
+async def _open(origin: Origin, infos: List[tuple], timeout: float,
+                ssl_context: Optional[ssl.SSLContext]) -> Tuple[_Connection, float, Optional[float]]:
+    """origin에 연결해 (연결, TCP 연결 ms, TLS 핸드셰이크 ms 또는 None)을 반환합니다."""
+    scheme, host, port = origin
+    with tracing.span("http.connect", target=_origin_name(origin)):
+        sock, connect_ms = await _connect(infos, port, timeout)
+
+    tls_ms = None
+    if scheme == "https":
+        started = time.perf_counter()
+        try:
+            with tracing.span("http.tls", target=_origin_name(origin)):
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(sock=sock, ssl=ssl_context or ssl.create_default_context(),
+                                            server_hostname=host), timeout)
+        except (OSError, asyncio.TimeoutError) as e:
+            sock.close()
+            raise _PhaseError(HTTP_TLS, f"TLS 핸드셰이크 실패: {str(e) or '타임아웃'}", connect_ms)
+        tls_ms = (time.perf_counter() - started) * 1000
+    else:
+        reader, writer = await asyncio.open_connection(sock=sock)
+
+    default_port = 443 if scheme == "https" else 80
+    host_header = f"[{host}]" if ":" in host else host
+    if port != default_port:
+        host_header = f"{host_header}:{port}"
+    return _Connection(reader, writer, host_header), connect_ms, tls_ms
+
+
+async def _probe_origin(origin: Origin, urls: List[Tuple[str, str]], resolver: "asyncio.Future",
+                        timeout: float, ssl_context: Optional[ssl.SSLContext],
+                        semaphore: asyncio.Semaphore) -> List[CheckResult]:
+    """
+    origin 하나의 URL들을 연결 하나로 차례로 요청합니다 (keep-alive).
+
+    연결/TLS 결과는 origin당 한 행, TTFB는 URL마다 한 행입니다. 앞 단계가 실패하면 그 단계의 실패 행과
+    URL별 TTFB 실패 행을 남깁니다.
+    """
+    target = _origin_name(origin)[:100]
+    results: List[CheckResult] = []
+    async with semaphore:
+        timestamp = datetime.now()
+        try:
+            infos = await resolver
+            connection, connect_ms, tls_ms = await _open(origin, infos, timeout, ssl_context)
+            results.append(CheckResult(timestamp, HTTP_CONNECT, target, True, latency_ms=connect_ms))
+            if tls_ms is not None:
+                results.append(CheckResult(timestamp, HTTP_TLS, target, True, latency_ms=tls_ms))
+        except _PhaseError as e:
+            if e.connect_ms is not None:
+                results.append(CheckResult(timestamp, HTTP_CONNECT, target, True, latency_ms=e.connect_ms))
+            if e.phase != HTTP_DNS:
+                results.append(CheckResult.failure(timestamp, e.phase, target, str(e)))
+            for url, _ in urls:
+                results.append(CheckResult.failure(timestamp, HTTP_TTFB, url[:100], f"{e.phase} 단계 실패: {e}"))
+            return results
+
+        try:
+            for index, (url, path) in enumerate(urls):
+                if not connection.reusable:
+                    connection.close()
+                    try:
+                        connection, _, _ = await _open(origin, infos, timeout, ssl_context)
+                    except _PhaseError as e:
+                        # 재연결 실패: 남은 URL은 그 단계의 오류로 기록
+                        for rest, _ in urls[index:]:
+                            results.append(CheckResult.failure(datetime.now(), HTTP_TTFB, rest[:100],
+                                                               f"{e.phase} 단계 실패: {e}"))
+                        break
+                timestamp = datetime.now()
+                try:
+                    with tracing.span("http.ttfb", target=url):
+                        status, ttfb_ms = await connection.request(path, timeout)
+                except (OSError, ValueError, asyncio.TimeoutError, asyncio.IncompleteReadError,
+                        asyncio.LimitOverrunError) as e:
+                    connection.reusable = False
+                    results.append(CheckResult.failure(timestamp, HTTP_TTFB, url[:100],
+                                                       f"HTTP 요청 실패: {str(e) or '타임아웃'}"))
+                    continue
+                error_message = f"HTTP {status}" if status >= 400 else None
+                results.append(CheckResult(timestamp, HTTP_TTFB, url[:100], status < 500,
+                                           latency_ms=ttfb_ms, error_message=error_message))
+        finally:
+            connection.close()
+    return results
+
+
+async def _resolve_host(host: str, timeout: float, results: List[CheckResult]) -> List[tuple]:
+    """호스트 하나를 한 번만 조회합니다. IP 주소면 조회하지 않고 행도 남기지 않습니다."""
+    if _is_ip_literal(host):
+        family = socket.AF_INET6 if ":" in host else socket.AF_INET
+        return [(family, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", (host, 0))]
+    timestamp = datetime.now()
+    try:
+        infos, dns_ms = await _resolve(host, timeout)
+    except _PhaseError as e:
+        results.append(CheckResult.failure(timestamp, HTTP_DNS, host[:100], str(e)))
+        raise
+    results.append(CheckResult(timestamp, HTTP_DNS, host[:100], True, latency_ms=dns_ms))
+    return infos
+
+
+async def async_check_http(urls: List[str], timeout: float = 5.0, concurrency: int = 8,
+                           ssl_context: Optional[ssl.SSLContext] = None) -> List[CheckResult]:
+    """check_http()의 비동기 버전"""
+    by_origin: Dict[Origin, List[Tuple[str, str]]] = {}
+    results: List[CheckResult] = []
+    for url in urls:
+        try:
+            origin, path = _parse_url(url)
+        except ValueError as e:
+            results.append(CheckResult.failure(datetime.now(), HTTP_TTFB, url[:100], str(e)))
+            continue
+        by_origin.setdefault(origin, []).append((url, path))
+
+    # 호스트별 DNS 조회는 한 번만 (http/https, 포트가 달라도 같은 결과를 나눠 씀)
+    dns_results: List[CheckResult] = []
+    resolvers: Dict[str, asyncio.Future] = {}
+    for _, host, _ in by_origin:
+        if host not in resolvers:
+            resolvers[host] = asyncio.ensure_future(_resolve_host(host, timeout, dns_results))
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    per_origin = await asyncio.gather(*(
+        _probe_origin(origin, origin_urls, resolvers[origin[1]], timeout, ssl_context, semaphore)
+        for origin, origin_urls in by_origin.items()
+    ))
+    results.extend(dns_results)
+    for origin_results in per_origin:
+        results.extend(origin_results)
+    return results
+
+
+def check_http(urls: List[str], timeout: float = 5.0, concurrency: int = 8,
+               ssl_context: Optional[ssl.SSLContext] = None) -> List[CheckResult]:
+    """
+    URL마다 DNS 조회, TCP 연결, TLS 핸드셰이크, 첫 바이트까지의 시간(TTFB)을 단계별로 잽니다.
+
+    ping(check_router)과 대량 전송(check_speed)으로는 보이지 않는 "느린 인터넷"의 원인,
+    즉 DNS 지연이나 핸드셰이크 지연을 구분하기 위한 체크입니다. 단계마다 결과 한 행을 남기며,
+    앞 단계에서 재사용한 것은 다시 재지 않습니다.
+
+    - http_dns: 호스트당 한 번 (IP 주소로 된 URL은 행 없음)
+    - http_connect, http_tls: origin(scheme, 호스트, 포트)당 연결 한 번 (http는 TLS 행 없음)
+    - http_ttfb: URL마다. 같은 origin의 URL은 keep-alive 연결 하나로 차례로 요청하므로
+      요청을 보낸 뒤 응답의 첫 바이트가 올 때까지의 시간만 포함합니다.
+
+    origin끼리는 최대 concurrency개를 동시에 체크합니다. 5xx 응답은 reachable=False,
+    4xx는 reachable=True에 error_message="HTTP 404"처럼 기록됩니다. 리다이렉트는 따라가지 않습니다.
+
+    Args:
+        urls: 체크할 URL 목록 (예: ["https://www.google.com/generate_204", "https://naver.com/"])
+        timeout: 단계 하나의 타임아웃 (초)
+        concurrency: 동시에 체크할 최대 origin 수
+        ssl_context: TLS 설정 (None이면 시스템 기본값으로 인증서 검증)
+
+    Returns:
+        단계별 CheckResult 리스트 (DNS 행, origin별 연결/TLS/TTFB 행 순서)
+        {
+            "timestamp": "2025-10-25 14:30:00",
+            "check_type": "http_tls",
+            "target": "www.google.com:443",
+            "reachable": True,
+            "latency_ms": 23.4,
+            "packet_loss": None,
+            "error_message": None
+        }
+    """
+    if not urls:
+        return []
+
+    started = time.monotonic()
+    results = asyncio.run(async_check_http(urls, timeout, concurrency, ssl_context))
+    elapsed = time.monotonic() - started
+
+    failed = [f"{result.check_type}/{result.target}" for result in results if not result.reachable]
+    logger.info(f"HTTP 단계별 체크 완료: URL {len(urls)}개, 결과 {len(results)}건, 실패={len(failed)}, "
+                f"소요시간={elapsed:.2f}초")
+    if failed:
+        logger.warning(f"HTTP 단계별 체크 실패: {', '.join(failed[:10])}")
+    return results
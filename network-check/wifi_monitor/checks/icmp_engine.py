@@ -0,0 +1,225 @@
+import asyncio
+import itertools
+import logging
+import os
+import socket
+import statistics
+import struct
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+
+# raw 소켓은 모든 ICMP 응답을 받으므로 동시에 여러 ping을 보낼 때 id로 구분합니다
+_ident_counter = itertools.count((os.getpid() * 7919) & 0xFFFF)
+
+
+def _checksum(data: bytes) -> int:
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def _build_echo_request(ident: int, seq: int) -> bytes:
+    payload = struct.pack("!d", time.time()) + b"wifi-monitor".ljust(48, b"\x00")
+    header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+    checksum = _checksum(header + payload)
+    return struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, checksum, ident, seq) + payload
+
+
+def _parse_echo_reply(data: bytes) -> Optional[Tuple[int, int]]:
+    """ICMP echo reply에서 (id, seq)를 꺼냅니다. raw 소켓/macOS는 IP 헤더가 앞에 붙어 옵니다."""
+    if data and data[0] >> 4 == 4:
+        data = data[(data[0] & 0x0F) * 4:]
+    if len(data) < 8:
+        return None
+    icmp_type, _code, _checksum_value, ident, seq = struct.unpack("!BBHHH", data[:8])
+    if icmp_type != ICMP_ECHO_REPLY:
+        return None
+    return ident, seq
+
+
+def _open_icmp_socket() -> Tuple[Optional[socket.socket], bool]:
+    """
+    ICMP 소켓을 엽니다. 권한이 필요 없는 datagram 소켓(Linux ping_group_range)을
+    먼저 시도하고, 안 되면 raw 소켓(root 필요)을 시도합니다.
+
+    Returns:
+        (소켓 또는 None, raw 소켓 여부)
+    """
+    for sock_type, raw in ((socket.SOCK_DGRAM, False), (socket.SOCK_RAW, True)):
+        try:
+            sock = socket.socket(socket.AF_INET, sock_type, socket.IPPROTO_ICMP)
+            sock.setblocking(False)
+            return sock, raw
+        except (PermissionError, OSError) as e:
+            logger.debug(f"ICMP 소켓 열기 실패 ({'raw' if raw else 'dgram'}): {e}")
+    return None, False
+
+
+def summarize_rtts(rtts: List[Optional[float]]) -> Dict[str, Any]:
+    """
+    전송 순서대로 정렬된 RTT 목록(손실은 None)으로 통계를 계산합니다.
+
+    Returns:
+        {
+            "sent": 4, "received": 3, "packet_loss": 0.25,
+            "min_ms": 1.2, "avg_ms": 1.5, "max_ms": 2.0,
+            "stddev_ms": 0.3, "jitter_ms": 0.4, "rtts_ms": [1.2, None, 2.0, 1.3]
+        }
+    """
+    received = [rtt for rtt in rtts if rtt is not None]
+    stats: Dict[str, Any] = {
+        "sent": len(rtts),
+        "received": len(received),
+        "packet_loss": (len(rtts) - len(received)) / len(rtts) if rtts else 1.0,
+        "min_ms": None,
+        "avg_ms": None,
+        "max_ms": None,
+        "stddev_ms": None,
+        "jitter_ms": None,
+        "rtts_ms": rtts,
+    }
+    if received:
+        stats["min_ms"] = min(received)
+        stats["avg_ms"] = sum(received) / len(received)
+        stats["max_ms"] = max(received)
+        stats["stddev_ms"] = statistics.pstdev(received)
+        # 지터: 연속으로 응답한 probe 간 RTT 차이의 평균
+        diffs = [abs(b - a) for a, b in zip(received, received[1:])]
+        stats["jitter_ms"] = sum(diffs) / len(diffs) if diffs else 0.0
+    return stats
+
+
+async def _icmp_ping(sock: socket.socket, raw: bool, ip: str, count: int,
+                     interval: float, timeout: float) -> List[Optional[float]]:
+    loop = asyncio.get_running_loop()
+    ident = next(_ident_counter) & 0xFFFF
+    base_seq = int.from_bytes(os.urandom(2), "big")
+    sent_at: Dict[int, float] = {}
+    rtts: Dict[int, float] = {}
+    all_replied = loop.create_future()
+
+    def on_readable() -> None:
+        while True:
+            try:
+                data, addr = sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                logger.debug(f"ICMP 수신 오류: {e}")
+                return
+            received_at = time.perf_counter()
+            parsed = _parse_echo_reply(data)
+            if parsed is None or addr[0] != ip:
+                continue
+            reply_ident, seq = parsed
+            # datagram 소켓은 커널이 id를 바꾸고 응답도 걸러주므로 raw일 때만 id를 비교합니다
+            if raw and reply_ident != ident:
+                continue
+            if seq in sent_at and seq not in rtts:
+                rtts[seq] = (received_at - sent_at[seq]) * 1000
+                if len(rtts) == count and not all_replied.done():
+                    all_replied.set_result(None)
+
+    loop.add_reader(sock.fileno(), on_readable)
+    try:
+        seqs = [(base_seq + i) & 0xFFFF for i in range(count)]
+        for i, seq in enumerate(seqs):
+            sent_at[seq] = time.perf_counter()
+            try:
+                sock.sendto(_build_echo_request(ident, seq), (ip, 0))
+            except OSError as e:
+                logger.debug(f"ICMP 전송 실패 (seq={seq}): {e}")
+            if i < count - 1:
+                await asyncio.sleep(interval)
+
+        # 마지막 probe 전송 후 최대 timeout까지만 기다립니다
+        try:
+            await asyncio.wait_for(asyncio.shield(all_replied), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return [rtts.get(seq) for seq in seqs]
+    finally:
+        loop.remove_reader(sock.fileno())
+
+
+async def _tcp_probe(ip: str, port: int, timeout: float) -> Optional[float]:
+    """TCP 연결 시간으로 RTT를 측정합니다. RST(연결 거부)도 호스트가 응답한 것으로 봅니다."""
+    start = time.perf_counter()
+    try:
+        _reader, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout)
+        rtt = (time.perf_counter() - start) * 1000
+        writer.close()
+        return rtt
+    except ConnectionRefusedError:
+        return (time.perf_counter() - start) * 1000
+    except (asyncio.TimeoutError, OSError):
+        return None
+
+
+async def _tcp_ping(ip: str, port: int, count: int, interval: float,
+                    timeout: float) -> List[Optional[float]]:
+    tasks = []
+    for i in range(count):
+        tasks.append(asyncio.ensure_future(_tcp_probe(ip, port, timeout)))
+        if i < count - 1:
+            await asyncio.sleep(interval)
+    return list(await asyncio.gather(*tasks))
+
+
+async def async_ping(host: str, count: int = 4, interval: float = 0.2, timeout: float = 5.0,
+                     mode: str = "auto", tcp_port: int = 80) -> Dict[str, Any]:
+    """
+    host에 count개의 probe를 interval 간격으로 보내고 응답을 seq로 매칭합니다.
+
+    probe는 응답을 기다리지 않고 연달아 전송되므로, 최악의 경우 소요 시간은
+    (count - 1) * interval + timeout 입니다.
+
+    Args:
+        host: 대상 IP 또는 호스트명
+        count: probe 수
+        interval: probe 전송 간격 (초)
+        timeout: 마지막 probe 전송 후 응답 대기 시간 (초)
+        mode: "auto" (ICMP, 권한이 없으면 TCP), "icmp", "tcp"
+        tcp_port: TCP 대체 모드에서 연결할 포트
+
+    Returns:
+        summarize_rtts()의 결과에 "method" ("icmp" 또는 "tcp") 추가
+    """
+    loop = asyncio.get_running_loop()
+    infos = await loop.getaddrinfo(host, None, family=socket.AF_INET, type=socket.SOCK_STREAM)
+    ip = infos[0][4][0]
+
+    sock, raw = (None, False)
+    if mode in ("auto", "icmp"):
+        sock, raw = _open_icmp_socket()
+        if sock is None and mode == "icmp":
+            raise PermissionError("ICMP 소켓을 열 수 없습니다 (root 권한 또는 net.ipv4.ping_group_range 설정 필요)")
+
+    if sock is not None:
+        try:
+            rtts = await _icmp_ping(sock, raw, ip, count, interval, timeout)
+        finally:
+            sock.close()
+        method = "icmp"
+    else:
+        logger.debug(f"ICMP 소켓을 사용할 수 없어 TCP:{tcp_port} 연결 시간으로 측정합니다")
+        rtts = await _tcp_ping(ip, tcp_port, count, interval, timeout)
+        method = "tcp"
+
+    stats = summarize_rtts(rtts)
+    stats["method"] = method
+    return stats
+
+
+def ping(host: str, count: int = 4, interval: float = 0.2, timeout: float = 5.0,
+         mode: str = "auto", tcp_port: int = 80) -> Dict[str, Any]:
+    """async_ping()의 동기 버전 (호출 스레드에서 이벤트 루프를 실행)"""
+    return asyncio.run(async_ping(host, count, interval, timeout, mode, tcp_port))
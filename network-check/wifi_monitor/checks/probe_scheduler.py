@@ -0,0 +1,64 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Dict, Any, List
+
+from checks.result import CheckResult
+from checks.router_check import async_check_router, build_router_error
+
+logger = logging.getLogger(__name__)
+
+
+async def _probe_targets(targets: List[str], concurrency: int, target_timeout: float,
+                         ping_kwargs: Dict[str, Any]) -> List[CheckResult]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def probe(target: str) -> CheckResult:
+        async with semaphore:
+            timestamp = datetime.now()
+            try:
+                return await asyncio.wait_for(async_check_router(target, **ping_kwargs), target_timeout)
+            except asyncio.TimeoutError:
+                return build_router_error(target, timestamp, f"공유기 체크 타임아웃: {target_timeout}초 초과")
+
+    return list(await asyncio.gather(*(probe(target) for target in targets)))
+
+
+def check_targets(targets: List[str], ping_count: int = 4, timeout: int = 5,
+                  interval: float = 0.2, mode: str = "auto", tcp_port: int = 80,
+                  concurrency: int = 32, target_timeout: float = 10.0) -> List[CheckResult]:
+    """
+    여러 대상에 동시에 ping을 보내고 대상별 결과 리스트를 반환합니다.
+
+    최대 concurrency개의 대상을 한 이벤트 루프에서 동시에 체크하므로, 대상 수가
+    concurrency 이하라면 한 틱의 소요 시간은 가장 느린 대상 하나의 시간과 같습니다.
+    target_timeout을 넘긴 대상은 reachable=False 결과로 기록됩니다.
+
+    Args:
+        targets: 대상 IP/호스트명 목록 (예: ["192.168.0.1", "1.1.1.1"])
+        ping_count, timeout, interval, mode, tcp_port: check_router()와 동일
+        concurrency: 동시에 체크할 최대 대상 수
+        target_timeout: 대상 하나에 허용하는 최대 시간 (초)
+
+    Returns:
+        targets 순서와 같은 check_router() 결과 리스트
+    """
+    if not targets:
+        return []
+
+    ping_kwargs = {
+        "ping_count": ping_count,
+        "timeout": timeout,
+        "interval": interval,
+        "mode": mode,
+        "tcp_port": tcp_port,
+    }
+
+    started = time.monotonic()
+    results = asyncio.run(_probe_targets(targets, max(1, concurrency), target_timeout, ping_kwargs))
+    elapsed = time.monotonic() - started
+
+    reachable = sum(1 for result in results if result["reachable"])
+    logger.info(f"대상 {len(targets)}개 체크 완료: 접속가능={reachable}, 소요시간={elapsed:.2f}초")
+    return results
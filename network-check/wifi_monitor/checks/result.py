@@ -0,0 +1,165 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# network_checks 테이블의 결과 컬럼 (INSERT/COPY/로컬 버퍼 공통 순서)
+RESULT_COLUMNS = (
+    "timestamp",
+    "check_type",
+    "target",
+    "reachable",
+    "latency_ms",
+    "packet_loss",
+    "download_mbps",
+    "upload_mbps",
+    "error_message",
+)
+
+# COPY 텍스트 형식에서 이스케이프해야 하는 문자
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+class CheckResult:
+    """
+    체크 결과 한 건 (network_checks의 한 행).
+
+    __slots__로 필드를 고정해 dict보다 작고, 기존 코드와의 호환을 위해
+    result["latency_ms"], result.get("latency_ms")처럼 dict 방식으로도 읽을 수 있습니다.
+    """
+
+    __slots__ = RESULT_COLUMNS
+
+    def __init__(self, timestamp: datetime, check_type: str, target: str, reachable: bool,
+                 latency_ms: Optional[float] = None, packet_loss: Optional[float] = None,
+                 download_mbps: Optional[float] = None, upload_mbps: Optional[float] = None,
+                 error_message: Optional[str] = None):
+        self.timestamp = timestamp
+        self.check_type = check_type
+        self.target = target
+        self.reachable = reachable
+        self.latency_ms = latency_ms
+        self.packet_loss = packet_loss
+        self.download_mbps = download_mbps
+        self.upload_mbps = upload_mbps
+        self.error_message = error_message
+
+    @classmethod
+    def failure(cls, timestamp: datetime, check_type: str, target: str, error_message: str,
+                packet_loss: Optional[float] = None) -> "CheckResult":
+        """실패한 체크의 결과를 만듭니다."""
+        return cls(timestamp, check_type, target, False, packet_loss=packet_loss, error_message=error_message)
+
+    @classmethod
+    def from_dict(cls, result: Dict[str, Any]) -> "CheckResult":
+        return cls(*(result.get(column) for column in RESULT_COLUMNS))
+
+    @classmethod
+    def from_row(cls, row: Iterable[Any]) -> "CheckResult":
+        """RESULT_COLUMNS 순서의 값으로 결과를 만듭니다."""
+        return cls(*row)
+
+    # dict 호환 접근 (기존 result["..."] / result.get(...) 코드용)
+    def __getitem__(self, key: str) -> Any:
+        if key not in RESULT_COLUMNS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in RESULT_COLUMNS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: object) -> bool:
+        return key in RESULT_COLUMNS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(RESULT_COLUMNS)
+
+    def __len__(self) -> int:
+        return len(RESULT_COLUMNS)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in RESULT_COLUMNS:
+            return default
+        return getattr(self, key)
+
+    def keys(self) -> Tuple[str, ...]:
+        return RESULT_COLUMNS
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(column, getattr(self, column)) for column in RESULT_COLUMNS]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {column: getattr(self, column) for column in RESULT_COLUMNS}
+
+    def to_row(self) -> tuple:
+        """RESULT_COLUMNS 순서의 DB 파라미터 튜플"""
+        return (self.timestamp, self.check_type, self.target, self.reachable, self.latency_ms,
+                self.packet_loss, self.download_mbps, self.upload_mbps, self.error_message)
+
+    def to_copy_line(self) -> str:
+        """PostgreSQL COPY 텍스트 형식의 한 줄 (탭 구분, NULL은 \\N)"""
+        fields = []
+        for value in self.to_row():
+            if value is None:
+                fields.append("\\N")
+            elif value is True:
+                fields.append("t")
+            elif value is False:
+                fields.append("f")
+            elif isinstance(value, datetime):
+                fields.append(value.isoformat())
+            elif isinstance(value, str):
+                fields.append(value.translate(_COPY_ESCAPES))
+            else:
+                fields.append(repr(value))
+        return "\t".join(fields) + "\n"
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CheckResult):
+            return self.to_row() == other.to_row()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{column}={getattr(self, column)!r}" for column in RESULT_COLUMNS)
+        return f"CheckResult({fields})"
+
+
+def as_result(result) -> CheckResult:
+    """dict로 넘어온 결과도 CheckResult로 맞춥니다."""
+    if isinstance(result, CheckResult):
+        return result
+    return CheckResult.from_dict(result)
+
+
+class ResultBatch:
+    """
+    한 틱에서 나온 여러 결과를 모아 DB/COPY/로컬 버퍼 형식으로 한 번에 변환합니다.
+    """
+
+    __slots__ = ("_results",)
+
+    def __init__(self, results: Iterable[Any] = ()):
+        self._results: List[CheckResult] = [as_result(result) for result in results]
+
+    def append(self, result) -> None:
+        self._results.append(as_result(result))
+
+    def extend(self, results: Iterable[Any]) -> None:
+        self._results.extend(as_result(result) for result in results)
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def __iter__(self) -> Iterator[CheckResult]:
+        return iter(self._results)
+
+    def __getitem__(self, index: int) -> CheckResult:
+        return self._results[index]
+
+    def to_rows(self) -> List[tuple]:
+        return [result.to_row() for result in self._results]
+
+    def to_copy_text(self) -> str:
+        return "".join(result.to_copy_line() for result in self._results)
@@ -1,19 +1,100 @@
 import speedtest
+import json
 import logging
+import os
+import threading
+import time
 from datetime import datetime
 from typing import Dict, Any, Optional
 
+from config import SPEEDTEST_CACHE_PATH, SPEEDTEST_CACHE_TTL_SECONDS
+from checks.result import CheckResult
+from utils import tracing
+
 logger = logging.getLogger(__name__)
 
-def check_speed(server_url: Optional[str] = None, timeout: int = 60) -> Dict[str, Any]:
+# 캐시된 서버의 응답시간이 이 값 이상이면 (speedtest-cli는 실패한 요청을 3600초로 계산) 서버를 다시 찾습니다
+_CACHED_SERVER_MAX_LATENCY_MS = 1000
+
+
+class _CachedSpeedtest(speedtest.Speedtest):
+    """캐시된 설정이 있으면 speedtest.net 설정 다운로드를 건너뛰는 Speedtest"""
+
+    def __init__(self, cached_config: Dict[str, Any], **kwargs):
+        self._cached_config = cached_config
+        super().__init__(**kwargs)
+
+    def get_config(self):
+        self.config.update(self._cached_config)
+        client = self.config["client"]
+        self.lat_lon = (float(client["lat"]), float(client["lon"]))
+        return self.config
+
+
+def _load_server_cache(cache_path: str, ttl: float) -> Optional[Dict[str, Any]]:
+    """TTL 안의 서버 선택 캐시를 읽습니다. 없거나 만료/손상되었으면 None"""
+    if not cache_path:
+        return None
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            cache = json.load(f)
+        if time.time() - cache["saved_at"] > ttl:
+            logger.info("속도 테스트 서버 캐시가 만료되었습니다")
+            return None
+        if "client" not in cache["config"] or "url" not in cache["server"]:
+            raise KeyError("config.client 또는 server.url 없음")
+        return cache
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.warning(f"속도 테스트 서버 캐시를 읽을 수 없습니다: {e}")
+        return None
+
+
+def _save_server_cache(cache_path: str, config: Dict[str, Any], server: Dict[str, Any]) -> None:
+    """설정과 선택된 서버를 캐시 파일에 원자적으로 저장합니다."""
+    if not cache_path:
+        return
+    tmp_path = f"{cache_path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"saved_at": time.time(), "config": config, "server": server}, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError) as e:
+        logger.warning(f"속도 테스트 서버 캐시 저장 실패: {e}")
+
+
+def invalidate_server_cache(cache_path: str = SPEEDTEST_CACHE_PATH) -> None:
+    """서버 선택 캐시를 삭제합니다. 다음 측정 때 설정과 서버 목록을 다시 받습니다."""
+    if not cache_path:
+        return
+    try:
+        os.remove(cache_path)
+        logger.info("속도 테스트 서버 캐시를 삭제했습니다")
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"속도 테스트 서버 캐시 삭제 실패: {e}")
+
+
+def check_speed(server_url: Optional[str] = None, timeout: int = 60,
+                cache_path: str = SPEEDTEST_CACHE_PATH,
+                cache_ttl: float = SPEEDTEST_CACHE_TTL_SECONDS) -> CheckResult:
     """
     인터넷 속도를 측정합니다.
     
+    speedtest.net 설정과 선택된 서버는 cache_path에 cache_ttl 동안 저장되어,
+    캐시가 유효하면 설정/서버 목록 다운로드와 후보 서버 latency 측정을 건너뛰고
+    캐시된 서버 하나의 응답시간만 다시 잽니다. 측정이 실패하면 캐시는 삭제됩니다.
+    
     Args:
         server_url: 속도 측정 서버 URL (None이면 자동 선택)
-        timeout: 타임아웃 시간 (초)
+        timeout: 타임아웃 시간 (초). 넘기면 다운로드/업로드 측정을 중단합니다
+        cache_path: 서버 선택 캐시 파일 경로 (빈 문자열이면 캐시 사용 안 함)
+        cache_ttl: 캐시 유효 시간 (초)
     
     Returns:
+        CheckResult (dict처럼 result["latency_ms"]로도 읽을 수 있음)
         {
             "timestamp": "2025-10-25 14:30:05",
             "check_type": "speed_test",
@@ -27,15 +108,44 @@ def check_speed(server_url: Optional[str] = None, timeout: int = 60) -> Dict[str
     """
     timestamp = datetime.now()
     
+    # timeout이 지나면 shutdown_event가 설정되어 측정 스레드가 중단됩니다
+    shutdown_event = threading.Event()
+    timer = threading.Timer(timeout, shutdown_event.set)
+    timer.daemon = True
+    timer.start()
+    
+    cache = _load_server_cache(cache_path, cache_ttl)
+    succeeded = False
+    
     try:
         logger.info("속도 테스트 시작")
         
-        # Speedtest 인스턴스 생성
-        st = speedtest.Speedtest()
-        st.get_best_server()
+        # 요청별 소켓 타임아웃은 전체 타임아웃을 넘지 않도록
+        speedtest_kwargs = {"timeout": min(10, timeout), "shutdown_event": shutdown_event}
+        server_info = None
+        
+        if cache is not None:
+            # 캐시된 설정/서버 사용: 서버 하나의 응답시간만 다시 측정
+            logger.info("캐시된 속도 테스트 서버 사용")
+            with tracing.span("speed.config", cached=True):
+                st = _CachedSpeedtest(cache["config"], **speedtest_kwargs)
+            with tracing.span("speed.server_select", cached=True):
+                server_info = st.get_best_server([cache["server"]])
+            if server_info.get('latency', 0) >= _CACHED_SERVER_MAX_LATENCY_MS:
+                logger.warning("캐시된 서버가 응답하지 않아 서버를 다시 찾습니다")
+                invalidate_server_cache(cache_path)
+                cache = None
+                server_info = None
+        
+        if server_info is None:
+            # 설정과 서버 목록을 받아 가장 빠른 서버 선택 (한 번만)
+            with tracing.span("speed.config", cached=False):
+                st = speedtest.Speedtest(**speedtest_kwargs)
+            with tracing.span("speed.server_select", cached=False):
+                server_info = st.get_best_server()
+            _save_server_cache(cache_path, st.config, server_info)
         
         # 서버 정보 가져오기
-        server_info = st.get_best_server()
         target_server = server_info.get('host', 'unknown')
         latency_ms = server_info.get('latency', 0)
         
@@ -43,72 +153,50 @@ def check_speed(server_url: Optional[str] = None, timeout: int = 60) -> Dict[str
         
         # 다운로드 속도 측정
         logger.info("다운로드 속도 측정 중...")
-        download_bps = st.download()
+        with tracing.span("speed.download"):
+            download_bps = st.download()
         download_mbps = download_bps / 1_000_000  # bps를 Mbps로 변환
         
         # 업로드 속도 측정
         logger.info("업로드 속도 측정 중...")
-        upload_bps = st.upload()
+        with tracing.span("speed.upload"):
+            upload_bps = st.upload()
         upload_mbps = upload_bps / 1_000_000  # bps를 Mbps로 변환
         
+        if shutdown_event.is_set():
+            raise TimeoutError(f"{timeout}초 초과")
+        
         logger.info(f"속도 테스트 완료: 다운로드={download_mbps:.2f}Mbps, 업로드={upload_mbps:.2f}Mbps")
         
-        return {
-            "timestamp": timestamp,
-            "check_type": "speed_test",
-            "target": target_server,
-            "reachable": True,
-            "latency_ms": latency_ms,
-            "packet_loss": None,
-            "download_mbps": round(download_mbps, 2),
-            "upload_mbps": round(upload_mbps, 2),
-            "error_message": None
-        }
+        succeeded = True
+        return CheckResult(timestamp, "speed_test", target_server, True, latency_ms=latency_ms,
+                           download_mbps=round(download_mbps, 2), upload_mbps=round(upload_mbps, 2))
+        
+    except TimeoutError as e:
+        error_message = f"속도 테스트 타임아웃: {str(e)}"
+        logger.error(error_message)
+        
+        return CheckResult.failure(timestamp, "speed_test", "unknown", error_message)
         
     except speedtest.ConfigRetrievalError as e:
         error_message = f"속도 테스트 설정 오류: {str(e)}"
         logger.error(error_message)
         
-        return {
-            "timestamp": timestamp,
-            "check_type": "speed_test",
-            "target": "unknown",
-            "reachable": False,
-            "latency_ms": None,
-            "packet_loss": None,
-            "download_mbps": None,
-            "upload_mbps": None,
-            "error_message": error_message
-        }
+        return CheckResult.failure(timestamp, "speed_test", "unknown", error_message)
         
     except speedtest.ServersRetrievalError as e:
         error_message = f"속도 테스트 서버 검색 오류: {str(e)}"
         logger.error(error_message)
         
-        return {
-            "timestamp": timestamp,
-            "check_type": "speed_test",
-            "target": "unknown",
-            "reachable": False,
-            "latency_ms": None,
-            "packet_loss": None,
-            "download_mbps": None,
-            "upload_mbps": None,
-            "error_message": error_message
-        }
+        return CheckResult.failure(timestamp, "speed_test", "unknown", error_message)
         
     except Exception as e:
         error_message = f"속도 테스트 오류: {str(e)}"
         logger.error(error_message)
         
-        return {
-            "timestamp": timestamp,
-            "check_type": "speed_test",
-            "target": "unknown",
-            "reachable": False,
-            "latency_ms": None,
-            "packet_loss": None,
-            "download_mbps": None,
-            "upload_mbps": None,
-            "error_message": error_message
-        }
+        return CheckResult.failure(timestamp, "speed_test", "unknown", error_message)
+        
+    finally:
+        timer.cancel()
+        if cache is not None and not succeeded:
+            invalidate_server_cache(cache_path)
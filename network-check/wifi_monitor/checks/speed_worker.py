@@ -0,0 +1,188 @@
+import logging
+import multiprocessing
+import multiprocessing.forkserver
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from config import LOG_LEVEL
+from checks.result import CheckResult
+from checks.speed_check import check_speed
+from utils import tracing
+
+logger = logging.getLogger(__name__)
+
+
+def _speed_test_failure(timestamp: datetime, error_message: str) -> CheckResult:
+    logger.error(error_message)
+    return CheckResult.failure(timestamp, "speed_test", "unknown", error_message)
+
+
+class _PipeLogHandler(logging.Handler):
+    """자식 프로세스의 로그 레코드를 결과 파이프로 부모에게 보냅니다."""
+
+    def __init__(self, conn):
+        super().__init__()
+        self.conn = conn
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            # 부모에서 다시 포맷할 수 있도록 메시지를 문자열로 확정합니다 (args/exc_info는 피클 불가일 수 있음)
+            record.msg = record.getMessage()
+            record.args = None
+            if record.exc_info:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+                record.exc_info = None
+            self.conn.send(("log", record))
+        except Exception:
+            self.handleError(record)
+
+
+def _child_main(conn, server_url: Optional[str], timeout: int,
+                trace_context: Optional[tracing.TraceContext] = None) -> None:
+    """자식 프로세스에서 속도 테스트를 실행하고 결과를 파이프로 돌려보냅니다."""
+    # 자식에는 부모의 로깅 설정이 없거나(forkserver/spawn) 리스너 스레드 없는 큐 핸들러만 남으므로(fork),
+    # 로그는 결과와 같은 파이프로 부모에게 보내 부모의 로깅 파이프라인에서 기록합니다
+    handler = _PipeLogHandler(conn)
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(LOG_LEVEL)
+
+    # 자식의 span은 파일/메트릭으로 직접 내보내지 않고 모아서 부모의 추적에 붙입니다
+    collector = tracing.CollectingExporter()
+    tracing.configure(trace_context is not None, 1.0, [collector])
+
+    try:
+        with tracing.continue_trace(trace_context, "speed.child"):
+            result = check_speed(server_url, timeout)
+        with handler.lock:
+            if collector.spans:
+                conn.send(("spans", collector.spans))
+            conn.send(("result", result))
+    finally:
+        root.removeHandler(handler)
+        conn.close()
+
+
+class SpeedTestRunner:
+    """
+    속도 테스트를 별도 프로세스에서 실행합니다.
+
+    speedtest-cli의 설정/서버 목록 다운로드는 소켓 타임아웃 외에 멈출 방법이 없어서,
+    같은 프로세스에서 돌리면 멈춘 스레드를 회수할 수 없습니다. 자식 프로세스는
+    timeout을 넘기거나 cancel()이 호출되면 강제로 종료됩니다.
+    """
+
+    def __init__(self, timeout: float = 90, start_method: Optional[str] = None):
+        self.timeout = timeout
+        if start_method is None:
+            # 스레드가 여럿인 부모에서 fork하면 다른 스레드가 잡고 있던 락을 물려받아 자식이 멈출 수 있으므로
+            # 기본값은 forkserver (없으면 spawn)이고, fork는 SPEED_TEST_START_METHOD로 명시할 때만 씁니다
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self._context = multiprocessing.get_context(start_method)
+        self._cancelled = threading.Event()
+        self._closed = False
+        self._prewarmed = False
+
+    def prewarm(self) -> None:
+        """
+        forkserver를 미리 띄우고 속도 테스트 모듈을 불러 둡니다 (서비스 시작 시 한 번).
+
+        체크 스레드가 생기기 전에 호출하면 첫 속도 테스트가 서버 시작과 import 시간을 기다리지 않습니다.
+        forkserver가 아니거나 이미 준비했으면 아무것도 하지 않습니다. 호출하지 않았으면 첫 실행 때 준비합니다
+        (기본 preload인 __main__을 그대로 두면 forkserver가 main.py의 모듈 수준 설정을 다시 실행함).
+        """
+        if self._prewarmed or self._context.get_start_method() != "forkserver":
+            return
+        self._prewarmed = True
+        started = time.perf_counter()
+        self._context.set_forkserver_preload(["checks.speed_worker"])
+        multiprocessing.forkserver.ensure_running()
+        logger.debug(f"속도 테스트 forkserver 준비: {(time.perf_counter() - started) * 1000:.1f}ms")
+
+    def run(self, server_url: Optional[str] = None) -> CheckResult:
+        """
+        속도 테스트를 실행하고 check_speed()와 같은 형식의 결과를 반환합니다.
+
+        timeout을 넘기거나 취소되면 자식 프로세스를 종료하고 reachable=False 결과를 반환합니다.
+        """
+        timestamp = datetime.now()
+        if self._closed:
+            return _speed_test_failure(timestamp, "속도 테스트가 취소되었습니다")
+
+        cancelled = threading.Event()
+        self._cancelled = cancelled
+
+        with tracing.span("speed.subprocess"):
+            return self._run_child(server_url, timestamp, cancelled)
+
+    def _run_child(self, server_url: Optional[str], timestamp: datetime,
+                   cancelled: threading.Event) -> CheckResult:
+        self.prewarm()
+        parent_conn, child_conn = self._context.Pipe(duplex=False)
+        # 자식 내부 타임아웃은 조금 짧게 주어 가능하면 자식이 스스로 정리하도록 합니다
+        child_timeout = max(1, int(self.timeout) - 5)
+        process = self._context.Process(
+            target=_child_main,
+            args=(child_conn, server_url, child_timeout, tracing.current_context()),
+            name="speed-test",
+            daemon=True,
+        )
+
+        with tracing.span("speed.spawn", start_method=self._context.get_start_method()):
+            process.start()
+        child_conn.close()
+
+        deadline = time.monotonic() + self.timeout
+        finished = False
+        try:
+            while True:
+                if cancelled.is_set():
+                    return _speed_test_failure(timestamp, "속도 테스트가 취소되었습니다")
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return _speed_test_failure(timestamp, f"속도 테스트 타임아웃: {self.timeout}초 초과")
+
+                if parent_conn.poll(min(0.5, remaining)):
+                    try:
+                        kind, payload = parent_conn.recv()
+                        if kind == "log":
+                            logging.getLogger(payload.name).handle(payload)
+                            continue
+                        if kind == "spans":
+                            tracing.adopt_spans(payload)
+                            continue
+                        finished = True
+                        return payload
+                    except EOFError:
+                        process.join(1)
+                        return _speed_test_failure(
+                            timestamp, f"속도 테스트 프로세스가 비정상 종료되었습니다 (exit code: {process.exitcode})"
+                        )
+        finally:
+            parent_conn.close()
+            self._terminate(process, grace=1 if finished else 0)
+
+    def _terminate(self, process, grace: float) -> None:
+        # 결과를 보낸 자식은 곧 스스로 종료되므로 잠시 기다립니다
+        process.join(grace)
+        if process.is_alive():
+            logger.warning("속도 테스트 프로세스를 종료합니다")
+            process.terminate()
+            process.join(2)
+            if process.is_alive():
+                process.kill()
+        process.join(2)
+
+    def cancel(self) -> None:
+        """실행 중인 속도 테스트를 취소합니다 (다른 스레드에서 호출 가능)."""
+        self._cancelled.set()
+
+    def shutdown(self) -> None:
+        """실행 중인 속도 테스트를 취소하고 이후 실행도 막습니다 (서비스 종료 시)."""
+        self._closed = True
+        self.cancel()
@@ -1,8 +1,27 @@
 import os
-from dotenv import load_dotenv
 
-# .env 파일 로드 (파일이 없어도 에러 없이 진행)
-load_dotenv()
+
+def _load_dotenv() -> None:
+    """
+    .env 파일이 있을 때만 python-dotenv를 불러와 로드합니다 (파일이 없어도 에러 없이 진행).
+
+    load_dotenv()와 같이 이 파일의 디렉토리부터 상위로 올라가며 찾습니다. 환경 변수를 systemd나
+    cron에서 넘기는 경우 dotenv를 불러오는 시간(Pi Zero에서 수십 ms)을 아낍니다.
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        path = os.path.join(directory, ".env")
+        if os.path.isfile(path):
+            from dotenv import load_dotenv
+            load_dotenv(path)
+            return
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return
+        directory = parent
+
+
+_load_dotenv()
 
 # 데이터베이스 설정
 DB_CONFIG = {
@@ -14,13 +33,144 @@ DB_CONFIG = {
     "sslmode": "require"
 }
 
+# 커넥션 풀 설정 (MIN_CONN: 틱 사이에 열어 둘 유휴 연결 수)
+DB_POOL_MIN_CONN = int(os.getenv("DB_POOL_MIN_CONN", "2"))
+DB_POOL_MAX_CONN = int(os.getenv("DB_POOL_MAX_CONN", "4"))
+DB_POOL_HEALTH_CHECK_SECONDS = int(os.getenv("DB_POOL_HEALTH_CHECK_SECONDS", "30"))
+DB_RECONNECT_BACKOFF_SECONDS = float(os.getenv("DB_RECONNECT_BACKOFF_SECONDS", "1"))
+DB_RECONNECT_BACKOFF_MAX_SECONDS = float(os.getenv("DB_RECONNECT_BACKOFF_MAX_SECONDS", "60"))
+
+# 파티션/보존 기간 설정 (network_checks는 일 단위 파티션)
+DB_RETENTION_DAYS = int(os.getenv("DB_RETENTION_DAYS", "90"))
+DB_PARTITION_PRECREATE_DAYS = int(os.getenv("DB_PARTITION_PRECREATE_DAYS", "7"))
+DB_MAINTENANCE_INTERVAL_SECONDS = float(os.getenv("DB_MAINTENANCE_INTERVAL_SECONDS", "3600"))
+
+# 분/시간/일 단위 집계 (network_check_rollups, 분 단위 집계만 보존 기간 후 삭제).
+# 원본 전체가 필요하므로 STORAGE_MODE=spans에서는 갱신하지 않음
+ROLLUP_INTERVAL_SECONDS = float(os.getenv("ROLLUP_INTERVAL_SECONDS", "300"))
+ROLLUP_MINUTE_RETENTION_DAYS = int(os.getenv("ROLLUP_MINUTE_RETENTION_DAYS", "30"))
+
+# 로깅 설정 (파일은 크기 또는 시간 기준으로 교체, 오래된 파일은 gzip 압축)
+LOG_FILE = os.getenv("LOG_FILE", "wifi_monitor.log")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# text / json (json: 한 줄에 JSON 객체 하나, 체크 결과 필드 포함)
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(5 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+# 비어 있으면 크기 기준, "midnight" / "H" 등이면 시간 기준으로 교체
+LOG_ROTATE_WHEN = os.getenv("LOG_ROTATE_WHEN", "")
+LOG_COMPRESS = os.getenv("LOG_COMPRESS", "true").lower() == "true"
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# 메트릭 엔드포인트 (Prometheus 텍스트 형식, http://METRICS_HOST:METRICS_PORT/metrics)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9105"))
+
+# 최근 결과 링 버퍼 (대상별 보관 개수, /recent/stats로 조회)
+RECENT_SAMPLES_CAPACITY = int(os.getenv("RECENT_SAMPLES_CAPACITY", "2048"))
+
+# 장애 감지 (연속 실패, 응답시간 CUSUM, 속도 하락)
+DETECTOR_FAILURE_THRESHOLD = int(os.getenv("DETECTOR_FAILURE_THRESHOLD", "3"))
+DETECTOR_RECOVERY_THRESHOLD = int(os.getenv("DETECTOR_RECOVERY_THRESHOLD", "2"))
+DETECTOR_EWMA_ALPHA = float(os.getenv("DETECTOR_EWMA_ALPHA", "0.1"))
+DETECTOR_CUSUM_K = float(os.getenv("DETECTOR_CUSUM_K", "0.5"))
+DETECTOR_CUSUM_H = float(os.getenv("DETECTOR_CUSUM_H", "5.0"))
+DETECTOR_MIN_STD_MS = float(os.getenv("DETECTOR_MIN_STD_MS", "1.0"))
+DETECTOR_WARMUP_SAMPLES = int(os.getenv("DETECTOR_WARMUP_SAMPLES", "10"))
+DETECTOR_THROUGHPUT_DROP = float(os.getenv("DETECTOR_THROUGHPUT_DROP", "0.5"))
+# 장애 시작/종료를 JSON으로 POST할 주소 (비어 있으면 사용 안 함)
+ALERT_WEBHOOK_URL = os.getenv("ALERT_WEBHOOK_URL", "")
+ALERT_WEBHOOK_TIMEOUT = float(os.getenv("ALERT_WEBHOOK_TIMEOUT", "5"))
+
+# 단계별 추적 (틱 하나의 ping/프로세스 생성/서버 선택/전송/DB 연결/COPY 시간 측정)
+TRACE_ENABLED = os.getenv("TRACE_ENABLED", "false").lower() == "true"
+# 추적할 틱의 비율 (0.0 ~ 1.0)
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "1.0"))
+# 내보내기: log, metrics, chrome (쉼표 구분)
+TRACE_EXPORTERS = [name.strip() for name in os.getenv("TRACE_EXPORTERS", "log").split(",") if name.strip()]
+# 이 시간보다 짧은 추적은 로그에 남기지 않음 (ms)
+TRACE_LOG_MIN_DURATION_MS = float(os.getenv("TRACE_LOG_MIN_DURATION_MS", "0"))
+TRACE_CHROME_PATH = os.getenv("TRACE_CHROME_PATH", "wifi_monitor_trace.json")
+TRACE_CHROME_MAX_BYTES = int(os.getenv("TRACE_CHROME_MAX_BYTES", str(10 * 1024 * 1024)))
+
+# 실행 중 프로파일 (kill -USR1: 전체 스레드 샘플링, kill -USR2: 스택 덤프)
+PROFILE_DIR = os.getenv("PROFILE_DIR", ".")
+PROFILE_DURATION_SECONDS = float(os.getenv("PROFILE_DURATION_SECONDS", "30"))
+PROFILE_SAMPLE_HZ = float(os.getenv("PROFILE_SAMPLE_HZ", "100"))
+
+# 저장 방식: raw (모든 결과를 network_checks에 저장) / spans (같은 상태가 이어지면 network_check_spans의
+# 구간 하나로 합치고 원본은 의미 있게 바뀔 때만 저장, 집계 갱신 안 함) / both (둘 다)
+STORAGE_MODE = os.getenv("STORAGE_MODE", "raw").lower()
+# spans 모드에서 원본을 남길 응답시간 변화 (둘 다 넘어야 함)와 최대 원본 간격
+SPAN_LATENCY_DELTA_MS = float(os.getenv("SPAN_LATENCY_DELTA_MS", "5"))
+SPAN_LATENCY_DELTA_RATIO = float(os.getenv("SPAN_LATENCY_DELTA_RATIO", "0.2"))
+SPAN_HEARTBEAT_SECONDS = float(os.getenv("SPAN_HEARTBEAT_SECONDS", "600"))
+
+# 로컬 버퍼 설정 (DB 전송 전에 결과를 먼저 기록하는 SQLite 파일)
+OUTBOX_PATH = os.getenv("OUTBOX_PATH", "wifi_monitor_outbox.db")
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "500"))
+OUTBOX_FLUSH_INTERVAL_SECONDS = float(os.getenv("OUTBOX_FLUSH_INTERVAL_SECONDS", "10"))
+
 # 네트워크 설정
 ROUTER_IP = os.getenv("ROUTER_IP", "192.168.0.1")
 PING_COUNT = int(os.getenv("PING_COUNT", "4"))
 PING_TIMEOUT = int(os.getenv("PING_TIMEOUT", "5"))
+PING_INTERVAL_SECONDS = float(os.getenv("PING_INTERVAL_SECONDS", "0.2"))
+# auto: ICMP 소켓 사용, 권한이 없으면 TCP 연결 시간으로 대체 / icmp / tcp
+PING_MODE = os.getenv("PING_MODE", "auto")
+PING_TCP_PORT = int(os.getenv("PING_TCP_PORT", "80"))
+
+# 다중 대상 체크 설정 (쉼표로 구분, 기본값은 공유기 하나)
+PROBE_TARGETS = [t.strip() for t in os.getenv("PROBE_TARGETS", ROUTER_IP).split(",") if t.strip()]
+PROBE_CONCURRENCY = int(os.getenv("PROBE_CONCURRENCY", "32"))
+PROBE_TARGET_TIMEOUT = float(
+    os.getenv("PROBE_TARGET_TIMEOUT", str(PING_TIMEOUT + PING_COUNT * PING_INTERVAL_SECONDS + 1))
+)
 
 # 라즈베리파이용 설정
 IS_RASPBERRY_PI = os.getenv("IS_RASPBERRY_PI", "false").lower() == "true"
 
 # 스케줄 설정
 CHECK_INTERVAL_MINUTES = int(os.getenv("CHECK_INTERVAL_MINUTES", "1"))
+# 체크 유형별 주기 (공유기 기본값은 CHECK_INTERVAL_MINUTES)
+ROUTER_CHECK_INTERVAL_SECONDS = float(os.getenv("ROUTER_CHECK_INTERVAL_SECONDS", str(CHECK_INTERVAL_MINUTES * 60)))
+# 0 이하면 속도 테스트를 끔 (speedtest 모듈도 불러오지 않음)
+SPEED_TEST_INTERVAL_SECONDS = float(os.getenv("SPEED_TEST_INTERVAL_SECONDS", "1800"))
+STATUS_LOG_INTERVAL_SECONDS = float(os.getenv("STATUS_LOG_INTERVAL_SECONDS", "600"))
+# 적응형 체크 주기: 이상이 보이면 공유기 체크 주기를 줄이고, 정상으로 돌아오면 기본 주기로 복귀
+ADAPTIVE_ENABLED = os.getenv("ADAPTIVE_ENABLED", "false").lower() == "true"
+ADAPTIVE_FAST_INTERVAL_SECONDS = float(os.getenv("ADAPTIVE_FAST_INTERVAL_SECONDS", "5"))
+ADAPTIVE_LOSS_THRESHOLD = float(os.getenv("ADAPTIVE_LOSS_THRESHOLD", "0.2"))
+ADAPTIVE_LATENCY_THRESHOLD_MS = float(os.getenv("ADAPTIVE_LATENCY_THRESHOLD_MS", "100"))
+ADAPTIVE_RECOVERY_TICKS = int(os.getenv("ADAPTIVE_RECOVERY_TICKS", "6"))
+# 공유기 체크를 1시간에 최대 몇 번(틱)까지 실행할지 (넘으면 기본 주기로 복귀).
+# 대상 수와 관계없이 틱 단위로 세므로 기본값 720은 1시간 내내 5초 주기로 도는 것과 같음
+ADAPTIVE_HOURLY_BUDGET = int(os.getenv("ADAPTIVE_HOURLY_BUDGET", "720"))
+# 이전 실행이 끝나지 않았을 때의 정책: skip / queue / coalesce
+ROUTER_OVERLAP_POLICY = os.getenv("ROUTER_OVERLAP_POLICY", "skip")
+SPEED_TEST_OVERLAP_POLICY = os.getenv("SPEED_TEST_OVERLAP_POLICY", "skip")
+
+# 경량 대역폭 측정 (URL이 비어 있으면 사용 안 함)
+BANDWIDTH_PROBE_URL = os.getenv("BANDWIDTH_PROBE_URL", "")
+BANDWIDTH_PROBE_UPLOAD_URL = os.getenv("BANDWIDTH_PROBE_UPLOAD_URL", "")
+BANDWIDTH_PROBE_BYTES = int(os.getenv("BANDWIDTH_PROBE_BYTES", "2000000"))
+BANDWIDTH_PROBE_UPLOAD_BYTES = int(os.getenv("BANDWIDTH_PROBE_UPLOAD_BYTES", "500000"))
+BANDWIDTH_PROBE_TIMEOUT = float(os.getenv("BANDWIDTH_PROBE_TIMEOUT", "10"))
+BANDWIDTH_PROBE_INTERVAL_SECONDS = float(os.getenv("BANDWIDTH_PROBE_INTERVAL_SECONDS", "300"))
+
+# HTTP 단계별 체크: DNS 조회/TCP 연결/TLS 핸드셰이크/TTFB 시간 (쉼표 구분, 비어 있으면 사용 안 함)
+HTTP_PROBE_URLS = [u.strip() for u in os.getenv("HTTP_PROBE_URLS", "").split(",") if u.strip()]
+HTTP_PROBE_TIMEOUT = float(os.getenv("HTTP_PROBE_TIMEOUT", "5"))
+HTTP_PROBE_CONCURRENCY = int(os.getenv("HTTP_PROBE_CONCURRENCY", "8"))
+HTTP_PROBE_INTERVAL_SECONDS = float(os.getenv("HTTP_PROBE_INTERVAL_SECONDS", "60"))
+
+# 속도 테스트 서버 선택 캐시 (빈 문자열이면 사용 안 함)
+SPEEDTEST_CACHE_PATH = os.getenv("SPEEDTEST_CACHE_PATH", "speedtest_cache.json")
+SPEEDTEST_CACHE_TTL_SECONDS = float(os.getenv("SPEEDTEST_CACHE_TTL_SECONDS", "86400"))
+
+# 속도 테스트 프로세스 설정 (타임아웃을 넘기면 프로세스를 강제 종료)
+SPEED_TEST_TIMEOUT_SECONDS = float(os.getenv("SPEED_TEST_TIMEOUT_SECONDS", "90"))
+# forkserver / spawn / fork (기본값: forkserver, 없으면 spawn)
+# fork는 스레드가 여럿인 부모의 락 상태를 물려받아 자식이 멈출 수 있으므로 명시할 때만 사용
+SPEED_TEST_START_METHOD = os.getenv("SPEED_TEST_START_METHOD") or None
@@ -3,7 +3,11 @@
 Supabase에 network_checks 테이블 생성 스크립트
 """
 import psycopg2
-from config import DB_CONFIG
+from config import DB_CONFIG, DB_PARTITION_PRECREATE_DAYS
+from database.partitions import migrate_to_partitioned
+from database.rollup import create_rollup_tables
+from database.incidents import create_incidents_table
+from database.spans import create_spans_table
 
 def create_network_checks_table():
     """network_checks 테이블을 생성합니다."""
@@ -15,38 +19,24 @@ def create_network_checks_table():
         
         print("연결 성공! 테이블 생성 중...")
         
-        # 테이블 생성 SQL
-        create_table_sql = """
-        CREATE TABLE IF NOT EXISTS network_checks (
-            id SERIAL PRIMARY KEY,
-            timestamp TIMESTAMP NOT NULL,
-            check_type VARCHAR(20) NOT NULL,
-            target VARCHAR(100) NOT NULL,
-            reachable BOOLEAN NOT NULL,
-            latency_ms FLOAT,
-            packet_loss FLOAT,
-            download_mbps FLOAT,
-            upload_mbps FLOAT,
-            error_message TEXT,
-            created_at TIMESTAMP DEFAULT NOW()
-        );
-        """
+        # 파티션 테이블 생성 (기존 일반 테이블이 있으면 network_checks_legacy로 옮긴 뒤 데이터 복사)
+        migrated = migrate_to_partitioned(cursor, DB_PARTITION_PRECREATE_DAYS)
         
-        cursor.execute(create_table_sql)
+        # 분/시간/일 집계 테이블과 워터마크 테이블
+        create_rollup_tables(cursor)
         
-        # 인덱스 생성
-        indexes_sql = [
-            "CREATE INDEX IF NOT EXISTS idx_timestamp ON network_checks(timestamp);",
-            "CREATE INDEX IF NOT EXISTS idx_check_type ON network_checks(check_type);",
-            "CREATE INDEX IF NOT EXISTS idx_reachable ON network_checks(reachable);"
-        ]
+        # 장애 이벤트 테이블
+        create_incidents_table(cursor)
         
-        for index_sql in indexes_sql:
-            cursor.execute(index_sql)
+        # 상태 구간 테이블 (STORAGE_MODE=spans/both)
+        create_spans_table(cursor)
         
         conn.commit()
         
-        print("[SUCCESS] network_checks 테이블이 성공적으로 생성되었습니다!")
+        if migrated:
+            print("[SUCCESS] network_checks 파티션 테이블이 성공적으로 생성되었습니다!")
+        else:
+            print("[INFO] network_checks가 이미 파티션 테이블입니다.")
         
         # 테이블 구조 확인
         cursor.execute("""
@@ -1,13 +1,254 @@
+import io
 import psycopg2
+import psycopg2.pool
 import logging
-from typing import Dict, Any
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterable, Iterator, Optional, Tuple
+
+from config import (
+    DB_POOL_MIN_CONN,
+    DB_POOL_MAX_CONN,
+    DB_POOL_HEALTH_CHECK_SECONDS,
+    DB_RECONNECT_BACKOFF_SECONDS,
+    DB_RECONNECT_BACKOFF_MAX_SECONDS,
+)
+from checks.result import RESULT_COLUMNS, ResultBatch, as_result
+from utils.metrics import DB_WRITE_SECONDS
+from utils import tracing
 
 logger = logging.getLogger(__name__)
 
+# 모듈 전역 커넥션 풀 (스케줄러 틱 사이에서 재사용)
+_pool = None
+_pool_key = None
+_pool_slots = None
+_pool_lock = threading.Lock()
+_last_used: Dict[int, float] = {}
+
+# 재연결 백오프 상태
+_backoff_seconds = 0.0
+_backoff_until = 0.0
+
+_stats = {
+    "opened": 0,
+    "reused": 0,
+    "failed": 0,
+    "health_check_failed": 0,
+    "discarded": 0,
+}
+
+
+def _bump(name: str) -> None:
+    with _pool_lock:
+        _stats[name] += 1
+
+
+def _config_key(db_config: Dict[str, Any]) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in db_config.items()))
+
+
+def _get_pool(db_config: Dict[str, Any]):
+    """db_config에 해당하는 커넥션 풀을 반환합니다. 설정이 바뀌면 새로 만듭니다."""
+    global _pool, _pool_key, _pool_slots
+
+    key = _config_key(db_config)
+    with _pool_lock:
+        if _pool is not None and _pool_key == key:
+            return _pool
+
+        if _pool is not None:
+            logger.info("데이터베이스 설정이 변경되어 커넥션 풀을 다시 생성합니다")
+            _pool.closeall()
+            _last_used.clear()
+
+        # minconn=0으로 생성해 시작 시점에는 연결하지 않습니다 (네트워크가 끊겨 있어도 실패하지 않도록).
+        # 생성 후 minconn을 올려 반환된 연결이 닫히지 않고 풀에 유지되게 합니다.
+        _pool = psycopg2.pool.ThreadedConnectionPool(0, DB_POOL_MAX_CONN, **db_config)
+        _pool.minconn = min(DB_POOL_MIN_CONN, DB_POOL_MAX_CONN)
+        _pool_key = key
+        _pool_slots = threading.BoundedSemaphore(DB_POOL_MAX_CONN)
+        logger.info(f"커넥션 풀 생성: 유휴 {_pool.minconn}개 유지, 최대 {DB_POOL_MAX_CONN}개 연결")
+        return _pool
+
+
+def _record_failure() -> None:
+    """연결 실패를 기록하고 다음 재연결 시도까지의 대기 시간을 늘립니다."""
+    global _backoff_seconds, _backoff_until
+
+    with _pool_lock:
+        _stats["failed"] += 1
+        if _backoff_seconds:
+            _backoff_seconds = min(_backoff_seconds * 2, DB_RECONNECT_BACKOFF_MAX_SECONDS)
+        else:
+            _backoff_seconds = DB_RECONNECT_BACKOFF_SECONDS
+        _backoff_until = time.monotonic() + _backoff_seconds
+    logger.warning(f"데이터베이스 연결 실패, {_backoff_seconds:.1f}초 후 재연결을 시도합니다")
+
+
+def _record_success() -> None:
+    global _backoff_seconds, _backoff_until
+
+    if _backoff_seconds:
+        with _pool_lock:
+            _backoff_seconds = 0.0
+            _backoff_until = 0.0
+        logger.info("데이터베이스 연결이 복구되었습니다")
+
+
+def _is_healthy(conn) -> bool:
+    """오래 쉬고 있던 연결은 SELECT 1로 살아있는지 확인합니다."""
+    if conn.closed:
+        return False
+
+    idle = time.monotonic() - _last_used.get(id(conn), 0.0)
+    if idle < DB_POOL_HEALTH_CHECK_SECONDS:
+        return True
+
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        conn.rollback()
+        return True
+    except psycopg2.Error as e:
+        logger.debug(f"커넥션 상태 확인 실패: {e}")
+        return False
+
+
+def _discard(pool, conn) -> None:
+    _last_used.pop(id(conn), None)
+    _bump("discarded")
+    try:
+        pool.putconn(conn, close=True)
+    except psycopg2.pool.PoolError:
+        pass
+
+
+@contextmanager
+def get_connection(db_config: Dict[str, Any]) -> Iterator[Any]:
+    """
+    풀에서 연결을 빌려옵니다. 블록이 끝나면 연결은 풀로 반환됩니다.
+
+    네트워크 오류로 연결이 끊어지면 해당 연결은 폐기되고, 재연결은
+    지수 백오프(DB_RECONNECT_BACKOFF_SECONDS ~ DB_RECONNECT_BACKOFF_MAX_SECONDS)를 따릅니다.
+
+    Raises:
+        psycopg2.OperationalError: 연결 실패 또는 백오프 대기 중
+    """
+    if time.monotonic() < _backoff_until:
+        raise psycopg2.OperationalError("데이터베이스 재연결 대기 중")
+
+    pool = _get_pool(db_config)
+    slots = _pool_slots
+    slots.acquire()
+    conn = None
+    try:
+        with tracing.span("db.connect") as connect_span:
+            while conn is None:
+                try:
+                    conn = pool.getconn()
+                except psycopg2.Error:
+                    _record_failure()
+                    raise
+
+                if id(conn) not in _last_used:
+                    _bump("opened")
+                    connect_span.set("opened", True)
+                elif _is_healthy(conn):
+                    _bump("reused")
+                else:
+                    _bump("health_check_failed")
+                    _discard(pool, conn)
+                    conn = None
+
+        _record_success()
+
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            _discard(pool, conn)
+            conn = None
+            _record_failure()
+            raise
+        finally:
+            if conn is not None:
+                _last_used[id(conn)] = time.monotonic()
+                pool.putconn(conn, close=bool(conn.closed))
+                if conn.closed:
+                    # 유휴 한도를 넘어 풀이 닫은 연결은 추적에서 제외
+                    _last_used.pop(id(conn), None)
+    finally:
+        slots.release()
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    커넥션 풀 통계를 반환합니다.
+
+    Returns:
+        {
+            "opened": 3,              # 새로 맺은 연결 수 (TLS 핸드셰이크 발생)
+            "reused": 120,            # 풀에서 재사용한 횟수
+            "failed": 1,              # 연결/쿼리 중 네트워크 오류 횟수
+            "health_check_failed": 0,
+            "discarded": 1,
+            "idle": 1,                # 현재 풀에 보관 중인 연결 수
+            "backoff_seconds": 0.0
+        }
+    """
+    with _pool_lock:
+        stats = dict(_stats)
+        stats["idle"] = len(_pool._pool) if _pool is not None else 0
+        stats["backoff_seconds"] = _backoff_seconds
+    return stats
+
+
+def close_pool() -> None:
+    """커넥션 풀의 모든 연결을 닫습니다."""
+    global _pool, _pool_key
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            logger.info("커넥션 풀이 종료되었습니다")
+        _pool = None
+        _pool_key = None
+        _last_used.clear()
+
+
+# write_results()/write_spans()의 결과
+SAVE_OK = "ok"
+SAVE_RETRY = "retry"        # 연결/서버 문제: 같은 배치를 나중에 다시 보내면 성공할 수 있음
+SAVE_REJECTED = "rejected"  # 데이터 문제 (길이 초과, 제약 위반 등): 다시 보내도 같은 오류
+
+
+def classify_error(error: Exception) -> str:
+    """
+    쓰기 오류를 SAVE_RETRY 또는 SAVE_REJECTED로 나눕니다.
+
+    행의 값 때문에 나는 DataError/IntegrityError와 psycopg2 밖의 변환 오류만 거부로 보고,
+    연결 끊김(OperationalError/InterfaceError)이나 테이블 누락 같은 나머지는 다시 시도합니다.
+    """
+    if isinstance(error, (psycopg2.DataError, psycopg2.IntegrityError)):
+        return SAVE_REJECTED
+    if isinstance(error, psycopg2.Error):
+        return SAVE_RETRY
+    return SAVE_REJECTED
+
+
+_COPY_SQL = f"COPY network_checks ({', '.join(RESULT_COLUMNS)}) FROM STDIN"
+
+
+def result_to_row(result) -> tuple:
+    """체크 결과(CheckResult 또는 dict)를 RESULT_COLUMNS 순서의 튜플로 변환합니다."""
+    return as_result(result).to_row()
+
+
 def save_result(result: Dict[str, Any], db_config: Dict[str, Any]) -> bool:
     """
     체크 결과를 데이터베이스에 저장합니다.
-    
+
     Args:
         result: check_router() 또는 check_speed()의 반환값
         db_config: {
@@ -17,52 +258,64 @@ def save_result(result: Dict[str, Any], db_config: Dict[str, Any]) -> bool:
             "user": "postgres",
             "password": "password"
         }
-    
+
     Returns:
         성공: True, 실패: False
     """
-    conn = None
+    return save_results([result], db_config)
+
+
+def save_results(results: Iterable[Any], db_config: Dict[str, Any]) -> bool:
+    """
+    여러 체크 결과를 COPY 한 번과 하나의 트랜잭션으로 저장합니다.
+
+    COPY는 행마다 파라미터를 바인딩하지 않으므로 장애 후 밀린 큰 배치에서
+    INSERT ... VALUES보다 빠릅니다.
+
+    Args:
+        results: check_router() 또는 check_speed() 반환값(CheckResult 또는 dict)의 리스트나 ResultBatch
+        db_config: save_result()와 동일
+
+    Returns:
+        성공: True, 실패: False (실패 시 아무 행도 저장되지 않음)
+    """
+    return write_results(results, db_config)[0] == SAVE_OK
+
+
+def write_results(results: Iterable[Any], db_config: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+    """
+    save_results()와 같지만 실패를 다시 시도할 것(SAVE_RETRY)과 다시 보내도 안 되는 것(SAVE_REJECTED)으로
+    구분해 (상태, 오류 메시지)를 반환합니다. 로컬 버퍼 전송에서 문제 행을 골라내는 데 씁니다.
+    """
+    batch = results if isinstance(results, ResultBatch) else ResultBatch(results)
+    if not batch:
+        return SAVE_OK, None
+
+    started = time.perf_counter()
     try:
-        # 데이터베이스 연결
-        conn = psycopg2.connect(**db_config)
-        cursor = conn.cursor()
-        
-        # INSERT 쿼리 실행
-        insert_query = """
-        INSERT INTO network_checks 
-        (timestamp, check_type, target, reachable, latency_ms, packet_loss, 
-         download_mbps, upload_mbps, error_message)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        
-        values = (
-            result.get("timestamp"),
-            result.get("check_type"),
-            result.get("target"),
-            result.get("reachable"),
-            result.get("latency_ms"),
-            result.get("packet_loss"),
-            result.get("download_mbps"),
-            result.get("upload_mbps"),
-            result.get("error_message")
-        )
-        
-        cursor.execute(insert_query, values)
-        conn.commit()
-        
-        logger.info(f"{result.get('check_type')} 결과가 데이터베이스에 저장되었습니다")
-        return True
-        
+        # 풀에서 연결을 가져와 INSERT 실행 (연결은 틱 사이에서 재사용됨)
+        with tracing.span("db.save", rows=len(batch)), get_connection(db_config) as conn:
+            try:
+                cursor = conn.cursor()
+                with tracing.span("db.copy"):
+                    cursor.copy_expert(_COPY_SQL, io.StringIO(batch.to_copy_text()))
+                with tracing.span("db.commit"):
+                    conn.commit()
+                cursor.close()
+            except Exception:
+                if not conn.closed:
+                    conn.rollback()
+                raise
+
+        DB_WRITE_SECONDS.observe(time.perf_counter() - started, result="ok")
+        logger.info(f"체크 결과 {len(batch)}건이 데이터베이스에 저장되었습니다")
+        return SAVE_OK, None
+
     except psycopg2.Error as e:
+        DB_WRITE_SECONDS.observe(time.perf_counter() - started, result="fail")
         logger.error(f"데이터베이스 오류: {e}")
-        if conn:
-            conn.rollback()
-        return False
+        return classify_error(e), str(e).strip()
     except Exception as e:
+        DB_WRITE_SECONDS.observe(time.perf_counter() - started, result="fail")
         logger.error(f"데이터베이스 저장 중 예상치 못한 오류: {e}")
-        if conn:
-            conn.rollback()
-        return False
-    finally:
-        if conn:
-            conn.close()
+        return classify_error(e), str(e).strip()
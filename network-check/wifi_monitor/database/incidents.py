@@ -0,0 +1,96 @@
+import logging
+import threading
+from collections import deque
+from typing import Dict, Any
+
+import psycopg2
+
+from database.db import get_connection
+from utils.alerts import AlertSink
+from utils.detector import IncidentEvent
+
+logger = logging.getLogger(__name__)
+
+CREATE_INCIDENTS_TABLE_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS network_incidents (
+        incident_id UUID PRIMARY KEY,
+        kind VARCHAR(20) NOT NULL,
+        check_type VARCHAR(20) NOT NULL,
+        target VARCHAR(100) NOT NULL,
+        started_at TIMESTAMP NOT NULL,
+        ended_at TIMESTAMP,
+        sample_count INTEGER NOT NULL DEFAULT 0,
+        details TEXT,
+        created_at TIMESTAMP DEFAULT NOW()
+    );
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_network_incidents_started_at ON network_incidents (started_at);",
+]
+
+# 시작 이벤트는 행을 만들고, 종료 이벤트는 같은 incident_id 행의 종료 시각을 채웁니다
+_UPSERT_INCIDENT_SQL = """
+INSERT INTO network_incidents
+    (incident_id, kind, check_type, target, started_at, ended_at, sample_count, details)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+ON CONFLICT (incident_id) DO UPDATE SET
+    ended_at = EXCLUDED.ended_at,
+    sample_count = EXCLUDED.sample_count,
+    details = EXCLUDED.details
+"""
+
+
+def create_incidents_table(cursor) -> None:
+    for create_sql in CREATE_INCIDENTS_TABLE_SQL:
+        cursor.execute(create_sql)
+
+
+class DatabaseSink(AlertSink):
+    """
+    장애 이벤트를 network_incidents에 기록합니다.
+
+    장애 중에는 DB에도 닿지 않는 경우가 많으므로, 실패한 이벤트는 메모리에 보관했다가
+    다음 이벤트 때 함께 다시 기록합니다 (최대 max_pending건).
+    """
+
+    name = "database"
+
+    def __init__(self, db_config: Dict[str, Any], max_pending: int = 1000):
+        self.db_config = db_config
+        self._pending: deque = deque(maxlen=max_pending)
+        self._lock = threading.Lock()
+
+    def send(self, event: IncidentEvent) -> None:
+        with self._lock:
+            self._pending.append(event)
+            self.flush()
+
+    def flush(self) -> bool:
+        """보관 중인 이벤트를 모두 기록합니다. 호출한 쪽에서 _lock을 잡고 있어야 합니다."""
+        if not self._pending:
+            return True
+
+        rows = []
+        for event in self._pending:
+            incident = event.incident
+            rows.append((
+                incident.incident_id, incident.kind, incident.check_type, incident.target[:100],
+                incident.started_at, incident.ended_at, incident.sample_count, incident.details,
+            ))
+
+        try:
+            with get_connection(self.db_config) as conn:
+                try:
+                    with conn.cursor() as cursor:
+                        cursor.executemany(_UPSERT_INCIDENT_SQL, rows)
+                    conn.commit()
+                except psycopg2.Error:
+                    if not conn.closed:
+                        conn.rollback()
+                    raise
+        except psycopg2.Error as e:
+            logger.warning(f"장애 이벤트 {len(rows)}건을 기록하지 못했습니다 (다음 이벤트 때 재시도): {e}")
+            return False
+
+        self._pending.clear()
+        return True
@@ -0,0 +1,368 @@
+import json
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Any, Callable, Iterable, List, Optional, Tuple
+
+from checks.result import RESULT_COLUMNS, CheckResult, as_result
+from database.db import SAVE_OK, SAVE_REJECTED, write_results
+from database.spans import SPAN_COLUMNS, write_spans
+
+logger = logging.getLogger(__name__)
+
+
+class Outbox:
+    """
+    체크 결과를 PostgreSQL에 보내기 전에 기록하는 로컬 SQLite 버퍼입니다.
+
+    WAN이 끊겨 있어도 결과는 먼저 여기에 쌓이고, OutboxFlusher가
+    연결이 복구되면 오래된 순서대로 일괄 전송합니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        # WAL: 쓰기마다 전체 파일을 다시 쓰지 않아 SD 카드 쓰기량이 줄어듭니다
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                check_type TEXT NOT NULL,
+                target TEXT NOT NULL,
+                reachable INTEGER NOT NULL,
+                latency_ms REAL,
+                packet_loss REAL,
+                download_mbps REAL,
+                upload_mbps REAL,
+                error_message TEXT
+            )
+            """
+        )
+        # 상태 구간은 (check_type, target, started_at)별로 한 행만 두고 덮어씁니다.
+        # 장애 중 같은 구간이 여러 번 갱신되어도 전송할 행은 하나입니다 (version으로 전송 중 갱신을 구분)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS outbox_spans (
+                check_type TEXT NOT NULL,
+                target TEXT NOT NULL,
+                started_at TEXT NOT NULL,
+                ended_at TEXT NOT NULL,
+                sample_count INTEGER NOT NULL,
+                reachable INTEGER NOT NULL,
+                error_message TEXT,
+                latency_min_ms REAL,
+                latency_avg_ms REAL,
+                latency_max_ms REAL,
+                packet_loss_avg REAL,
+                version INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (check_type, target, started_at)
+            )
+            """
+        )
+        # 데이터 문제로 PostgreSQL이 거부한 행. 버퍼를 막지 않도록 옮겨 두고 나중에 확인/재처리합니다
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS outbox_dead (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                error TEXT,
+                failed_at TEXT NOT NULL
+            )
+            """
+        )
+        self._insert_sql = (
+            f"INSERT INTO outbox ({', '.join(RESULT_COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in RESULT_COLUMNS)})"
+        )
+        self._select_sql = f"SELECT id, {', '.join(RESULT_COLUMNS)} FROM outbox ORDER BY id LIMIT ?"
+        updates = ", ".join(f"{column} = excluded.{column}" for column in SPAN_COLUMNS[3:])
+        self._upsert_span_sql = (
+            f"INSERT INTO outbox_spans ({', '.join(SPAN_COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in SPAN_COLUMNS)}) "
+            f"ON CONFLICT (check_type, target, started_at) DO UPDATE SET {updates}, version = version + 1"
+        )
+        self._select_spans_sql = f"SELECT {', '.join(SPAN_COLUMNS)}, version FROM outbox_spans LIMIT ?"
+
+    @staticmethod
+    def _to_row(result) -> tuple:
+        row = list(as_result(result).to_row())
+        if isinstance(row[0], datetime):
+            row[0] = row[0].isoformat()
+        row[3] = 1 if row[3] else 0
+        return tuple(row)
+
+    @staticmethod
+    def _from_row(row: tuple) -> CheckResult:
+        result = CheckResult.from_row(row)
+        result.timestamp = datetime.fromisoformat(result.timestamp)
+        result.reachable = bool(result.reachable)
+        return result
+
+    def append(self, result) -> None:
+        """결과 1건을 버퍼에 기록합니다."""
+        self.append_many([result])
+
+    def append_many(self, results: Iterable[Any]) -> None:
+        """여러 결과를 하나의 SQLite 트랜잭션으로 기록합니다."""
+        rows = [self._to_row(result) for result in results]
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(self._insert_sql, rows)
+
+    def peek(self, limit: int) -> List[Tuple[int, CheckResult]]:
+        """
+        가장 오래된 결과부터 최대 limit건을 읽습니다 (삭제하지 않음).
+
+        Returns:
+            [(행 id, 결과), ...] (id 오름차순). 비어 있으면 []
+        """
+        with self._lock:
+            rows = self._conn.execute(self._select_sql, (limit,)).fetchall()
+        return [(row[0], self._from_row(row[1:])) for row in rows]
+
+    def ack(self, last_id: int) -> None:
+        """last_id까지 전송이 끝난 결과를 버퍼에서 삭제합니다."""
+        with self._lock:
+            self._conn.execute("DELETE FROM outbox WHERE id <= ?", (last_id,))
+
+    def upsert_spans(self, rows: List[tuple]) -> None:
+        """상태 구간(SPAN_COLUMNS 순서의 튜플)을 기록하거나 갱신합니다."""
+        converted = []
+        for row in rows:
+            row = list(row)
+            for i in (2, 3):
+                if isinstance(row[i], datetime):
+                    row[i] = row[i].isoformat()
+            row[5] = 1 if row[5] else 0
+            converted.append(tuple(row))
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(self._upsert_span_sql, converted)
+
+    def peek_spans(self, limit: int) -> List[Tuple[tuple, int]]:
+        """
+        전송할 상태 구간을 최대 limit건 읽습니다.
+
+        Returns:
+            [(SPAN_COLUMNS 순서의 튜플, version), ...]
+        """
+        with self._lock:
+            rows = self._conn.execute(self._select_spans_sql, (limit,)).fetchall()
+        spans = []
+        for row in rows:
+            values = list(row[:-1])
+            values[2] = datetime.fromisoformat(values[2])
+            values[3] = datetime.fromisoformat(values[3])
+            values[5] = bool(values[5])
+            spans.append((tuple(values), row[-1]))
+        return spans
+
+    def ack_spans(self, spans: List[Tuple[tuple, int]]) -> None:
+        """전송이 끝난 구간을 삭제합니다. 전송 중에 다시 갱신된 구간은 남겨 둡니다."""
+        keys = [(row[0], row[1], row[2].isoformat(), version) for row, version in spans]
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "DELETE FROM outbox_spans "
+                    "WHERE check_type = ? AND target = ? AND started_at = ? AND version = ?",
+                    keys,
+                )
+
+    def dead_letter(self, kind: str, rows: List[tuple], error: Optional[str]) -> None:
+        """
+        PostgreSQL이 거부한 행을 outbox_dead로 옮겨 둡니다.
+
+        Args:
+            kind: "result" 또는 "span"
+            rows: RESULT_COLUMNS 또는 SPAN_COLUMNS 순서의 튜플
+            error: 거부 사유 (데이터베이스 오류 메시지)
+        """
+        failed_at = datetime.now().isoformat()
+        records = [(kind, json.dumps(list(row), default=str, ensure_ascii=False), error, failed_at)
+                   for row in rows]
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT INTO outbox_dead (kind, payload, error, failed_at) VALUES (?, ?, ?, ?)",
+                    records,
+                )
+
+    def dead_depth(self) -> int:
+        """거부되어 옮겨진 행 수"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM outbox_dead").fetchone()[0]
+
+    def span_depth(self) -> int:
+        """아직 전송되지 않은 상태 구간 수"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM outbox_spans").fetchone()[0]
+
+    def depth(self) -> int:
+        """아직 전송되지 않은 결과 수"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class OutboxFlusher:
+    """
+    백그라운드 스레드에서 Outbox를 network_checks(상태 구간은 network_check_spans)로 일괄 전송합니다.
+
+    결과는 한 번에 batch_size건씩 COPY 한 번으로(write_results), 상태 구간은 upsert 한 번으로(write_spans)
+    저장하고, 배치가 가득 찼으면(장애 후 밀린 데이터) 기다리지 않고 바로 다음 배치를 보냅니다.
+
+    연결 장애로 실패한 배치는 버퍼에 남겨 다음에 다시 보내고, 데이터 문제로 거부된 배치는
+    반씩 나눠 다시 보내 문제 행만 outbox_dead로 옮긴 뒤 나머지는 계속 전송합니다.
+    """
+
+    def __init__(self, outbox: Outbox, db_config: Dict[str, Any],
+                 batch_size: int = 500, interval: float = 10.0):
+        self.outbox = outbox
+        self.db_config = db_config
+        self.batch_size = batch_size
+        self.interval = interval
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _isolate(items: List[Any], write: Callable[[List[Any]], Tuple[str, Optional[str]]],
+                 status: str, error: Optional[str]) -> Tuple[List[Any], List[Tuple[Any, Optional[str]]], bool]:
+        """
+        거부된 배치를 반씩 나눠 다시 보내며 문제 행을 찾습니다. 앞쪽부터 순서대로 보냅니다.
+
+        Args:
+            items: 전송할 항목
+            write: 항목 리스트를 저장하고 (상태, 오류 메시지)를 반환하는 함수
+            status, error: items 전체를 이미 보내 본 결과
+
+        Returns:
+            (저장된 항목, [(거부된 항목, 오류 메시지)], 연결 장애로 중단되었는지).
+            중단되면 그 뒤 항목은 어느 쪽에도 들어가지 않습니다.
+        """
+        if status == SAVE_OK:
+            return items, [], False
+        if status != SAVE_REJECTED:
+            return [], [], True
+        if len(items) == 1:
+            return [], [(items[0], error)], False
+
+        saved: List[Any] = []
+        rejected: List[Tuple[Any, Optional[str]]] = []
+        middle = len(items) // 2
+        for part in (items[:middle], items[middle:]):
+            part_status, part_error = write(part)
+            part_saved, part_rejected, stopped = OutboxFlusher._isolate(part, write, part_status, part_error)
+            saved.extend(part_saved)
+            rejected.extend(part_rejected)
+            if stopped:
+                return saved, rejected, True
+        return saved, rejected, False
+
+    def flush_once(self) -> int:
+        """
+        배치 하나를 전송합니다.
+
+        Returns:
+            처리된 결과 수 (저장 + 거부되어 outbox_dead로 옮긴 수. 버퍼가 비었거나 연결 장애 시 0)
+        """
+        entries = self.outbox.peek(self.batch_size)
+        if not entries:
+            return 0
+
+        def write(part):
+            return write_results([result for _, result in part], self.db_config)
+
+        status, error = write(entries)
+        saved, rejected, _ = self._isolate(entries, write, status, error)
+        if rejected:
+            self._reject("result", [(Outbox._to_row(result), reason) for (_, result), reason in rejected])
+
+        # 앞쪽부터 순서대로 보내므로 처리된 항목은 항상 id 순서의 앞부분입니다
+        handled = len(saved) + len(rejected)
+        if handled:
+            self.outbox.ack(entries[handled - 1][0])
+        return handled
+
+    def flush_spans(self) -> int:
+        """
+        상태 구간 배치 하나를 전송합니다.
+
+        Returns:
+            처리된 구간 수 (저장 + 거부되어 outbox_dead로 옮긴 수. 버퍼가 비었거나 연결 장애 시 0)
+        """
+        spans = self.outbox.peek_spans(self.batch_size)
+        if not spans:
+            return 0
+
+        def write(part):
+            return write_spans([row for row, _ in part], self.db_config)
+
+        status, error = write(spans)
+        saved, rejected, _ = self._isolate(spans, write, status, error)
+        if rejected:
+            self._reject("span", [(row, reason) for (row, _), reason in rejected])
+
+        handled = saved + [span for span, _ in rejected]
+        if handled:
+            self.outbox.ack_spans(handled)
+        return len(handled)
+
+    def _reject(self, kind: str, rows: List[Tuple[tuple, Optional[str]]]) -> None:
+        for row, reason in rows:
+            logger.error(f"데이터베이스가 거부한 행을 outbox_dead로 옮깁니다 ({kind}): {row} - {reason}")
+            self.outbox.dead_letter(kind, [row], reason)
+
+    def flush(self) -> int:
+        """버퍼가 비거나 전송이 실패할 때까지 전송합니다."""
+        total = 0
+        while True:
+            sent = self.flush_once()
+            total += sent
+            if sent < self.batch_size:
+                break
+        while True:
+            sent = self.flush_spans()
+            total += sent
+            if sent < self.batch_size:
+                return total
+
+    def notify(self) -> None:
+        """새 결과가 기록되었음을 알려 다음 전송을 앞당깁니다."""
+        self._wakeup.set()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                sent = self.flush()
+                if sent:
+                    logger.info(f"로컬 버퍼에서 {sent}건 전송 완료 (남은 건수: {self.outbox.depth()})")
+            except Exception as e:
+                logger.error(f"로컬 버퍼 전송 중 예상치 못한 오류: {e}")
+
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="outbox-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """전송 스레드를 멈춥니다. 남은 결과는 다음 실행 때 전송됩니다."""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
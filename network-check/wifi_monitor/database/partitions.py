@@ -0,0 +1,258 @@
+import logging
+import re
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+import psycopg2
+from psycopg2 import sql
+
+from database.db import get_connection
+
+logger = logging.getLogger(__name__)
+
+# 일 단위 파티션 이름: network_checks_p20251025
+_PARTITION_NAME = re.compile(r"^network_checks_p(\d{8})$")
+
+# timestamp 기준 RANGE 파티션 테이블.
+# 파티션 키가 기본키에 포함되어야 하므로 PRIMARY KEY (id, timestamp)
+CREATE_PARTITIONED_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS network_checks (
+    id BIGSERIAL,
+    timestamp TIMESTAMP NOT NULL,
+    check_type VARCHAR(20) NOT NULL,
+    target VARCHAR(100) NOT NULL,
+    reachable BOOLEAN NOT NULL,
+    latency_ms FLOAT,
+    packet_loss FLOAT,
+    download_mbps FLOAT,
+    upload_mbps FLOAT,
+    error_message TEXT,
+    created_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp);
+"""
+
+# 미리 만들어 둔 범위를 벗어난 행(오래된 백필 등)을 받는 기본 파티션
+CREATE_DEFAULT_PARTITION_SQL = """
+CREATE TABLE IF NOT EXISTS network_checks_default PARTITION OF network_checks DEFAULT;
+"""
+
+# timestamp는 삽입 순서와 거의 일치하므로 B-tree 대신 작은 BRIN 인덱스로 충분합니다.
+# 대시보드 조회(check_type별 기간 조회)는 복합 인덱스 하나로 처리합니다.
+CREATE_INDEXES_SQL = [
+    "CREATE INDEX IF NOT EXISTS idx_network_checks_timestamp_brin ON network_checks USING BRIN (timestamp);",
+    "CREATE INDEX IF NOT EXISTS idx_network_checks_type_timestamp ON network_checks (check_type, timestamp);",
+]
+
+
+def partition_name(day: date) -> str:
+    return f"network_checks_p{day:%Y%m%d}"
+
+
+def create_partitioned_table(cursor) -> None:
+    """파티션 부모 테이블, 기본 파티션, 인덱스를 생성합니다."""
+    cursor.execute(CREATE_PARTITIONED_TABLE_SQL)
+    cursor.execute(CREATE_DEFAULT_PARTITION_SQL)
+    for index_sql in CREATE_INDEXES_SQL:
+        cursor.execute(index_sql)
+
+
+def is_partitioned(cursor) -> Optional[bool]:
+    """network_checks가 파티션 테이블이면 True, 일반 테이블이면 False, 없으면 None"""
+    cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass('network_checks')")
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return row[0] == "p"
+
+
+def _create_partition(cursor, name: str, day: date) -> int:
+    """
+    day의 파티션을 만들고 기본 파티션에서 옮긴 행 수를 반환합니다.
+
+    기본 파티션에 이미 그 날짜의 행이 있으면 PARTITION OF로 만들 수 없으므로, 기본 파티션을 잠그고
+    빈 테이블에 그 행들을 옮긴 뒤 ATTACH PARTITION으로 붙입니다.
+    """
+    bounds = (day, day + timedelta(days=1))
+    cursor.execute("SELECT EXISTS (SELECT 1 FROM network_checks_default WHERE timestamp >= %s AND timestamp < %s)",
+                   bounds)
+    if not cursor.fetchone()[0]:
+        cursor.execute(
+            sql.SQL("CREATE TABLE {} PARTITION OF network_checks FOR VALUES FROM (%s) TO (%s)").format(
+                sql.Identifier(name)
+            ),
+            bounds,
+        )
+        return 0
+
+    # 옮기는 동안 그 날짜의 행이 기본 파티션에 새로 들어오면 ATTACH가 실패하므로 쓰기를 막습니다
+    cursor.execute("LOCK TABLE network_checks_default IN EXCLUSIVE MODE")
+    cursor.execute(
+        sql.SQL("CREATE TABLE {} (LIKE network_checks INCLUDING DEFAULTS INCLUDING CONSTRAINTS)").format(
+            sql.Identifier(name)
+        )
+    )
+    cursor.execute(
+        sql.SQL(
+            "WITH moved AS (DELETE FROM network_checks_default WHERE timestamp >= %s AND timestamp < %s RETURNING *) "
+            "INSERT INTO {} SELECT * FROM moved"
+        ).format(sql.Identifier(name)),
+        bounds,
+    )
+    moved = cursor.rowcount
+    cursor.execute(
+        sql.SQL("ALTER TABLE network_checks ATTACH PARTITION {} FOR VALUES FROM (%s) TO (%s)").format(
+            sql.Identifier(name)
+        ),
+        bounds,
+    )
+    return moved
+
+
+def ensure_partitions(cursor, start: date, days_ahead: int) -> List[str]:
+    """
+    start부터 days_ahead일 뒤까지의 일 단위 파티션을 만듭니다.
+
+    기본 파티션에 먼저 들어간 그 날짜의 행은 새 파티션으로 옮깁니다.
+
+    Returns:
+        새로 만든 파티션 이름 목록
+    """
+    cursor.execute(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'network_checks'::regclass"
+    )
+    existing = {row[0] for row in cursor.fetchall()}
+
+    created = []
+    for offset in range(days_ahead + 1):
+        day = start + timedelta(days=offset)
+        name = partition_name(day)
+        if name in existing:
+            continue
+
+        cursor.execute("SAVEPOINT create_partition")
+        try:
+            moved = _create_partition(cursor, name, day)
+            cursor.execute("RELEASE SAVEPOINT create_partition")
+            created.append(name)
+            if moved:
+                logger.info(f"기본 파티션의 {day} 행 {moved}건을 {name}로 옮겼습니다")
+        except psycopg2.Error as e:
+            # 이 날짜만 건너뛰고 나머지 파티션은 계속 만듭니다 (다음 실행에서 다시 시도)
+            cursor.execute("ROLLBACK TO SAVEPOINT create_partition")
+            logger.error(f"파티션 {name} 생성 실패: {e}")
+    return created
+
+
+def drop_old_partitions(cursor, cutoff: date) -> List[str]:
+    """
+    cutoff 이전 날짜의 파티션을 삭제하고 기본 파티션의 오래된 행도 지웁니다.
+
+    Returns:
+        삭제한 파티션 이름 목록
+    """
+    cursor.execute(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'network_checks'::regclass"
+    )
+    dropped = []
+    for (name,) in cursor.fetchall():
+        match = _PARTITION_NAME.match(name)
+        if not match:
+            continue
+        day = datetime.strptime(match.group(1), "%Y%m%d").date()
+        if day < cutoff:
+            cursor.execute(sql.SQL("DROP TABLE {}").format(sql.Identifier(name)))
+            dropped.append(name)
+
+    cursor.execute("DELETE FROM network_checks_default WHERE timestamp < %s", (cutoff,))
+    return dropped
+
+
+def migrate_to_partitioned(cursor, days_ahead: int = 7) -> bool:
+    """
+    기존 일반 테이블 network_checks를 파티션 테이블로 옮깁니다.
+
+    기존 테이블은 network_checks_legacy로 이름을 바꿔 남겨 두며, 데이터 확인 후
+    수동으로 삭제하면 됩니다. 호출한 쪽에서 commit해야 합니다.
+
+    Returns:
+        마이그레이션을 수행했으면 True, 이미 파티션 테이블이면 False
+    """
+    state = is_partitioned(cursor)
+    if state:
+        return False
+
+    if state is False:
+        logger.info("기존 network_checks를 network_checks_legacy로 이름 변경")
+        cursor.execute("ALTER TABLE network_checks RENAME TO network_checks_legacy")
+        cursor.execute("ALTER INDEX IF EXISTS network_checks_pkey RENAME TO network_checks_legacy_pkey")
+        for index in ("idx_timestamp", "idx_check_type", "idx_reachable"):
+            cursor.execute(sql.SQL("DROP INDEX IF EXISTS {}").format(sql.Identifier(index)))
+
+    create_partitioned_table(cursor)
+
+    first_day = date.today()
+    if state is False:
+        cursor.execute("SELECT MIN(timestamp)::date FROM network_checks_legacy")
+        oldest = cursor.fetchone()[0]
+        if oldest is not None:
+            first_day = min(first_day, oldest)
+
+    span = (date.today() - first_day).days + days_ahead
+    ensure_partitions(cursor, first_day, span)
+
+    if state is False:
+        logger.info("기존 데이터를 파티션 테이블로 복사 중...")
+        cursor.execute(
+            """
+            INSERT INTO network_checks
+            (id, timestamp, check_type, target, reachable, latency_ms, packet_loss,
+             download_mbps, upload_mbps, error_message, created_at)
+            SELECT id, timestamp, check_type, target, reachable, latency_ms, packet_loss,
+                   download_mbps, upload_mbps, error_message, created_at
+            FROM network_checks_legacy
+            """
+        )
+        cursor.execute(
+            "SELECT setval(pg_get_serial_sequence('network_checks', 'id'), "
+            "COALESCE((SELECT MAX(id) FROM network_checks), 0) + 1, false)"
+        )
+    return True
+
+
+def run_maintenance(db_config: Dict[str, Any], days_ahead: int = 7, retention_days: int = 90) -> bool:
+    """
+    다음 days_ahead일의 파티션을 미리 만들고 retention_days보다 오래된 파티션을 삭제합니다.
+
+    Returns:
+        성공: True, 실패: False
+    """
+    try:
+        with get_connection(db_config) as conn:
+            try:
+                with conn.cursor() as cursor:
+                    if not is_partitioned(cursor):
+                        logger.warning("network_checks가 파티션 테이블이 아닙니다. create_table.py로 마이그레이션하세요")
+                        conn.rollback()
+                        return False
+
+                    today = date.today()
+                    created = ensure_partitions(cursor, today, days_ahead)
+                    dropped = drop_old_partitions(cursor, today - timedelta(days=retention_days))
+                conn.commit()
+            except psycopg2.Error:
+                if not conn.closed:
+                    conn.rollback()
+                raise
+
+        if created:
+            logger.info(f"파티션 생성: {', '.join(created)}")
+        if dropped:
+            logger.info(f"보존 기간이 지난 파티션 삭제: {', '.join(dropped)}")
+        return True
+
+    except psycopg2.Error as e:
+        logger.error(f"파티션 관리 중 데이터베이스 오류: {e}")
+        return False
@@ -0,0 +1,241 @@
+import logging
+from typing import Dict, Any, Optional, Tuple
+
+import psycopg2
+
+from database.db import get_connection
+
+logger = logging.getLogger(__name__)
+
+# 집계 단위: (bucket_width, date_trunc 단위, 버킷 길이)
+ROLLUP_WIDTHS = (
+    ("1m", "minute", "1 minute"),
+    ("1h", "hour", "1 hour"),
+    ("1d", "day", "1 day"),
+)
+
+_WATERMARK_NAME = "network_checks"
+
+# id는 커밋 순서가 아니라 nextval 순서이므로, 작은 id를 받은 트랜잭션(긴 outbox 전송, 다른 모니터)이
+# 큰 id보다 늦게 커밋될 수 있습니다. 그래서 집계할 상한은 매 집계 때 기록해 둔
+# (시퀀스 마지막 값, 그때의 스냅샷 xmax) 쌍으로 정하고, 그 xmax보다 앞선 트랜잭션이 모두 끝난 뒤에만
+# 그 시퀀스 값까지 집계합니다 (집계는 한 주기 늦어지지만 늦게 커밋된 행을 건너뛰지 않음).
+
+# 테이블은 create_table.py가 만들고, 실행 중에는 프로세스마다 첫 집계 때 한 번만 확인합니다
+# (매 집계마다 DDL을 실행하면 카탈로그 잠금을 잡아 대시보드 조회와 부딪힐 수 있음)
+_tables_ready = False
+
+CREATE_ROLLUP_TABLES_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS network_check_rollups (
+        bucket_width VARCHAR(4) NOT NULL,
+        bucket_start TIMESTAMP NOT NULL,
+        check_type VARCHAR(20) NOT NULL,
+        target VARCHAR(100) NOT NULL,
+        sample_count INTEGER NOT NULL,
+        reachable_count INTEGER NOT NULL,
+        availability FLOAT NOT NULL,
+        latency_avg_ms FLOAT,
+        latency_p50_ms FLOAT,
+        latency_p95_ms FLOAT,
+        latency_p99_ms FLOAT,
+        packet_loss_avg FLOAT,
+        download_min_mbps FLOAT,
+        download_max_mbps FLOAT,
+        upload_min_mbps FLOAT,
+        upload_max_mbps FLOAT,
+        updated_at TIMESTAMP DEFAULT NOW(),
+        PRIMARY KEY (bucket_width, check_type, target, bucket_start)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS rollup_watermarks (
+        name VARCHAR(50) PRIMARY KEY,
+        last_id BIGINT NOT NULL,
+        updated_at TIMESTAMP DEFAULT NOW()
+    );
+    """,
+    # 다음 집계 상한 후보: pending_id까지의 id는 txid가 pending_xmax보다 작은 트랜잭션만 가질 수 있음
+    "ALTER TABLE rollup_watermarks ADD COLUMN IF NOT EXISTS pending_id BIGINT;",
+    "ALTER TABLE rollup_watermarks ADD COLUMN IF NOT EXISTS pending_xmax BIGINT;",
+]
+
+# 새 행이 속한 (버킷, check_type, target)만 원본에서 다시 집계합니다.
+# 백분위수는 부분 집계를 합칠 수 없으므로 버킷 전체를 다시 계산해 덮어씁니다.
+_UPSERT_ROLLUP_SQL = """
+WITH affected AS (
+    SELECT DISTINCT date_trunc(%(unit)s, timestamp) AS bucket_start, check_type, target
+    FROM network_checks
+    WHERE id > %(low)s AND id <= %(high)s
+)
+INSERT INTO network_check_rollups (
+    bucket_width, bucket_start, check_type, target,
+    sample_count, reachable_count, availability,
+    latency_avg_ms, latency_p50_ms, latency_p95_ms, latency_p99_ms,
+    packet_loss_avg, download_min_mbps, download_max_mbps, upload_min_mbps, upload_max_mbps,
+    updated_at
+)
+SELECT
+    %(width)s, a.bucket_start, a.check_type, a.target,
+    COUNT(*),
+    COUNT(*) FILTER (WHERE n.reachable),
+    AVG(n.reachable::int),
+    AVG(n.latency_ms),
+    percentile_cont(0.50) WITHIN GROUP (ORDER BY n.latency_ms),
+    percentile_cont(0.95) WITHIN GROUP (ORDER BY n.latency_ms),
+    percentile_cont(0.99) WITHIN GROUP (ORDER BY n.latency_ms),
+    AVG(n.packet_loss),
+    MIN(n.download_mbps), MAX(n.download_mbps),
+    MIN(n.upload_mbps), MAX(n.upload_mbps),
+    NOW()
+FROM affected a
+JOIN network_checks n
+  ON n.check_type = a.check_type
+ AND n.target = a.target
+ AND n.timestamp >= a.bucket_start
+ AND n.timestamp < a.bucket_start + %(step)s::interval
+GROUP BY a.bucket_start, a.check_type, a.target
+ON CONFLICT (bucket_width, check_type, target, bucket_start) DO UPDATE SET
+    sample_count = EXCLUDED.sample_count,
+    reachable_count = EXCLUDED.reachable_count,
+    availability = EXCLUDED.availability,
+    latency_avg_ms = EXCLUDED.latency_avg_ms,
+    latency_p50_ms = EXCLUDED.latency_p50_ms,
+    latency_p95_ms = EXCLUDED.latency_p95_ms,
+    latency_p99_ms = EXCLUDED.latency_p99_ms,
+    packet_loss_avg = EXCLUDED.packet_loss_avg,
+    download_min_mbps = EXCLUDED.download_min_mbps,
+    download_max_mbps = EXCLUDED.download_max_mbps,
+    upload_min_mbps = EXCLUDED.upload_min_mbps,
+    upload_max_mbps = EXCLUDED.upload_max_mbps,
+    updated_at = EXCLUDED.updated_at
+"""
+
+
+def create_rollup_tables(cursor) -> None:
+    """집계 테이블과 워터마크 테이블을 생성합니다."""
+    for create_sql in CREATE_ROLLUP_TABLES_SQL:
+        cursor.execute(create_sql)
+
+
+def _read_watermark(cursor) -> Tuple[int, Optional[int], Optional[int]]:
+    """(마지막으로 집계한 id, 상한 후보 id, 그 후보를 기록할 때의 스냅샷 xmax)"""
+    cursor.execute(
+        "SELECT last_id, pending_id, pending_xmax FROM rollup_watermarks WHERE name = %s FOR UPDATE",
+        (_WATERMARK_NAME,),
+    )
+    row = cursor.fetchone()
+    return tuple(row) if row else (0, None, None)
+
+
+def _settled_bound(cursor, pending_id: Optional[int], pending_xmax: Optional[int]) -> Optional[int]:
+    """pending_id를 기록할 때 진행 중이던 트랜잭션이 모두 끝났으면 pending_id, 아니면 None"""
+    if pending_id is None:
+        return None
+    cursor.execute("SELECT txid_snapshot_xmin(txid_current_snapshot())")
+    return pending_id if cursor.fetchone()[0] >= pending_xmax else None
+
+
+def _next_pending(cursor) -> Tuple[Optional[int], Optional[int]]:
+    """
+    지금의 시퀀스 마지막 값과 그 뒤에 찍은 스냅샷의 xmax를 반환합니다.
+
+    시퀀스를 먼저 읽고 다음 문장에서 스냅샷을 찍어야 그 값 이하의 id를 받은 트랜잭션이 모두 xmax보다
+    앞섭니다 (READ COMMITTED에서는 문장마다 새 스냅샷).
+    """
+    cursor.execute("SELECT pg_sequence_last_value(pg_get_serial_sequence('network_checks', 'id')::regclass)")
+    sequence_value = cursor.fetchone()[0]
+    if sequence_value is None:
+        return None, None
+    cursor.execute("SELECT txid_snapshot_xmax(txid_current_snapshot())")
+    return sequence_value, cursor.fetchone()[0]
+
+
+def run_rollups(db_config: Dict[str, Any], minute_retention_days: int = 30,
+                max_rows: int = 100_000) -> Optional[int]:
+    """
+    워터마크 이후 새로 들어온 network_checks 행으로 분/시간/일 집계를 갱신합니다.
+
+    모든 결과가 network_checks에 있어야 하므로 STORAGE_MODE가 raw 또는 both일 때만 씁니다.
+    spans 모드의 원본은 상태가 바뀔 때와 하트비트마다만 남아 건수와 가용률이 실제와 달라집니다.
+
+    늦게 커밋되는 행을 건너뛰지 않도록 이전 실행에서 기록한 상한까지만 집계하므로 새 행은 한 주기 늦게
+    반영되며, 여러 프로세스가 동시에 network_checks에 써도 됩니다.
+    한 번에 최대 max_rows개의 새 행만 처리하며, 밀린 행은 다음 실행에서 이어서 처리합니다.
+    분 단위 집계는 minute_retention_days가 지나면 삭제됩니다 (시간/일 단위는 유지).
+
+    Returns:
+        처리한 새 행 수, 실패 시 None
+    """
+    global _tables_ready
+
+    try:
+        with get_connection(db_config) as conn:
+            try:
+                with conn.cursor() as cursor:
+                    if not _tables_ready:
+                        create_rollup_tables(cursor)
+                    low, pending_id, pending_xmax = _read_watermark(cursor)
+                    bound = _settled_bound(cursor, pending_id, pending_xmax)
+
+                    high, new_rows = None, 0
+                    if bound is not None:
+                        cursor.execute(
+                            """
+                            SELECT MAX(id), COUNT(*) FROM (
+                                SELECT id FROM network_checks
+                                WHERE id > %s AND id <= %s
+                                ORDER BY id
+                                LIMIT %s
+                            ) AS new_rows
+                            """,
+                            (low, bound, max_rows),
+                        )
+                        high, new_rows = cursor.fetchone()
+
+                    if high is not None:
+                        for width, unit, step in ROLLUP_WIDTHS:
+                            cursor.execute(
+                                _UPSERT_ROLLUP_SQL,
+                                {"width": width, "unit": unit, "step": step, "low": low, "high": high},
+                            )
+
+                    if bound is not None and new_rows < max_rows:
+                        # 상한까지 다 집계했으면 (롤백으로 빈 id 포함) 워터마크를 상한으로 옮기고 새 후보를 기록
+                        low = bound
+                        pending_id, pending_xmax = _next_pending(cursor)
+                    elif high is not None:
+                        low = high
+                    elif pending_id is None:
+                        pending_id, pending_xmax = _next_pending(cursor)
+
+                    cursor.execute(
+                        """
+                        INSERT INTO rollup_watermarks (name, last_id, pending_id, pending_xmax, updated_at)
+                        VALUES (%s, %s, %s, %s, NOW())
+                        ON CONFLICT (name) DO UPDATE SET
+                            last_id = EXCLUDED.last_id, pending_id = EXCLUDED.pending_id,
+                            pending_xmax = EXCLUDED.pending_xmax, updated_at = NOW()
+                        """,
+                        (_WATERMARK_NAME, low, pending_id, pending_xmax),
+                    )
+
+                    cursor.execute(
+                        "DELETE FROM network_check_rollups "
+                        "WHERE bucket_width = '1m' AND bucket_start < NOW() - make_interval(days => %s)",
+                        (minute_retention_days,),
+                    )
+                conn.commit()
+                _tables_ready = True
+            except psycopg2.Error:
+                if not conn.closed:
+                    conn.rollback()
+                raise
+
+        if new_rows:
+            logger.info(f"집계 갱신 완료: 새 행 {new_rows}건 (워터마크 id={high})")
+        return new_rows
+
+    except psycopg2.Error as e:
+        logger.error(f"집계 갱신 중 데이터베이스 오류: {e}")
+        return None
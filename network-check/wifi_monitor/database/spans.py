@@ -0,0 +1,222 @@
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+import psycopg2
+import psycopg2.extras
+
+from checks.result import as_result
+from database.db import SAVE_OK, classify_error, get_connection
+
+logger = logging.getLogger(__name__)
+
+# 저장 방식
+STORAGE_RAW = "raw"      # 모든 결과를 network_checks에 저장 (기존 방식)
+STORAGE_SPANS = "spans"  # 상태 구간을 network_check_spans에, 원본은 의미 있게 바뀔 때만 저장
+STORAGE_BOTH = "both"    # 모든 결과와 상태 구간을 모두 저장
+STORAGE_MODES = (STORAGE_RAW, STORAGE_SPANS, STORAGE_BOTH)
+
+SPAN_COLUMNS = (
+    "check_type",
+    "target",
+    "started_at",
+    "ended_at",
+    "sample_count",
+    "reachable",
+    "error_message",
+    "latency_min_ms",
+    "latency_avg_ms",
+    "latency_max_ms",
+    "packet_loss_avg",
+)
+
+CREATE_SPANS_TABLE_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS network_check_spans (
+        check_type VARCHAR(20) NOT NULL,
+        target VARCHAR(100) NOT NULL,
+        started_at TIMESTAMP NOT NULL,
+        ended_at TIMESTAMP NOT NULL,
+        sample_count INTEGER NOT NULL,
+        reachable BOOLEAN NOT NULL,
+        error_message TEXT,
+        latency_min_ms FLOAT,
+        latency_avg_ms FLOAT,
+        latency_max_ms FLOAT,
+        packet_loss_avg FLOAT,
+        updated_at TIMESTAMP DEFAULT NOW(),
+        PRIMARY KEY (check_type, target, started_at)
+    );
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_network_check_spans_ended_at ON network_check_spans (ended_at);",
+]
+
+_UPSERT_SPANS_SQL = f"""
+INSERT INTO network_check_spans ({", ".join(SPAN_COLUMNS)})
+VALUES %s
+ON CONFLICT (check_type, target, started_at) DO UPDATE SET
+    ended_at = EXCLUDED.ended_at,
+    sample_count = EXCLUDED.sample_count,
+    latency_min_ms = EXCLUDED.latency_min_ms,
+    latency_avg_ms = EXCLUDED.latency_avg_ms,
+    latency_max_ms = EXCLUDED.latency_max_ms,
+    packet_loss_avg = EXCLUDED.packet_loss_avg,
+    updated_at = NOW()
+"""
+
+
+def create_spans_table(cursor) -> None:
+    for create_sql in CREATE_SPANS_TABLE_SQL:
+        cursor.execute(create_sql)
+
+
+class StateSpan:
+    """같은 상태(접속 여부 + 에러 메시지)가 이어진 구간 하나."""
+
+    __slots__ = ("check_type", "target", "started_at", "ended_at", "sample_count", "reachable",
+                 "error_message", "latency_min_ms", "latency_max_ms", "_latency_sum", "_latency_count",
+                 "_loss_sum", "_loss_count")
+
+    def __init__(self, check_type: str, target: str, started_at: datetime, reachable: bool,
+                 error_message: Optional[str]):
+        self.check_type = check_type
+        self.target = target
+        self.started_at = started_at
+        self.ended_at = started_at
+        self.sample_count = 0
+        self.reachable = reachable
+        self.error_message = error_message
+        self.latency_min_ms: Optional[float] = None
+        self.latency_max_ms: Optional[float] = None
+        self._latency_sum = 0.0
+        self._latency_count = 0
+        self._loss_sum = 0.0
+        self._loss_count = 0
+
+    def extend(self, timestamp: datetime, latency_ms: Optional[float], packet_loss: Optional[float]) -> None:
+        self.ended_at = timestamp
+        self.sample_count += 1
+        if latency_ms is not None:
+            self._latency_sum += latency_ms
+            self._latency_count += 1
+            self.latency_min_ms = latency_ms if self.latency_min_ms is None else min(self.latency_min_ms, latency_ms)
+            self.latency_max_ms = latency_ms if self.latency_max_ms is None else max(self.latency_max_ms, latency_ms)
+        if packet_loss is not None:
+            self._loss_sum += packet_loss
+            self._loss_count += 1
+
+    def to_row(self) -> tuple:
+        """SPAN_COLUMNS 순서의 튜플"""
+        return (
+            self.check_type, self.target[:100], self.started_at, self.ended_at, self.sample_count,
+            self.reachable, self.error_message, self.latency_min_ms,
+            self._latency_sum / self._latency_count if self._latency_count else None,
+            self.latency_max_ms,
+            self._loss_sum / self._loss_count if self._loss_count else None,
+        )
+
+
+class _SeriesSpans:
+    __slots__ = ("span", "last_raw_at", "last_raw_latency", "last_raw_loss")
+
+    def __init__(self):
+        self.span: Optional[StateSpan] = None
+        self.last_raw_at: Optional[datetime] = None
+        self.last_raw_latency: Optional[float] = None
+        self.last_raw_loss: Optional[float] = None
+
+
+class SpanEncoder:
+    """
+    결과를 (check_type, target)별 상태 구간으로 합치고, 원본 행을 남길지 정합니다.
+
+    원본은 상태가 바뀌었을 때, 손실률이 바뀌었을 때, 응답시간이 마지막으로 남긴 값보다
+    latency_delta_ms와 latency_delta_ratio를 모두 넘게 달라졌을 때, 또는 마지막 원본 이후
+    heartbeat_seconds가 지났을 때만 남깁니다. 속도 측정 결과는 항상 남깁니다.
+    장애 중 같은 실패가 반복되면 구간 하나의 sample_count와 ended_at만 늘어납니다.
+    """
+
+    def __init__(self, latency_delta_ms: float = 5.0, latency_delta_ratio: float = 0.2,
+                 heartbeat_seconds: float = 600.0):
+        self.latency_delta_ms = latency_delta_ms
+        self.latency_delta_ratio = latency_delta_ratio
+        self.heartbeat_seconds = heartbeat_seconds
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, str], _SeriesSpans] = {}
+
+    def _latency_changed(self, previous: Optional[float], current: Optional[float]) -> bool:
+        if previous is None or current is None:
+            return previous is not current
+        delta = abs(current - previous)
+        return delta > self.latency_delta_ms and delta > previous * self.latency_delta_ratio
+
+    def add(self, result) -> Tuple[StateSpan, bool]:
+        """
+        결과 하나를 구간에 반영합니다.
+
+        Returns:
+            (갱신된 구간, 원본 행을 저장할지 여부)
+        """
+        result = as_result(result)
+        key = (result.check_type, result.target)
+        reachable = bool(result.reachable)
+
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _SeriesSpans()
+
+            span = series.span
+            state_changed = span is None or span.reachable != reachable or span.error_message != result.error_message
+            if state_changed:
+                span = series.span = StateSpan(result.check_type, result.target, result.timestamp,
+                                               reachable, result.error_message)
+            span.extend(result.timestamp, result.latency_ms, result.packet_loss)
+
+            keep_raw = (
+                state_changed
+                or result.download_mbps is not None
+                or result.upload_mbps is not None
+                or result.packet_loss != series.last_raw_loss
+                or self._latency_changed(series.last_raw_latency, result.latency_ms)
+                or series.last_raw_at is None
+                or (result.timestamp - series.last_raw_at).total_seconds() >= self.heartbeat_seconds
+            )
+            if keep_raw:
+                series.last_raw_at = result.timestamp
+                series.last_raw_latency = result.latency_ms
+                series.last_raw_loss = result.packet_loss
+        return span, keep_raw
+
+
+def save_spans(rows: List[tuple], db_config: Dict[str, Any]) -> bool:
+    """
+    상태 구간(SPAN_COLUMNS 순서의 튜플)을 network_check_spans에 upsert합니다.
+
+    Returns:
+        성공: True, 실패: False
+    """
+    return write_spans(rows, db_config)[0] == SAVE_OK
+
+
+def write_spans(rows: List[tuple], db_config: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+    """save_spans()와 같지만 write_results()처럼 (상태, 오류 메시지)를 반환합니다."""
+    if not rows:
+        return SAVE_OK, None
+
+    try:
+        with get_connection(db_config) as conn:
+            try:
+                with conn.cursor() as cursor:
+                    psycopg2.extras.execute_values(cursor, _UPSERT_SPANS_SQL, rows, page_size=len(rows))
+                conn.commit()
+            except psycopg2.Error:
+                if not conn.closed:
+                    conn.rollback()
+                raise
+        return SAVE_OK, None
+
+    except psycopg2.Error as e:
+        logger.error(f"상태 구간 저장 중 데이터베이스 오류: {e}")
+        return classify_error(e), str(e).strip()
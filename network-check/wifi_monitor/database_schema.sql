@@ -4,9 +4,10 @@
 -- 데이터베이스 생성 (필요시)
 -- CREATE DATABASE network_monitor;
 
--- 테이블 생성
+-- 테이블 생성 (timestamp 기준 일 단위 RANGE 파티션)
+-- 기존 일반 테이블에서 옮기려면 create_table.py를 실행하세요 (network_checks_legacy로 보관 후 복사)
 CREATE TABLE network_checks (
-    id SERIAL PRIMARY KEY,
+    id BIGSERIAL,
     timestamp TIMESTAMP NOT NULL,
     check_type VARCHAR(20) NOT NULL,
     target VARCHAR(100) NOT NULL,
@@ -16,21 +17,102 @@ CREATE TABLE network_checks (
     download_mbps FLOAT,
     upload_mbps FLOAT,
     error_message TEXT,
-    created_at TIMESTAMP DEFAULT NOW()
-);
+    created_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp);
+
+-- 미리 만든 범위를 벗어난 행을 받는 기본 파티션
+CREATE TABLE network_checks_default PARTITION OF network_checks DEFAULT;
+
+-- 일 단위 파티션 예시 (main.py의 db_maintenance 작업이 DB_PARTITION_PRECREATE_DAYS일 앞까지 자동 생성하고
+-- DB_RETENTION_DAYS일이 지난 파티션은 삭제합니다)
+-- CREATE TABLE network_checks_p20251025 PARTITION OF network_checks
+--     FOR VALUES FROM ('2025-10-25') TO ('2025-10-26');
 
 -- 인덱스 생성
-CREATE INDEX idx_timestamp ON network_checks(timestamp);
-CREATE INDEX idx_check_type ON network_checks(check_type);
-CREATE INDEX idx_reachable ON network_checks(reachable);
+-- timestamp는 삽입 순서와 거의 같으므로 B-tree 대신 BRIN, 대시보드 조회는 (check_type, timestamp) 복합 인덱스
+CREATE INDEX idx_network_checks_timestamp_brin ON network_checks USING BRIN (timestamp);
+CREATE INDEX idx_network_checks_type_timestamp ON network_checks (check_type, timestamp);
 
 -- 테이블 설명
 COMMENT ON TABLE network_checks IS '네트워크 체크 결과 저장 테이블';
-COMMENT ON COLUMN network_checks.check_type IS '체크 유형: router 또는 speed_test';
+COMMENT ON COLUMN network_checks.check_type IS '체크 유형: router, speed_test, bandwidth_probe 또는 http_dns, http_connect, http_tls, http_ttfb';
 COMMENT ON COLUMN network_checks.target IS '체크 대상 (IP 주소 또는 도메인)';
 COMMENT ON COLUMN network_checks.reachable IS '접속 성공 여부';
 COMMENT ON COLUMN network_checks.latency_ms IS '응답 시간 (밀리초)';
 COMMENT ON COLUMN network_checks.packet_loss IS '패킷 손실률 (0.0 ~ 1.0)';
-COMMENT ON COLUMN network_checks.download_mbps IS '다운로드 속도 (Mbps, speed_test만 해당)';
-COMMENT ON COLUMN network_checks.upload_mbps IS '업로드 속도 (Mbps, speed_test만 해당)';
+COMMENT ON COLUMN network_checks.download_mbps IS '다운로드 속도 (Mbps, speed_test/bandwidth_probe만 해당)';
+COMMENT ON COLUMN network_checks.upload_mbps IS '업로드 속도 (Mbps, speed_test/bandwidth_probe만 해당)';
 COMMENT ON COLUMN network_checks.error_message IS '실패 시 에러 메시지';
+
+-- 분/시간/일 단위 집계 (main.py의 rollup 작업이 워터마크 이후 새 행이 속한 버킷만 다시 계산)
+CREATE TABLE network_check_rollups (
+    bucket_width VARCHAR(4) NOT NULL,
+    bucket_start TIMESTAMP NOT NULL,
+    check_type VARCHAR(20) NOT NULL,
+    target VARCHAR(100) NOT NULL,
+    sample_count INTEGER NOT NULL,
+    reachable_count INTEGER NOT NULL,
+    availability FLOAT NOT NULL,
+    latency_avg_ms FLOAT,
+    latency_p50_ms FLOAT,
+    latency_p95_ms FLOAT,
+    latency_p99_ms FLOAT,
+    packet_loss_avg FLOAT,
+    download_min_mbps FLOAT,
+    download_max_mbps FLOAT,
+    upload_min_mbps FLOAT,
+    upload_max_mbps FLOAT,
+    updated_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (bucket_width, check_type, target, bucket_start)
+);
+
+-- 집계가 반영된 network_checks의 마지막 id
+CREATE TABLE rollup_watermarks (
+    name VARCHAR(50) PRIMARY KEY,
+    last_id BIGINT NOT NULL,
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+COMMENT ON TABLE network_check_rollups IS '네트워크 체크 결과 집계 (bucket_width: 1m, 1h, 1d)';
+COMMENT ON COLUMN network_check_rollups.availability IS '가용률 (reachable 비율, 0.0 ~ 1.0)';
+
+-- 감지된 장애 (main.py의 장애 감지가 시작 시 행을 만들고 종료 시 ended_at을 채움)
+CREATE TABLE network_incidents (
+    incident_id UUID PRIMARY KEY,
+    kind VARCHAR(20) NOT NULL,
+    check_type VARCHAR(20) NOT NULL,
+    target VARCHAR(100) NOT NULL,
+    started_at TIMESTAMP NOT NULL,
+    ended_at TIMESTAMP,
+    sample_count INTEGER NOT NULL DEFAULT 0,
+    details TEXT,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX idx_network_incidents_started_at ON network_incidents (started_at);
+
+COMMENT ON TABLE network_incidents IS '감지된 장애 (kind: outage, latency, throughput)';
+COMMENT ON COLUMN network_incidents.ended_at IS '장애 종료 시간 (진행 중이면 NULL)';
+
+-- 상태 구간 (STORAGE_MODE=spans/both: 같은 상태가 이어진 결과를 한 행으로 합침)
+CREATE TABLE network_check_spans (
+    check_type VARCHAR(20) NOT NULL,
+    target VARCHAR(100) NOT NULL,
+    started_at TIMESTAMP NOT NULL,
+    ended_at TIMESTAMP NOT NULL,
+    sample_count INTEGER NOT NULL,
+    reachable BOOLEAN NOT NULL,
+    error_message TEXT,
+    latency_min_ms FLOAT,
+    latency_avg_ms FLOAT,
+    latency_max_ms FLOAT,
+    packet_loss_avg FLOAT,
+    updated_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (check_type, target, started_at)
+);
+
+CREATE INDEX idx_network_check_spans_ended_at ON network_check_spans (ended_at);
+
+COMMENT ON TABLE network_check_spans IS '같은 상태(접속 여부 + 에러 메시지)가 이어진 구간';
+COMMENT ON COLUMN network_check_spans.sample_count IS '구간에 포함된 체크 결과 수';
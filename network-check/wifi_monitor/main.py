@@ -1,83 +1,296 @@
-import time
-import schedule
+import argparse
+import contextvars
 import logging
+import os
+import sys
+import time
 from concurrent.futures import ThreadPoolExecutor
-from typing import Tuple
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
 
-from config import DB_CONFIG, ROUTER_IP, PING_COUNT, PING_TIMEOUT, CHECK_INTERVAL_MINUTES
+from config import (
+    DB_CONFIG, PING_COUNT, PING_TIMEOUT,
+    ROUTER_CHECK_INTERVAL_SECONDS, SPEED_TEST_INTERVAL_SECONDS, STATUS_LOG_INTERVAL_SECONDS,
+    ROUTER_OVERLAP_POLICY, SPEED_TEST_OVERLAP_POLICY,
+    SPEED_TEST_TIMEOUT_SECONDS, SPEED_TEST_START_METHOD,
+    BANDWIDTH_PROBE_URL, BANDWIDTH_PROBE_UPLOAD_URL, BANDWIDTH_PROBE_BYTES,
+    BANDWIDTH_PROBE_UPLOAD_BYTES, BANDWIDTH_PROBE_TIMEOUT, BANDWIDTH_PROBE_INTERVAL_SECONDS,
+    HTTP_PROBE_URLS, HTTP_PROBE_TIMEOUT, HTTP_PROBE_CONCURRENCY, HTTP_PROBE_INTERVAL_SECONDS,
+    PING_INTERVAL_SECONDS, PING_MODE, PING_TCP_PORT,
+    PROBE_TARGETS, PROBE_CONCURRENCY, PROBE_TARGET_TIMEOUT,
+    OUTBOX_PATH, OUTBOX_BATCH_SIZE, OUTBOX_FLUSH_INTERVAL_SECONDS,
+    DB_RETENTION_DAYS, DB_PARTITION_PRECREATE_DAYS, DB_MAINTENANCE_INTERVAL_SECONDS,
+    ROLLUP_INTERVAL_SECONDS, ROLLUP_MINUTE_RETENTION_DAYS,
+    METRICS_ENABLED, METRICS_HOST, METRICS_PORT, RECENT_SAMPLES_CAPACITY,
+    DETECTOR_FAILURE_THRESHOLD, DETECTOR_RECOVERY_THRESHOLD, DETECTOR_EWMA_ALPHA, DETECTOR_CUSUM_K,
+    DETECTOR_CUSUM_H, DETECTOR_MIN_STD_MS, DETECTOR_WARMUP_SAMPLES, DETECTOR_THROUGHPUT_DROP,
+    ALERT_WEBHOOK_URL, ALERT_WEBHOOK_TIMEOUT,
+    ADAPTIVE_ENABLED, ADAPTIVE_FAST_INTERVAL_SECONDS, ADAPTIVE_LOSS_THRESHOLD,
+    ADAPTIVE_LATENCY_THRESHOLD_MS, ADAPTIVE_RECOVERY_TICKS, ADAPTIVE_HOURLY_BUDGET,
+    STORAGE_MODE, SPAN_LATENCY_DELTA_MS, SPAN_LATENCY_DELTA_RATIO, SPAN_HEARTBEAT_SECONDS,
+    TRACE_ENABLED, TRACE_SAMPLE_RATE, TRACE_EXPORTERS, TRACE_LOG_MIN_DURATION_MS,
+    TRACE_CHROME_PATH, TRACE_CHROME_MAX_BYTES,
+    PROFILE_DIR, PROFILE_DURATION_SECONDS, PROFILE_SAMPLE_HZ,
+)
 from utils.logger import setup_logger
-from checks.router_check import check_router
-from checks.speed_check import check_speed
-from database.db import save_result
+from utils.scheduler import FixedRateScheduler
+from utils.metrics import REGISTRY, CHECK_DURATION, OUTBOX_DEPTH, MetricsServer, observe_result, observe_scheduler
+from utils.ring_buffer import RecentSamples, make_query_routes
+from utils.detector import Detector
+from utils.alerts import AlertDispatcher, LogSink, WebhookSink
+from utils.adaptive import AdaptiveInterval
+from utils import tracing
+from utils.profiler import SamplingProfiler, install_signal_handlers
+from database.db import get_pool_stats, close_pool
+from database.outbox import Outbox, OutboxFlusher
+from database.partitions import run_maintenance
+from database.rollup import run_rollups
+from database.incidents import DatabaseSink
+from database.spans import STORAGE_RAW, STORAGE_SPANS, STORAGE_BOTH, STORAGE_MODES, SpanEncoder
+
+# 체크 모듈(speedtest, asyncio/ICMP, urllib, ssl)은 켜진 체크에서만 처음 쓸 때 불러옵니다
+if TYPE_CHECKING:
+    from checks.speed_worker import SpeedTestRunner
 
 logger = setup_logger()
 
-def check_and_save_router(router_ip: str, db_config: dict) -> bool:
-    """공유기 체크 후 저장"""
+# 최근 결과 (메트릭 서버의 /recent/stats 조회용)
+recent_samples = RecentSamples(RECENT_SAMPLES_CAPACITY)
+
+# 장애 감지와 알림 (싱크는 main()에서 등록)
+detector = Detector(DETECTOR_FAILURE_THRESHOLD, DETECTOR_RECOVERY_THRESHOLD, DETECTOR_EWMA_ALPHA,
+                    DETECTOR_CUSUM_K, DETECTOR_CUSUM_H, DETECTOR_MIN_STD_MS,
+                    DETECTOR_WARMUP_SAMPLES, DETECTOR_THROUGHPUT_DROP)
+alerts = AlertDispatcher()
+
+# 적응형 공유기 체크 주기 (ADAPTIVE_ENABLED일 때 main()에서 생성)
+adaptive: Optional[AdaptiveInterval] = None
+
+
+def record_result(result) -> None:
+    """체크 결과를 메트릭, 최근 결과 링 버퍼, 장애 감지, 적응형 주기에 반영합니다."""
+    observe_result(result)
+    recent_samples.add(result)
+    for event in detector.process(result):
+        alerts.emit(event)
+    if adaptive is not None and result["check_type"] == "router":
+        adaptive.observe(result)
+
+
+# 상태 구간 인코더 (STORAGE_MODE가 spans/both일 때 사용)
+span_encoder = SpanEncoder(SPAN_LATENCY_DELTA_MS, SPAN_LATENCY_DELTA_RATIO, SPAN_HEARTBEAT_SECONDS)
+
+
+def buffer_results(results, outbox: Outbox) -> int:
+    """
+    저장 방식(STORAGE_MODE)에 따라 결과를 로컬 버퍼에 기록합니다.
+
+    Returns:
+        network_checks 원본으로 기록한 건수
+    """
+    if STORAGE_MODE == STORAGE_RAW:
+        outbox.append_many(results)
+        return len(results)
+
+    raw = []
+    spans = {}
+    for result in results:
+        span, keep_raw = span_encoder.add(result)
+        spans[(span.check_type, span.target, span.started_at)] = span.to_row()
+        if keep_raw or STORAGE_MODE == STORAGE_BOTH:
+            raw.append(result)
+    if raw:
+        outbox.append_many(raw)
+    outbox.upsert_spans(list(spans.values()))
+    return len(raw)
+
+
+def check_and_save_router(targets: List[str], outbox: Outbox) -> bool:
+    """공유기 및 대상 목록 체크 후 한 번에 로컬 버퍼에 기록"""
+    from checks.probe_scheduler import check_targets
+
     try:
-        result = check_router(router_ip, PING_COUNT, PING_TIMEOUT)
-        logger.info(f"공유기 체크 결과: 접속가능={result['reachable']}, 응답시간={result['latency_ms']}ms")
-        
-        # 데이터베이스 저장 시도
+        with tracing.span("router.check", targets=len(targets)):
+            results = check_targets(targets, PING_COUNT, PING_TIMEOUT,
+                                    PING_INTERVAL_SECONDS, PING_MODE, PING_TCP_PORT,
+                                    PROBE_CONCURRENCY, PROBE_TARGET_TIMEOUT)
+        for result in results:
+            record_result(result)
+            logger.info(f"공유기 체크 결과: 대상={result['target']}, 접속가능={result['reachable']}, 응답시간={result['latency_ms']}ms",
+                        extra={"probe": result})
+
+        # 로컬 버퍼 기록 시도 (한 틱의 결과를 하나의 트랜잭션으로, DB 전송은 OutboxFlusher가 담당)
         try:
-            saved = save_result(result, db_config)
-            if saved:
-                logger.info("공유기 체크 결과가 데이터베이스에 저장되었습니다")
-            else:
-                logger.warning("공유기 체크 결과 저장에 실패했습니다")
-            return saved
-        except Exception as db_error:
-            logger.warning(f"공유기 체크 데이터베이스 저장 실패: {db_error}")
+            with tracing.span("outbox.write"):
+                buffered = buffer_results(results, outbox)
+            logger.info(f"공유기 체크 결과 {buffered}건이 로컬 버퍼에 기록되었습니다")
+            return True
+        except Exception as buffer_error:
+            logger.warning(f"공유기 체크 결과 버퍼 기록 실패: {buffer_error}")
             return False
-            
+
     except Exception as e:
         logger.error(f"공유기 체크 실패: {e}")
         return False
 
-def check_and_save_speed(db_config: dict) -> bool:
-    """속도 체크 후 저장"""
+
+def check_and_save_speed(outbox: Outbox, runner: Optional["SpeedTestRunner"] = None) -> bool:
+    """속도 체크(별도 프로세스) 후 로컬 버퍼에 기록"""
     try:
-        result = check_speed()
-        logger.info(f"속도 테스트 결과: 접속가능={result['reachable']}, 다운로드={result['download_mbps']}Mbps, 업로드={result['upload_mbps']}Mbps")
-        
-        # 데이터베이스 저장 시도
+        if runner is None:
+            from checks.speed_worker import SpeedTestRunner
+            runner = SpeedTestRunner(SPEED_TEST_TIMEOUT_SECONDS, SPEED_TEST_START_METHOD)
+        result = runner.run()
+        record_result(result)
+        logger.info(f"속도 테스트 결과: 접속가능={result['reachable']}, 다운로드={result['download_mbps']}Mbps, 업로드={result['upload_mbps']}Mbps",
+                    extra={"probe": result})
+
+        # 로컬 버퍼 기록 시도 (DB 전송은 OutboxFlusher가 담당)
         try:
-            saved = save_result(result, db_config)
-            if saved:
-                logger.info("속도 테스트 결과가 데이터베이스에 저장되었습니다")
-            else:
-                logger.warning("속도 테스트 결과 저장에 실패했습니다")
-            return saved
-        except Exception as db_error:
-            logger.warning(f"속도 테스트 데이터베이스 저장 실패: {db_error}")
+            with tracing.span("outbox.write"):
+                buffer_results([result], outbox)
+            logger.info("속도 테스트 결과가 로컬 버퍼에 기록되었습니다")
+            return True
+        except Exception as buffer_error:
+            logger.warning(f"속도 테스트 결과 버퍼 기록 실패: {buffer_error}")
             return False
-            
+
     except Exception as e:
         logger.error(f"속도 체크 실패: {e}")
         return False
 
-def run_checks(router_ip: str, db_config: dict) -> Tuple[bool, bool]:
+
+def check_and_save_bandwidth(outbox: Outbox) -> bool:
+    """경량 대역폭 측정 후 로컬 버퍼에 기록"""
+    from checks.bandwidth_check import check_bandwidth
+
+    try:
+        with tracing.span("bandwidth.check"):
+            result = check_bandwidth(BANDWIDTH_PROBE_URL, BANDWIDTH_PROBE_BYTES, BANDWIDTH_PROBE_TIMEOUT,
+                                     BANDWIDTH_PROBE_UPLOAD_URL or None, BANDWIDTH_PROBE_UPLOAD_BYTES)
+        record_result(result)
+        logger.info(f"대역폭 측정 결과: 접속가능={result['reachable']}, 다운로드={result['download_mbps']}Mbps, 업로드={result['upload_mbps']}Mbps",
+                    extra={"probe": result})
+
+        try:
+            with tracing.span("outbox.write"):
+                buffer_results([result], outbox)
+            return True
+        except Exception as buffer_error:
+            logger.warning(f"대역폭 측정 결과 버퍼 기록 실패: {buffer_error}")
+            return False
+
+    except Exception as e:
+        logger.error(f"대역폭 측정 실패: {e}")
+        return False
+
+
+def check_and_save_http(urls: List[str], outbox: Outbox) -> bool:
+    """HTTP 단계별(DNS/연결/TLS/TTFB) 체크 후 한 번에 로컬 버퍼에 기록"""
+    from checks.http_check import check_http
+
+    try:
+        with tracing.span("http.check", urls=len(urls)):
+            results = check_http(urls, HTTP_PROBE_TIMEOUT, HTTP_PROBE_CONCURRENCY)
+        for result in results:
+            record_result(result)
+            logger.info(f"HTTP 체크 결과: 단계={result['check_type']}, 대상={result['target']}, "
+                        f"접속가능={result['reachable']}, 응답시간={result['latency_ms']}ms",
+                        extra={"probe": result})
+
+        try:
+            with tracing.span("outbox.write"):
+                buffer_results(results, outbox)
+            return True
+        except Exception as buffer_error:
+            logger.warning(f"HTTP 체크 결과 버퍼 기록 실패: {buffer_error}")
+            return False
+
+    except Exception as e:
+        logger.error(f"HTTP 체크 실패: {e}")
+        return False
+
+
+def run_router_checks(targets: List[str], outbox: Outbox, flusher: OutboxFlusher) -> bool:
+    """스케줄러의 공유기 체크 작업: 대상 목록을 체크하고 바로 전송을 요청합니다."""
+    started = time.perf_counter()
+    with tracing.span("tick.router"):
+        router_saved = check_and_save_router(targets, outbox)
+    CHECK_DURATION.observe(time.perf_counter() - started, check_type="router")
+    if adaptive is not None:
+        adaptive.end_tick()
+    flusher.notify()
+    return router_saved
+
+
+def run_speed_checks(outbox: Outbox, flusher: OutboxFlusher, runner: "SpeedTestRunner") -> bool:
+    """스케줄러의 속도 테스트 작업 (공유기 체크와 별도 스레드/프로세스에서 실행)"""
+    started = time.perf_counter()
+    with tracing.span("tick.speed_test"):
+        speed_saved = check_and_save_speed(outbox, runner)
+    CHECK_DURATION.observe(time.perf_counter() - started, check_type="speed_test")
+    flusher.notify()
+    return speed_saved
+
+
+def run_bandwidth_checks(outbox: Outbox, flusher: OutboxFlusher) -> bool:
+    """스케줄러의 경량 대역폭 측정 작업"""
+    started = time.perf_counter()
+    with tracing.span("tick.bandwidth_probe"):
+        bandwidth_saved = check_and_save_bandwidth(outbox)
+    CHECK_DURATION.observe(time.perf_counter() - started, check_type="bandwidth_probe")
+    flusher.notify()
+    return bandwidth_saved
+
+
+def run_http_checks(urls: List[str], outbox: Outbox, flusher: OutboxFlusher) -> bool:
+    """스케줄러의 HTTP 단계별 체크 작업"""
+    started = time.perf_counter()
+    with tracing.span("tick.http_probe"):
+        http_saved = check_and_save_http(urls, outbox)
+    CHECK_DURATION.observe(time.perf_counter() - started, check_type="http_probe")
+    flusher.notify()
+    return http_saved
+
+
+def log_status(scheduler: FixedRateScheduler, outbox: Outbox) -> None:
+    """스케줄러 지연, DB 커넥션 풀, 로컬 버퍼 상태를 로그로 남깁니다."""
+    for name, stats in scheduler.get_stats().items():
+        logger.info(
+            f"[{name}] 실행={stats['runs']}, 건너뜀={stats['skipped']}, 병합={stats['coalesced']}, "
+            f"지연(최근/평균/최대)={stats['last_lateness_seconds']:.3f}/"
+            f"{stats['avg_lateness_seconds']:.3f}/{stats['max_lateness_seconds']:.3f}초"
+        )
+    pool_stats = get_pool_stats()
+    logger.info(f"DB 커넥션 풀: 신규={pool_stats['opened']}, 재사용={pool_stats['reused']}, 실패={pool_stats['failed']}")
+    logger.info(f"로컬 버퍼 대기 건수: {outbox.depth()}")
+
+
+def run_checks(targets: List[str], outbox: Outbox, flusher: OutboxFlusher) -> Tuple[bool, bool]:
     """
-    공유기 체크와 속도 체크를 병렬로 실행하고 DB에 저장합니다.
-    
+    공유기(대상 목록) 체크와 속도 체크를 한 번씩 병렬로 실행하고 로컬 버퍼에 기록합니다.
+
     Args:
-        router_ip: 공유기 IP 주소
-        db_config: 데이터베이스 설정
-    
+        targets: ping 대상 목록 (공유기, DNS, ISP 게이트웨이 등)
+        outbox: 결과를 기록할 로컬 버퍼
+        flusher: 버퍼를 DB로 전송하는 백그라운드 작업
+
     Returns:
         (router_saved: bool, speed_saved: bool)
     """
     logger.info("네트워크 체크 시작")
-    
-    with ThreadPoolExecutor(max_workers=2) as executor:
-        # 두 작업을 병렬로 실행
-        future_router = executor.submit(check_and_save_router, router_ip, db_config)
-        future_speed = executor.submit(check_and_save_speed, db_config)
-        
+
+    with tracing.span("run_checks"), ThreadPoolExecutor(max_workers=2) as executor:
+        # 두 작업을 병렬로 실행 (작업 스레드도 같은 추적에 span을 남기도록 문맥을 복사해 넘김)
+        future_router = executor.submit(contextvars.copy_context().run, check_and_save_router, targets, outbox)
+        future_speed = executor.submit(contextvars.copy_context().run, check_and_save_speed, outbox)
+
         # 결과 대기
         router_saved = future_router.result()
         speed_saved = future_speed.result()
-    
+
+    # 새 결과를 바로 전송하도록 알림
+    flusher.notify()
+
     # 결과 로깅
     if router_saved and speed_saved:
         logger.info("모든 체크가 성공적으로 완료되었습니다")
@@ -87,33 +300,211 @@ def run_checks(router_ip: str, db_config: dict) -> Tuple[bool, bool]:
         logger.warning("속도 테스트는 완료되었지만 공유기 체크가 실패했습니다")
     else:
         logger.error("모든 체크가 실패했습니다")
-    
+
     return (router_saved, speed_saved)
 
-def main():
+
+def enabled_checks() -> List[str]:
+    """설정에서 켜진 체크 작업 이름 (router, speed_test, bandwidth_probe, http_probe)"""
+    checks = []
+    if PROBE_TARGETS:
+        checks.append("router")
+    if SPEED_TEST_INTERVAL_SECONDS > 0:
+        checks.append("speed_test")
+    if BANDWIDTH_PROBE_URL:
+        checks.append("bandwidth_probe")
+    if HTTP_PROBE_URLS:
+        checks.append("http_probe")
+    return checks
+
+
+def configure_tracing() -> None:
+    """TRACE_ENABLED이면 단계별 추적을 켭니다."""
+    if TRACE_ENABLED:
+        tracing.configure(True, TRACE_SAMPLE_RATE,
+                          tracing.build_exporters(TRACE_EXPORTERS, TRACE_CHROME_PATH, TRACE_CHROME_MAX_BYTES,
+                                                  TRACE_LOG_MIN_DURATION_MS))
+        logger.info(f"단계별 추적 사용: {', '.join(TRACE_EXPORTERS)} (샘플링 {TRACE_SAMPLE_RATE:g})")
+
+
+def run_once(checks: List[str]) -> int:
+    """
+    체크를 한 번씩 동시에 실행하고 로컬 버퍼를 DB로 전송한 뒤 끝냅니다 (cron 등 단발 실행용).
+
+    스케줄러, 메트릭 서버, DB 유지보수/집계 작업은 시작하지 않습니다. DB에 전송하지 못한 결과는
+    로컬 버퍼에 남아 다음 실행 때 전송됩니다. 장애 감지 상태는 실행 사이에 유지되지 않습니다.
+
+    Args:
+        checks: 실행할 체크 작업 이름 (enabled_checks() 중 일부)
+
+    Returns:
+        종료 코드 (결과를 로컬 버퍼에 기록하지 못한 체크가 있으면 1)
+    """
+    started = time.perf_counter()
+    logger.info(f"단발 실행: {', '.join(checks) or '체크 없음'}")
+    configure_tracing()
+
+    outbox = Outbox(OUTBOX_PATH)
+    flusher = OutboxFlusher(outbox, DB_CONFIG, OUTBOX_BATCH_SIZE, OUTBOX_FLUSH_INTERVAL_SECONDS)
+    speed_runner = None
+    if "speed_test" in checks:
+        from checks.speed_worker import SpeedTestRunner
+        speed_runner = SpeedTestRunner(SPEED_TEST_TIMEOUT_SECONDS, SPEED_TEST_START_METHOD)
+        speed_runner.prewarm()
+
+    jobs: Dict[str, Callable[[], bool]] = {
+        "router": lambda: check_and_save_router(PROBE_TARGETS, outbox),
+        "speed_test": lambda: check_and_save_speed(outbox, speed_runner),
+        "bandwidth_probe": lambda: check_and_save_bandwidth(outbox),
+        "http_probe": lambda: check_and_save_http(HTTP_PROBE_URLS, outbox),
+    }
+    try:
+        with tracing.span("run_once"), ThreadPoolExecutor(max_workers=max(1, len(checks))) as executor:
+            futures = {name: executor.submit(contextvars.copy_context().run, jobs[name]) for name in checks}
+            saved = {name: future.result() for name, future in futures.items()}
+
+        sent = flusher.flush()
+        logger.info(f"단발 실행 완료: {time.perf_counter() - started:.2f}초, DB 전송 {sent}건, "
+                    f"로컬 버퍼 대기 {outbox.depth()}건")
+    finally:
+        if speed_runner is not None:
+            speed_runner.shutdown()
+        outbox.close()
+        close_pool()
+
+    failed = [name for name, ok in saved.items() if not ok]
+    if failed:
+        logger.error(f"로컬 버퍼에 기록하지 못한 체크: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="WiFi 모니터링 시스템")
+    parser.add_argument("--once", action="store_true",
+                        help="켜진 체크를 한 번씩 실행하고 DB로 전송한 뒤 종료 (cron용)")
+    parser.add_argument("--checks", default="",
+                        help="--once에서 실행할 체크 (쉼표 구분: router,speed_test,bandwidth_probe,http_probe, "
+                             "기본값: 설정에서 켜진 체크 전체)")
+    args = parser.parse_args(argv)
+    enabled = enabled_checks()
+    args.checks = [name.strip() for name in args.checks.split(",") if name.strip()] or enabled
+    disabled = [name for name in args.checks if name not in enabled]
+    if disabled:
+        parser.error(f"켜져 있지 않거나 알 수 없는 체크: {', '.join(disabled)} (켜진 체크: {', '.join(enabled)})")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
     """메인 실행 함수"""
+    args = parse_args(argv)
+    if STORAGE_MODE not in STORAGE_MODES:
+        raise ValueError(f"알 수 없는 저장 방식: {STORAGE_MODE} (가능한 값: {', '.join(STORAGE_MODES)})")
+    if args.once:
+        return run_once(args.checks)
+
+    checks = enabled_checks()
     logger.info("WiFi 모니터링 시스템 시작...")
-    logger.info(f"공유기 IP: {ROUTER_IP}")
-    logger.info(f"체크 간격: {CHECK_INTERVAL_MINUTES}분")
+    logger.info(f"체크 대상: {', '.join(PROBE_TARGETS)} (동시 {PROBE_CONCURRENCY}개)")
+    speed_interval = f"{SPEED_TEST_INTERVAL_SECONDS}초" if "speed_test" in checks else "사용 안 함"
+    logger.info(f"공유기 체크 간격: {ROUTER_CHECK_INTERVAL_SECONDS}초, 속도 테스트 간격: {speed_interval}")
     logger.info(f"데이터베이스: {DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}")
-    
-    # 스케줄 설정
-    schedule.every(CHECK_INTERVAL_MINUTES).minutes.do(run_checks, ROUTER_IP, DB_CONFIG)
-    
-    # 즉시 한 번 실행
-    logger.info("초기 체크 실행 중...")
-    run_checks(ROUTER_IP, DB_CONFIG)
-    
+    logger.info(f"로컬 버퍼: {OUTBOX_PATH}")
+    logger.info(f"저장 방식: {STORAGE_MODE}")
+
+    # 단계별 추적과 실행 중 프로파일 시그널
+    configure_tracing()
+    install_signal_handlers(SamplingProfiler(PROFILE_DIR, PROFILE_DURATION_SECONDS, PROFILE_SAMPLE_HZ),
+                            os.path.join(PROFILE_DIR, "wifi_monitor_stacks.txt"))
+
+    # 로컬 버퍼와 백그라운드 전송 시작 (이전 실행에서 남은 결과도 전송됨)
+    outbox = Outbox(OUTBOX_PATH)
+    flusher = OutboxFlusher(outbox, DB_CONFIG, OUTBOX_BATCH_SIZE, OUTBOX_FLUSH_INTERVAL_SECONDS)
+    flusher.start()
+
+    # 장애 이벤트는 로그와 network_incidents에 기록하고, 설정되어 있으면 웹훅으로도 보냄
+    alerts.add_sink(LogSink())
+    alerts.add_sink(DatabaseSink(DB_CONFIG))
+    if ALERT_WEBHOOK_URL:
+        alerts.add_sink(WebhookSink(ALERT_WEBHOOK_URL, ALERT_WEBHOOK_TIMEOUT))
+    alerts.start()
+
+    # 스케줄 설정 (체크 유형마다 고유 주기, 첫 실행은 즉시)
+    scheduler = FixedRateScheduler()
+    if "router" in checks:
+        scheduler.add_job("router", run_router_checks, ROUTER_CHECK_INTERVAL_SECONDS,
+                          overlap=ROUTER_OVERLAP_POLICY, args=(PROBE_TARGETS, outbox, flusher))
+    # 속도 테스트는 하드 타임아웃이 있는 별도 프로세스에서 실행
+    speed_runner = None
+    if "speed_test" in checks:
+        from checks.speed_worker import SpeedTestRunner
+        speed_runner = SpeedTestRunner(SPEED_TEST_TIMEOUT_SECONDS, SPEED_TEST_START_METHOD)
+        speed_runner.prewarm()
+        scheduler.add_job("speed_test", run_speed_checks, SPEED_TEST_INTERVAL_SECONDS,
+                          overlap=SPEED_TEST_OVERLAP_POLICY, args=(outbox, flusher, speed_runner))
+    if "bandwidth_probe" in checks:
+        scheduler.add_job("bandwidth_probe", run_bandwidth_checks, BANDWIDTH_PROBE_INTERVAL_SECONDS,
+                          args=(outbox, flusher))
+    if "http_probe" in checks:
+        scheduler.add_job("http_probe", run_http_checks, HTTP_PROBE_INTERVAL_SECONDS,
+                          args=(HTTP_PROBE_URLS, outbox, flusher))
+        logger.info(f"HTTP 단계별 체크 대상: {', '.join(HTTP_PROBE_URLS)} ({HTTP_PROBE_INTERVAL_SECONDS}초 간격)")
+    scheduler.add_job("db_maintenance", run_maintenance, DB_MAINTENANCE_INTERVAL_SECONDS,
+                      args=(DB_CONFIG, DB_PARTITION_PRECREATE_DAYS, DB_RETENTION_DAYS))
+    if STORAGE_MODE == STORAGE_SPANS:
+        # spans 모드의 원본은 상태가 바뀔 때와 하트비트마다만 남으므로 원본으로 집계하면 건수/가용률이 틀림
+        logger.warning("STORAGE_MODE=spans에서는 집계(network_check_rollups)를 갱신하지 않습니다. "
+                       "집계가 필요하면 raw 또는 both를 사용하세요")
+    else:
+        scheduler.add_job("rollup", run_rollups, ROLLUP_INTERVAL_SECONDS,
+                          args=(DB_CONFIG, ROLLUP_MINUTE_RETENTION_DAYS))
+    scheduler.add_job("status", log_status, STATUS_LOG_INTERVAL_SECONDS,
+                      args=(scheduler, outbox), first_run_delay=STATUS_LOG_INTERVAL_SECONDS)
+
+    # 이상이 보이면 공유기 체크 주기를 줄이고 정상으로 돌아오면 기본 주기로 복귀
+    global adaptive
+    if ADAPTIVE_ENABLED and "router" in checks:
+        adaptive = AdaptiveInterval(scheduler, "router", ROUTER_CHECK_INTERVAL_SECONDS,
+                                    ADAPTIVE_FAST_INTERVAL_SECONDS, ADAPTIVE_LOSS_THRESHOLD,
+                                    ADAPTIVE_LATENCY_THRESHOLD_MS, ADAPTIVE_RECOVERY_TICKS,
+                                    ADAPTIVE_HOURLY_BUDGET)
+        logger.info(f"적응형 체크 주기 사용: {ADAPTIVE_FAST_INTERVAL_SECONDS}~{ROUTER_CHECK_INTERVAL_SECONDS}초, "
+                    f"시간당 최대 {ADAPTIVE_HOURLY_BUDGET}틱")
+
+    # 메트릭 엔드포인트 (스크랩 시점에 버퍼 대기 건수와 스케줄러 지연을 읽음)
+    metrics_server = None
+    if METRICS_ENABLED:
+        REGISTRY.add_collector(lambda: OUTBOX_DEPTH.set(outbox.depth()))
+        REGISTRY.add_collector(lambda: observe_scheduler(scheduler.get_stats()))
+        metrics_server = MetricsServer(METRICS_HOST, METRICS_PORT)
+        for path, route in make_query_routes(recent_samples).items():
+            metrics_server.add_route(path, route)
+        try:
+            metrics_server.start()
+        except OSError as e:
+            logger.error(f"메트릭 서버를 시작할 수 없습니다 ({METRICS_HOST}:{METRICS_PORT}): {e}")
+            metrics_server = None
+
     # 스케줄 루프
-    logger.info(f"{CHECK_INTERVAL_MINUTES}분마다 자동 체크 시작")
+    logger.info("자동 체크 시작")
     try:
-        while True:
-            schedule.run_pending()
-            time.sleep(1)
+        scheduler.run_forever()
     except KeyboardInterrupt:
         logger.info("사용자에 의해 WiFi 모니터링 시스템이 중지되었습니다")
     except Exception as e:
         logger.error(f"메인 루프에서 예상치 못한 오류 발생: {e}")
+    finally:
+        if metrics_server is not None:
+            metrics_server.stop()
+        if speed_runner is not None:
+            speed_runner.shutdown()
+        scheduler.stop()
+        alerts.stop()
+        flusher.stop()
+        outbox.close()
+        close_pool()
+    return 0
+
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+경량 대역폭 측정(checks/bandwidth_check) 테스트 스크립트 (로컬 HTTP 서버 사용, 인터넷 연결 불필요)
+"""
+import sys
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from checks.bandwidth_check import _measure_download, _measure_upload, check_bandwidth
+
+DELAY_SECONDS = 0.3
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    GET은 Range 범위만큼 0 바이트를 돌려주고, POST는 본문을 모두 읽은 뒤 응답합니다.
+
+    경로가 /slow로 시작하면 응답 헤더를 보내기 전에 DELAY_SECONDS만큼 기다리고(서버 처리 시간),
+    /error로 시작하면 500을 돌려줍니다.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _think(self):
+        if self.path.startswith("/slow"):
+            time.sleep(DELAY_SECONDS)
+
+    def do_GET(self):
+        size = 1_000_000
+        if self.headers.get("Range", "").startswith("bytes=0-"):
+            size = int(self.headers["Range"][len("bytes=0-"):]) + 1
+        self._think()
+        self.send_response(206)
+        self.send_header("Content-Length", str(size))
+        self.end_headers()
+        self.wfile.write(bytes(size))
+
+    def do_POST(self):
+        remaining = int(self.headers["Content-Length"])
+        while remaining:
+            remaining -= len(self.rfile.read(min(65536, remaining)))
+        self.server.uploaded.append(int(self.headers["Content-Length"]))
+        self._think()
+        self.send_response(500 if self.path.startswith("/error") else 200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+class LocalServer:
+    def __init__(self):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.uploaded = []
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}{path}"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def test_server_delay_excluded_from_both_directions():
+    """서버 처리 시간은 다운로드와 업로드 어느 쪽의 전송 시간에도 들어가지 않습니다."""
+    server = LocalServer()
+    try:
+        download = _measure_download(server.url("/slow"), 2_000_000, timeout=5)
+        upload = _measure_upload(server.url("/slow"), 2_000_000, timeout=5)
+    finally:
+        server.close()
+
+    assert download["bytes"] == 2_000_000 and upload["bytes"] == 2_000_000
+    assert download["latency_ms"] >= DELAY_SECONDS * 1000
+    assert download["seconds"] < DELAY_SECONDS
+    assert upload["seconds"] < DELAY_SECONDS
+    assert server.httpd.uploaded == [2_000_000]
+
+
+def test_upload_and_download_measured_alike():
+    """응답 지연이 있어도 없어도 같은 방식으로 재므로 다운로드/업로드 속도가 같은 자릿수로 나옵니다."""
+    server = LocalServer()
+    try:
+        fast = check_bandwidth(server.url("/fast"), 2_000_000, timeout=5,
+                               upload_url=server.url("/fast"), upload_bytes=2_000_000)
+        slow = check_bandwidth(server.url("/slow"), 2_000_000, timeout=5,
+                               upload_url=server.url("/slow"), upload_bytes=2_000_000)
+    finally:
+        server.close()
+
+    for result in (fast, slow):
+        assert result.reachable and result.error_message is None
+        assert result.download_mbps is not None and result.upload_mbps is not None
+    # 2MB를 0.3초 안에 보냈다면 53Mbps 이상 (지연이 포함되면 그보다 낮게 나옴)
+    min_mbps = 2_000_000 * 8 / DELAY_SECONDS / 1_000_000
+    assert slow.download_mbps > min_mbps and slow.upload_mbps > min_mbps
+    assert slow.latency_ms >= DELAY_SECONDS * 1000
+
+
+def test_small_payload_has_no_speed():
+    """너무 적게 주고받은 측정은 속도를 기록하지 않고 응답시간만 남깁니다."""
+    server = LocalServer()
+    try:
+        result = check_bandwidth(server.url("/"), 1_000, timeout=5,
+                                 upload_url=server.url("/"), upload_bytes=1_000)
+    finally:
+        server.close()
+
+    assert result.reachable and result.latency_ms is not None
+    assert result.download_mbps is None and result.upload_mbps is None
+
+
+def test_upload_http_error_is_failure():
+    """업로드 URL이 오류 상태를 돌려주면 측정 실패로 기록합니다."""
+    server = LocalServer()
+    try:
+        result = check_bandwidth(server.url("/"), 100_000, timeout=5,
+                                 upload_url=server.url("/error"), upload_bytes=100_000)
+    finally:
+        server.close()
+
+    assert not result.reachable
+    assert "HTTP 500" in result.error_message
+
+
+def main():
+    """메인 테스트 함수"""
+    tests = [value for name, value in sorted(globals().items()) if name.startswith("test_")]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"[SUCCESS] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"[ERROR] {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} 통과")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+장애 감지(utils/detector)와 알림 전달(utils/alerts) 테스트 스크립트 (정해진 결과 순서로 이벤트 확인)
+"""
+import sys
+import os
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.alerts import AlertDispatcher, AlertSink, MemorySink
+from utils.detector import (
+    EVENT_CLOSED, EVENT_OPENED, INCIDENT_LATENCY, INCIDENT_OUTAGE, INCIDENT_THROUGHPUT, Detector,
+)
+
+START = datetime(2026, 1, 1, 9, 0, 0)
+
+
+def _result(index, reachable=True, latency_ms=None, download_mbps=None, target="192.168.0.1",
+            check_type="router"):
+    return {
+        "timestamp": START + timedelta(seconds=index),
+        "check_type": check_type,
+        "target": target,
+        "reachable": reachable,
+        "latency_ms": latency_ms,
+        "download_mbps": download_mbps,
+        "error_message": None if reachable else "timeout",
+    }
+
+
+def _run(detector, results):
+    """
+    결과를 순서대로 넣고 이벤트가 나온 위치를 반환합니다.
+
+    Returns:
+        [(결과 순번, 이벤트, 장애 유형), ...]
+    """
+    emitted = []
+    for index, result in enumerate(results):
+        for event in detector.process(result):
+            emitted.append((index, event.event, event.incident.kind))
+    return emitted
+
+
+def _latencies(values, start=0):
+    return [_result(start + i, latency_ms=value) for i, value in enumerate(values)]
+
+
+def test_outage_opens_after_failure_threshold():
+    """failure_threshold번 연속 실패한 결과에서 outage가 한 번만 시작됩니다."""
+    detector = Detector(failure_threshold=3, recovery_threshold=2)
+    results = [_result(i, reachable=reachable) for i, reachable in enumerate(
+        [False, False, True, False, False, False, False])]
+
+    assert _run(detector, results) == [(5, EVENT_OPENED, INCIDENT_OUTAGE)]
+    incident, = detector.open_incidents()
+    assert incident.started_at == START + timedelta(seconds=5)
+    assert incident.sample_count == 2
+    assert incident.details == "3회 연속 실패: timeout"
+
+
+def test_outage_recovery_hysteresis():
+    """recovery_threshold번 연속 성공해야 종료되고, 중간의 실패는 성공 횟수를 처음부터 다시 셉니다."""
+    detector = Detector(failure_threshold=2, recovery_threshold=3)
+    pattern = [False, False, True, True, False, True, True, True, True]
+    results = [_result(i, reachable=reachable) for i, reachable in enumerate(pattern)]
+
+    events = []
+    for result in results:
+        events.extend(detector.process(result))
+
+    assert [(event.event, event.timestamp.second) for event in events] == [
+        (EVENT_OPENED, 1), (EVENT_CLOSED, 7),
+    ]
+    closed = events[-1].incident
+    assert closed.ended_at == START + timedelta(seconds=7)
+    assert closed.sample_count == 6  # 시작한 결과부터 종료 직전 결과까지
+    assert not detector.open_incidents()
+    assert events[-1].describe() == "[장애 종료] outage router/192.168.0.1: 6초, 결과 6건"
+
+
+def test_latency_warmup_ignores_spikes():
+    """warmup개가 쌓이기 전에는 응답시간이 튀어도 장애로 보지 않습니다."""
+    detector = Detector(warmup=5)
+    assert _run(detector, _latencies([10.0, 500.0, 10.0, 500.0, 10.0])) == []
+    assert not detector.open_incidents()
+
+
+def test_latency_cusum_threshold():
+    """
+    기준(평균 10ms, 분산 0 → 최소 표준편차 1ms) 대비 큰 상승은 바로, 작은 상승은 CUSUM이 쌓인 뒤 감지합니다.
+    """
+    baseline = [10.0] * 10
+
+    # (20 - 10) / 1 - 0.5 = 9.5 > cusum_h(5): 첫 결과에서 시작
+    detector = Detector()
+    assert _run(detector, _latencies(baseline + [20.0])) == [(10, EVENT_OPENED, INCIDENT_LATENCY)]
+
+    # 13ms: 누적 2.5 → 4.7 → 6.3 으로 세 번째 결과에서 시작
+    detector = Detector()
+    assert _run(detector, _latencies(baseline + [13.0] * 5)) == [(12, EVENT_OPENED, INCIDENT_LATENCY)]
+    incident, = detector.open_incidents()
+    assert incident.details == "응답시간 13.00ms (기준 10.57±1.18ms)"
+
+    # 기준 + k(0.5)표준편차 이내의 변동은 계속 쌓여도 감지하지 않음
+    detector = Detector()
+    assert _run(detector, _latencies(baseline + [10.4, 9.6] * 50)) == []
+
+
+def test_latency_recovery_hysteresis():
+    """장애 중에는 기준을 갱신하지 않고, recovery_threshold번 연속 기준 이내여야 종료됩니다."""
+    detector = Detector(recovery_threshold=2)
+    values = [10.0] * 10 + [20.0, 10.0, 20.0, 10.0, 10.0, 20.0]
+
+    assert _run(detector, _latencies(values)) == [
+        (10, EVENT_OPENED, INCIDENT_LATENCY),
+        (14, EVENT_CLOSED, INCIDENT_LATENCY),
+        (15, EVENT_OPENED, INCIDENT_LATENCY),  # 기준이 20ms에 적응하지 않았으므로 바로 다시 시작
+    ]
+
+
+def test_unreachable_results_do_not_feed_latency():
+    """실패한 결과의 응답시간은 기준값 계산에 쓰지 않습니다."""
+    detector = Detector(warmup=3, failure_threshold=10)
+    results = [_result(0, latency_ms=10.0), _result(1, reachable=False, latency_ms=900.0),
+               _result(2, latency_ms=10.0), _result(3, latency_ms=10.0)]
+    assert _run(detector, results) == []
+    # 워밍업(3개)이 끝난 뒤의 첫 결과라 바로 판정됨
+    assert _run(detector, [_result(4, latency_ms=20.0)]) == [(0, EVENT_OPENED, INCIDENT_LATENCY)]
+
+
+def test_throughput_drop_and_recovery():
+    """기준 속도보다 throughput_drop 이상 떨어지면 시작하고, recovery_threshold번 연속 회복하면 종료합니다."""
+    detector = Detector(throughput_drop=0.5, recovery_threshold=2, ewma_alpha=0.1)
+    speeds = [
+        100.0,  # 첫 결과는 기준값으로만 사용
+        40.0,   # 기준이 하나뿐이라 아직 판정하지 않음 (기준 94)
+        100.0,
+        40.0,   # 기준 약 94.6의 절반 미만: 시작
+        60.0,   # 회복 1
+        30.0,   # 다시 하락: 회복 횟수 초기화
+        60.0,
+        60.0,   # 회복 2: 종료
+    ]
+    results = [_result(i, download_mbps=speed, check_type="speed_test", target="speedtest")
+               for i, speed in enumerate(speeds)]
+    assert _run(detector, results) == [
+        (3, EVENT_OPENED, INCIDENT_THROUGHPUT),
+        (7, EVENT_CLOSED, INCIDENT_THROUGHPUT),
+    ]
+
+
+def test_series_are_independent():
+    """대상(check_type, target)마다 따로 셉니다."""
+    detector = Detector(failure_threshold=2)
+    results = [
+        _result(0, reachable=False, target="a"),
+        _result(1, reachable=False, target="b"),
+        _result(2, reachable=False, target="a"),
+    ]
+    assert _run(detector, results) == [(2, EVENT_OPENED, INCIDENT_OUTAGE)]
+    assert [incident.target for incident in detector.open_incidents()] == ["a"]
+
+
+def test_speed_test_outage_closes_on_success_from_server():
+    """실패(대상 "unknown") 뒤에 서버 호스트로 기록된 성공이 와도 같은 속도 테스트 장애를 종료합니다."""
+    detector = Detector(failure_threshold=3, recovery_threshold=2)
+    results = [_result(i, reachable=False, check_type="speed_test", target="unknown") for i in range(4)]
+    results += [_result(4 + i, download_mbps=100.0, check_type="speed_test", target="speedtest.example.net")
+                for i in range(6)]
+
+    assert _run(detector, results) == [
+        (2, EVENT_OPENED, INCIDENT_OUTAGE),
+        (5, EVENT_CLOSED, INCIDENT_OUTAGE),
+    ]
+    assert not detector.open_incidents()
+
+
+class _BrokenSink(AlertSink):
+    name = "broken"
+
+    def send(self, event):
+        raise RuntimeError("webhook down")
+
+
+def test_dispatcher_delivers_in_order_despite_failing_sink():
+    """한 싱크가 실패해도 다른 싱크는 모든 이벤트를 순서대로 받고, start() 전에 쌓인 이벤트도 전달됩니다."""
+    detector = Detector(failure_threshold=1, recovery_threshold=1)
+    memory = MemorySink()
+    dispatcher = AlertDispatcher([_BrokenSink(), memory])
+
+    for result in [_result(0, reachable=False), _result(1), _result(2, reachable=False)]:
+        for event in detector.process(result):
+            dispatcher.emit(event)
+    dispatcher.start()
+    dispatcher.stop()
+
+    assert [(event.event, event.incident.kind) for event in memory.events] == [
+        (EVENT_OPENED, INCIDENT_OUTAGE), (EVENT_CLOSED, INCIDENT_OUTAGE), (EVENT_OPENED, INCIDENT_OUTAGE),
+    ]
+    assert memory.events[0].incident is memory.events[1].incident
+    assert memory.events[2].incident is not memory.events[0].incident
+    assert memory.events[0].describe() == "[장애 시작] outage router/192.168.0.1: 1회 연속 실패: timeout"
+
+
+def test_dispatcher_drops_when_queue_full():
+    """큐가 가득 차면 체크 스레드를 막지 않고 이벤트를 버립니다."""
+    detector = Detector(failure_threshold=1, recovery_threshold=1)
+    memory = MemorySink()
+    dispatcher = AlertDispatcher([memory], max_queue=2)
+
+    for index in range(4):
+        for event in detector.process(_result(index, reachable=index % 2 == 1)):
+            dispatcher.emit(event)
+    dispatcher.start()
+    dispatcher.stop()
+
+    assert [event.event for event in memory.events] == [EVENT_OPENED, EVENT_CLOSED]
+
+
+def main():
+    """메인 테스트 함수"""
+    tests = [value for name, value in sorted(globals().items()) if name.startswith("test_")]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"[SUCCESS] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"[ERROR] {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} 통과")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
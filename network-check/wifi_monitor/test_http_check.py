@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+HTTP 단계별 체크(check_http) 테스트 스크립트 (로컬 가짜 서버 사용, 인터넷 연결 불필요)
+"""
+import sys
+import os
+import socket
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from checks.http_check import HTTP_CONNECT, HTTP_DNS, HTTP_TLS, HTTP_TTFB, check_http
+
+
+class ScriptedServer:
+    """
+    요청마다 정해 둔 응답을 순서대로 돌려주는 HTTP 서버입니다.
+
+    responses는 (응답 바이트, 보낸 뒤 연결을 닫을지)의 리스트이며, 몇 번 연결을 받았는지와
+    받은 요청 줄을 기록합니다. eager=True면 요청을 기다리지 않고 연결되자마자 응답합니다.
+    """
+
+    def __init__(self, responses, eager=False):
+        self.responses = list(responses)
+        self.eager = eager
+        self.connections = 0
+        self.requests = []
+        self._sock = socket.socket()
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen()
+        self.port = self._sock.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def url(self, path, scheme="http"):
+        return f"{scheme}://127.0.0.1:{self.port}{path}"
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        buffer = b""
+        with conn:
+            while self.responses:
+                while not self.eager and b"\r\n\r\n" not in buffer:
+                    data = conn.recv(4096)
+                    if not data:
+                        return
+                    buffer += data
+                if not self.eager:
+                    request, buffer = buffer.split(b"\r\n\r\n", 1)
+                    self.requests.append(request.split(b"\r\n", 1)[0].decode())
+                response, close = self.responses.pop(0)
+                conn.sendall(response)
+                if close:
+                    return
+
+    def close(self):
+        self._sock.close()
+
+
+def _rows(results, check_type):
+    return [result for result in results if result.check_type == check_type]
+
+
+def _check(server, paths, scheme="http"):
+    try:
+        return check_http([server.url(path, scheme) for path in paths], timeout=2.0)
+    finally:
+        server.close()
+
+
+def test_keep_alive_reuses_connection():
+    """같은 origin의 URL들은 연결 하나로 요청하고 연결/TTFB 행을 나눠 남깁니다."""
+    server = ScriptedServer([
+        (b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok", False),
+        (b"HTTP/1.1 204 No Content\r\n\r\n", False),
+    ])
+    results = _check(server, ["/a", "/b"])
+
+    assert server.connections == 1
+    assert server.requests == ["GET /a HTTP/1.1", "GET /b HTTP/1.1"]
+    assert not _rows(results, HTTP_DNS)  # IP 주소는 조회하지 않음
+    assert not _rows(results, HTTP_TLS)
+    connect = _rows(results, HTTP_CONNECT)
+    assert len(connect) == 1 and connect[0].reachable and connect[0].latency_ms is not None
+    ttfb = _rows(results, HTTP_TTFB)
+    assert [row.target for row in ttfb] == [server.url("/a"), server.url("/b")]
+    assert all(row.reachable and row.error_message is None for row in ttfb)
+
+
+def test_http10_without_keep_alive_reconnects():
+    """keep-alive를 밝히지 않은 HTTP/1.0 응답 뒤에는 새 연결로 다음 URL을 요청합니다."""
+    server = ScriptedServer([
+        (b"HTTP/1.0 200 OK\r\nContent-Length: 2\r\n\r\nok", True),
+        (b"HTTP/1.0 200 OK\r\nContent-Length: 2\r\n\r\nok", True),
+    ])
+    results = _check(server, ["/a", "/b"])
+
+    assert server.connections == 2
+    assert len(_rows(results, HTTP_CONNECT)) == 1
+    assert all(row.reachable for row in _rows(results, HTTP_TTFB))
+
+
+def test_chunked_body_is_drained():
+    """chunked 본문과 트레일러를 끝까지 읽어 연결을 재사용합니다."""
+    server = ScriptedServer([
+        (b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+         b"2\r\nok\r\n3\r\nabc\r\n0\r\nX-Trailer: 1\r\n\r\n", False),
+        (b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n", False),
+    ])
+    results = _check(server, ["/a", "/b"])
+
+    assert server.connections == 1
+    assert all(row.reachable for row in _rows(results, HTTP_TTFB))
+
+
+def test_interim_1xx_responses_are_skipped():
+    """103 Early Hints 같은 1xx 응답은 건너뛰고 최종 응답의 상태 코드를 기록합니다."""
+    server = ScriptedServer([
+        (b"HTTP/1.1 103 Early Hints\r\nLink: </a.css>\r\n\r\n"
+         b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok", False),
+        (b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n", False),
+        (b"HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\n\r\n", False),
+    ])
+    results = _check(server, ["/a", "/b", "/c"])
+
+    assert server.connections == 1
+    ttfb = _rows(results, HTTP_TTFB)
+    assert [(row.reachable, row.error_message) for row in ttfb] == [
+        (True, None), (True, "HTTP 404"), (False, "HTTP 503"),
+    ]
+
+
+def test_header_less_response():
+    """헤더가 하나도 없는 응답(상태 줄 바로 뒤 빈 줄)도 정상 응답으로 기록합니다."""
+    server = ScriptedServer([(b"HTTP/1.0 200 OK\r\n\r\nhello", True)])
+    results = _check(server, ["/"])
+
+    ttfb = _rows(results, HTTP_TTFB)
+    assert len(ttfb) == 1 and ttfb[0].reachable and ttfb[0].latency_ms is not None
+
+
+def test_tls_failure_keeps_connect_row():
+    """TLS 핸드셰이크가 실패해도 성공한 TCP 연결 행을 남기고 TLS/TTFB는 실패로 기록합니다."""
+    # TLS가 아닌 평문 HTTP 응답을 받으므로 핸드셰이크가 실패함
+    server = ScriptedServer([(b"HTTP/1.1 400 Bad Request\r\n\r\n", True)], eager=True)
+    results = _check(server, ["/a", "/b"], scheme="https")
+
+    connect = _rows(results, HTTP_CONNECT)
+    assert len(connect) == 1 and connect[0].reachable
+    tls = _rows(results, HTTP_TLS)
+    assert len(tls) == 1 and not tls[0].reachable and "TLS" in tls[0].error_message
+    assert tls[0].target == f"127.0.0.1:{server.port}"
+    ttfb = _rows(results, HTTP_TTFB)
+    assert len(ttfb) == 2 and not any(row.reachable for row in ttfb)
+    assert all(row.error_message.startswith(f"{HTTP_TLS} 단계 실패") for row in ttfb)
+
+
+def test_connection_refused():
+    """연결이 거부되면 연결 행과 URL별 TTFB 행을 실패로 기록합니다."""
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+
+    results = check_http([f"http://127.0.0.1:{port}/"], timeout=2.0)
+    connect = _rows(results, HTTP_CONNECT)
+    assert len(connect) == 1 and not connect[0].reachable
+    assert not _rows(results, HTTP_TTFB)[0].reachable
+
+
+def main():
+    """메인 테스트 함수"""
+    tests = [value for name, value in sorted(globals().items()) if name.startswith("test_")]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"[SUCCESS] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"[ERROR] {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} 통과")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
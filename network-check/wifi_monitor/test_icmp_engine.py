@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+ping 엔진(checks/icmp_engine) 테스트 스크립트 (가짜 소켓 사용, root 권한/인터넷 연결 불필요)
+"""
+import sys
+import os
+import asyncio
+import socket
+import struct
+import time
+from unittest import mock
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from checks import icmp_engine
+from checks.icmp_engine import ICMP_ECHO_REPLY, async_ping, ping
+
+
+class StubIcmpSocket:
+    """
+    ICMP 소켓 대신 쓰는 가짜 소켓입니다.
+
+    sendto()로 받은 echo request마다 reply(ident, seq)가 돌려주는 (ident, seq)로 echo reply를 만들어
+    UNIX datagram socketpair로 되돌려 보내므로 이벤트 루프의 add_reader가 실제 소켓처럼 동작합니다.
+    reply가 None을 돌려주면 응답하지 않습니다. raw=True면 응답 앞에 IPv4 헤더를 붙입니다.
+    """
+
+    def __init__(self, ip="127.0.0.1", raw=False, reply=lambda ident, seq: (ident, seq)):
+        self.ip = ip
+        self.raw = raw
+        self.reply = reply
+        self.sent = []
+        self._inside, self._outside = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._inside.setblocking(False)
+
+    def fileno(self):
+        return self._inside.fileno()
+
+    def sendto(self, packet, address):
+        icmp_type, _code, _checksum, ident, seq = struct.unpack("!BBHHH", packet[:8])
+        self.sent.append((icmp_type, ident, seq, address))
+        answer = self.reply(ident, seq)
+        if answer is None:
+            return len(packet)
+        data = struct.pack("!BBHHH", ICMP_ECHO_REPLY, 0, 0, *answer) + packet[8:]
+        if self.raw:
+            data = b"\x45" + bytes(19) + data
+        self._outside.send(data)
+        return len(packet)
+
+    def recvfrom(self, size):
+        return self._inside.recv(size), (self.ip, 0)
+
+    def close(self):
+        self._inside.close()
+        self._outside.close()
+
+
+def _with_socket(stub):
+    return mock.patch.object(icmp_engine, "_open_icmp_socket", return_value=(stub, stub.raw))
+
+
+def _closed_port():
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def test_icmp_replies_matched_by_seq():
+    """보낸 seq마다 응답을 매칭해 RTT를 기록합니다."""
+    stub = StubIcmpSocket()
+    with _with_socket(stub):
+        stats = ping("127.0.0.1", count=3, interval=0.01, timeout=1.0, mode="icmp")
+
+    assert stats["method"] == "icmp"
+    assert stats["sent"] == 3 and stats["received"] == 3 and stats["packet_loss"] == 0.0
+    assert [icmp_type for icmp_type, _, _, _ in stub.sent] == [8, 8, 8]
+    assert all(address == ("127.0.0.1", 0) for _, _, _, address in stub.sent)
+    seqs = [seq for _, _, seq, _ in stub.sent]
+    assert seqs == [(seqs[0] + i) & 0xFFFF for i in range(3)]
+
+
+def test_lost_probes_keep_send_order():
+    """응답이 없는 probe는 전송 순서 그대로 None으로 남습니다."""
+    first = []
+
+    def reply(ident, seq):
+        first.append(seq)
+        return (ident, seq) if len(first) != 2 else None
+
+    with _with_socket(StubIcmpSocket(reply=reply)):
+        stats = ping("127.0.0.1", count=3, interval=0.01, timeout=0.2, mode="icmp")
+
+    assert stats["received"] == 2
+    assert stats["rtts_ms"][1] is None
+    assert stats["rtts_ms"][0] is not None and stats["rtts_ms"][2] is not None
+
+
+def test_timeout_budget():
+    """응답이 없으면 마지막 probe 전송 후 timeout까지만 기다립니다: (count - 1) * interval + timeout."""
+    with _with_socket(StubIcmpSocket(reply=lambda ident, seq: None)):
+        started = time.perf_counter()
+        stats = ping("127.0.0.1", count=3, interval=0.05, timeout=0.2, mode="icmp")
+        elapsed = time.perf_counter() - started
+
+    assert stats["received"] == 0 and stats["packet_loss"] == 1.0
+    assert stats["rtts_ms"] == [None, None, None]
+    assert 0.3 <= elapsed < 0.8
+
+
+def test_all_replies_end_wait_early():
+    """모든 응답을 받으면 timeout을 기다리지 않고 바로 끝냅니다."""
+    with _with_socket(StubIcmpSocket()):
+        started = time.perf_counter()
+        ping("127.0.0.1", count=2, interval=0.01, timeout=5.0, mode="icmp")
+        assert time.perf_counter() - started < 1.0
+
+
+def test_raw_socket_filters_foreign_ident():
+    """raw 소켓은 다른 ping의 응답(id가 다름)을 버리고, IP 헤더가 붙은 응답을 해석합니다."""
+    def foreign(ident, seq):
+        return (ident + 1) & 0xFFFF, seq
+
+    with _with_socket(StubIcmpSocket(raw=True)):
+        assert ping("127.0.0.1", count=2, interval=0.01, timeout=0.5, mode="icmp")["received"] == 2
+    with _with_socket(StubIcmpSocket(raw=True, reply=foreign)):
+        assert ping("127.0.0.1", count=2, interval=0.01, timeout=0.2, mode="icmp")["received"] == 0
+
+
+def test_dgram_socket_accepts_rewritten_ident():
+    """datagram 소켓은 커널이 id를 바꾸므로 id가 달라도 seq로 매칭합니다."""
+    def rewritten(ident, seq):
+        return 0x1234, seq
+
+    with _with_socket(StubIcmpSocket(reply=rewritten)):
+        assert ping("127.0.0.1", count=2, interval=0.01, timeout=0.5, mode="icmp")["received"] == 2
+
+
+def test_replies_from_other_hosts_are_ignored():
+    """다른 주소에서 온 응답은 세지 않습니다."""
+    with _with_socket(StubIcmpSocket(ip="127.0.0.2")):
+        assert ping("127.0.0.1", count=2, interval=0.01, timeout=0.2, mode="icmp")["received"] == 0
+
+
+def test_socket_selection():
+    """권한이 필요 없는 datagram 소켓을 먼저 시도하고, 안 되면 raw 소켓을 시도합니다."""
+    opened = []
+
+    def fake_socket(allowed):
+        def create(family, sock_type, proto):
+            opened.append(sock_type)
+            if sock_type not in allowed:
+                raise PermissionError(1, "Operation not permitted")
+            return mock.Mock()
+        return create
+
+    with mock.patch.object(icmp_engine.socket, "socket", fake_socket({socket.SOCK_DGRAM, socket.SOCK_RAW})):
+        sock, raw = icmp_engine._open_icmp_socket()
+    assert sock is not None and raw is False
+    assert opened == [socket.SOCK_DGRAM]
+    sock.setblocking.assert_called_once_with(False)
+
+    opened.clear()
+    with mock.patch.object(icmp_engine.socket, "socket", fake_socket({socket.SOCK_RAW})):
+        sock, raw = icmp_engine._open_icmp_socket()
+    assert sock is not None and raw is True
+    assert opened == [socket.SOCK_DGRAM, socket.SOCK_RAW]
+
+    with mock.patch.object(icmp_engine.socket, "socket", fake_socket(set())):
+        assert icmp_engine._open_icmp_socket() == (None, False)
+
+
+def test_icmp_mode_without_socket_raises():
+    """mode="icmp"인데 ICMP 소켓을 열 수 없으면 TCP로 바꾸지 않고 PermissionError를 냅니다."""
+    with mock.patch.object(icmp_engine, "_open_icmp_socket", return_value=(None, False)):
+        try:
+            ping("127.0.0.1", count=1, mode="icmp")
+        except PermissionError:
+            return
+    raise AssertionError("PermissionError가 발생하지 않았습니다")
+
+
+def test_tcp_fallback_counts_refused_as_reply():
+    """ICMP 소켓이 없으면 TCP 연결 시간으로 재고, 연결 거부(RST)도 응답으로 셉니다."""
+    port = _closed_port()
+    with mock.patch.object(icmp_engine, "_open_icmp_socket", return_value=(None, False)):
+        stats = ping("127.0.0.1", count=3, interval=0.01, timeout=1.0, tcp_port=port)
+
+    assert stats["method"] == "tcp"
+    assert stats["received"] == 3 and stats["packet_loss"] == 0.0
+    assert all(rtt is not None and rtt >= 0 for rtt in stats["rtts_ms"])
+
+
+def test_tcp_probe_accepts_open_port():
+    """열린 포트는 연결이 맺어질 때까지의 시간을 잽니다."""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+    try:
+        stats = ping("127.0.0.1", count=2, interval=0.01, timeout=1.0, mode="tcp",
+                     tcp_port=server.getsockname()[1])
+    finally:
+        server.close()
+    assert stats["method"] == "tcp" and stats["received"] == 2
+
+
+def test_tcp_probe_timeout_is_loss():
+    """제한 시간 안에 연결되지 않으면 손실로 셉니다."""
+    async def never_connects(*args, **kwargs):
+        await asyncio.sleep(10)
+
+    with mock.patch.object(icmp_engine.asyncio, "open_connection", never_connects):
+        started = time.perf_counter()
+        stats = asyncio.run(async_ping("127.0.0.1", count=2, interval=0.01, timeout=0.1, mode="tcp"))
+    assert stats["received"] == 0 and stats["packet_loss"] == 1.0
+    assert time.perf_counter() - started < 1.0
+
+
+def main():
+    """메인 테스트 함수"""
+    tests = [value for name, value in sorted(globals().items()) if name.startswith("test_")]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"[SUCCESS] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"[ERROR] {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} 통과")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Dict, Any
+
+from checks.result import as_result
+from utils.scheduler import FixedRateScheduler
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveInterval:
+    """
+    결과 상태에 따라 작업 주기를 조절합니다.
+
+    한 틱의 결과 중 하나라도 실패했거나 손실률/응답시간이 임계값을 넘으면 주기를
+    fast_interval로 바로 줄이고, recovery_ticks틱 연속 정상이면 주기를 두 배씩 늘려
+    base_interval로 돌아갑니다. 최근 1시간 동안 실행한 틱 수가 hourly_budget에
+    닿으면 더 이상 주기를 줄이지 않고 base_interval로 되돌립니다.
+
+    한도는 결과 행이 아니라 틱 단위로 셉니다. 틱마다 PROBE_TARGETS 수만큼 결과가 나오므로
+    행으로 세면 대상이 많을수록 한도가 기본 주기만으로도 소진되기 때문입니다.
+    """
+
+    def __init__(self, scheduler: FixedRateScheduler, job_name: str, base_interval: float,
+                 fast_interval: float = 5.0, loss_threshold: float = 0.2,
+                 latency_threshold_ms: float = 100.0, recovery_ticks: int = 6,
+                 hourly_budget: int = 720):
+        self.scheduler = scheduler
+        self.job_name = job_name
+        self.base_interval = base_interval
+        self.fast_interval = min(fast_interval, base_interval)
+        self.loss_threshold = loss_threshold
+        self.latency_threshold_ms = latency_threshold_ms
+        self.recovery_ticks = recovery_ticks
+        self.hourly_budget = hourly_budget
+
+        self._lock = threading.Lock()
+        self._tick_unhealthy = False
+        self._healthy_ticks = 0
+        self._ticks = deque()  # 최근 1시간 동안 끝난 틱의 시각 (monotonic)
+        self._budget_logged = False
+
+    def _is_unhealthy(self, result) -> bool:
+        if not result.reachable:
+            return True
+        if result.packet_loss is not None and result.packet_loss >= self.loss_threshold:
+            return True
+        return result.latency_ms is not None and result.latency_ms >= self.latency_threshold_ms
+
+    def observe(self, result) -> None:
+        """현재 틱의 결과 하나를 반영합니다."""
+        result = as_result(result)
+        with self._lock:
+            if self._is_unhealthy(result):
+                self._tick_unhealthy = True
+
+    def _budget_used(self, now: float) -> int:
+        while self._ticks and self._ticks[0] < now - 3600:
+            self._ticks.popleft()
+        return len(self._ticks)
+
+    def end_tick(self) -> float:
+        """
+        틱이 끝났을 때 호출합니다. 다음 주기를 정해 스케줄러에 반영하고 반환합니다.
+        """
+        with self._lock:
+            unhealthy = self._tick_unhealthy
+            self._tick_unhealthy = False
+            now = time.monotonic()
+            self._ticks.append(now)
+            used = self._budget_used(now)
+            current = self.scheduler.get_interval(self.job_name)
+
+            if used >= self.hourly_budget:
+                interval = self.base_interval
+                if current < interval:
+                    logger.warning(f"[{self.job_name}] 시간당 틱 한도({self.hourly_budget}회)에 도달해 "
+                                   f"주기를 {interval:g}초로 되돌립니다")
+                    self._budget_logged = True
+                elif unhealthy and not self._budget_logged:
+                    # 이상이 보이는데 한도 때문에 주기를 줄이지 못하는 경우 (한도가 풀릴 때까지 한 번만 기록)
+                    logger.warning(f"[{self.job_name}] 이상 감지, 시간당 틱 한도({self.hourly_budget}회)에 "
+                                   f"도달해 주기를 {interval:g}초로 유지합니다")
+                    self._budget_logged = True
+            elif unhealthy:
+                self._budget_logged = False
+                self._healthy_ticks = 0
+                interval = self.fast_interval
+                if current > interval:
+                    logger.warning(f"[{self.job_name}] 이상 감지, 체크 주기를 {interval:g}초로 줄입니다")
+            else:
+                self._budget_logged = False
+                self._healthy_ticks += 1
+                interval = current
+                if current < self.base_interval and self._healthy_ticks >= self.recovery_ticks:
+                    self._healthy_ticks = 0
+                    interval = min(self.base_interval, current * 2)
+                    logger.info(f"[{self.job_name}] 정상 상태가 유지되어 체크 주기를 {interval:g}초로 늘립니다")
+
+        self.scheduler.set_interval(self.job_name, interval)
+        return interval
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "interval_seconds": self.scheduler.get_interval(self.job_name),
+                "ticks_last_hour": self._budget_used(time.monotonic()),
+                "hourly_budget": self.hourly_budget,
+            }
@@ -0,0 +1,111 @@
+import json
+import logging
+import queue
+import threading
+from typing import List, Optional
+
+from utils.detector import IncidentEvent
+
+logger = logging.getLogger(__name__)
+
+
+class AlertSink:
+    """장애 이벤트를 받는 싱크의 기본 클래스. send()를 구현하면 됩니다."""
+
+    name = "sink"
+
+    def send(self, event: IncidentEvent) -> None:
+        raise NotImplementedError
+
+
+class LogSink(AlertSink):
+    """장애 이벤트를 로그로 남깁니다."""
+
+    name = "log"
+
+    def send(self, event: IncidentEvent) -> None:
+        logger.warning(f"알림: {event.describe()}")
+
+
+class MemorySink(AlertSink):
+    """받은 이벤트를 메모리에 보관합니다 (테스트/로컬 확인용)."""
+
+    name = "memory"
+
+    def __init__(self):
+        self.events: List[IncidentEvent] = []
+
+    def send(self, event: IncidentEvent) -> None:
+        self.events.append(event)
+
+
+class WebhookSink(AlertSink):
+    """장애 이벤트를 JSON으로 POST합니다 (Slack 호환 "text" 필드 포함)."""
+
+    name = "webhook"
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, event: IncidentEvent) -> None:
+        # urllib.request(http.client, ssl 포함)는 웹훅을 설정했을 때만 불러옵니다
+        import urllib.request
+
+        payload = event.to_dict()
+        payload["text"] = event.describe()
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        request = urllib.request.Request(self.url, data=body, method="POST",
+                                         headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class AlertDispatcher:
+    """
+    장애 이벤트를 별도 스레드에서 각 싱크로 보냅니다.
+
+    웹훅이 느리거나 DB가 끊겨 있어도 체크 스레드는 기다리지 않습니다.
+    start() 전에 emit()된 이벤트는 큐에 쌓였다가 시작 후 전달됩니다.
+    """
+
+    def __init__(self, sinks: Optional[List[AlertSink]] = None, max_queue: int = 1000):
+        self.sinks: List[AlertSink] = list(sinks or [])
+        self._queue: "queue.Queue[Optional[IncidentEvent]]" = queue.Queue(max_queue)
+        self._thread: Optional[threading.Thread] = None
+
+    def add_sink(self, sink: AlertSink) -> None:
+        self.sinks.append(sink)
+
+    def emit(self, event: IncidentEvent) -> None:
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            logger.warning(f"알림 큐가 가득 차 이벤트를 버립니다: {event.describe()}")
+
+    def dispatch(self, event: IncidentEvent) -> None:
+        """이벤트를 모든 싱크로 보냅니다. 한 싱크의 실패가 다른 싱크를 막지 않습니다."""
+        for sink in self.sinks:
+            try:
+                sink.send(event)
+            except Exception as e:
+                logger.error(f"알림 전송 실패 ({sink.name}): {e}")
+
+    def _run(self) -> None:
+        while True:
+            event = self._queue.get()
+            if event is None:
+                return
+            self.dispatch(event)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="alert-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """큐에 남은 이벤트를 보낸 뒤 스레드를 멈춥니다."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
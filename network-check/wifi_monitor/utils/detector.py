@@ -0,0 +1,237 @@
+import math
+import threading
+import uuid
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+from checks.result import as_result
+
+# 장애 유형
+INCIDENT_OUTAGE = "outage"          # 연속 실패
+INCIDENT_LATENCY = "latency"        # 응답시간 상승 (EWMA 기준 CUSUM)
+INCIDENT_THROUGHPUT = "throughput"  # 속도 하락
+
+# 대상이 결과마다 달라지는 체크 유형: 대상과 관계없이 하나의 상태로 봅니다
+# (속도 테스트는 성공하면 선택된 서버 호스트, 실패하면 "unknown"을 대상으로 기록함)
+_SINGLE_SERIES_CHECKS = frozenset({"speed_test"})
+
+EVENT_OPENED = "opened"
+EVENT_CLOSED = "closed"
+
+
+class Incident:
+    """감지된 장애 하나 (network_incidents의 한 행)."""
+
+    __slots__ = ("incident_id", "kind", "check_type", "target", "started_at", "ended_at",
+                 "sample_count", "details")
+
+    def __init__(self, kind: str, check_type: str, target: str, started_at: datetime, details: str):
+        self.incident_id = str(uuid.uuid4())
+        self.kind = kind
+        self.check_type = check_type
+        self.target = target
+        self.started_at = started_at
+        self.ended_at: Optional[datetime] = None
+        self.sample_count = 0
+        self.details = details
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class IncidentEvent:
+    """장애 시작/종료 이벤트 (알림 싱크로 전달됩니다)."""
+
+    __slots__ = ("event", "incident", "timestamp")
+
+    def __init__(self, event: str, incident: Incident, timestamp: datetime):
+        self.event = event
+        self.incident = incident
+        self.timestamp = timestamp
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = self.incident.to_dict()
+        data["event"] = self.event
+        data["timestamp"] = self.timestamp
+        return data
+
+    def describe(self) -> str:
+        incident = self.incident
+        if self.event == EVENT_OPENED:
+            return f"[장애 시작] {incident.kind} {incident.check_type}/{incident.target}: {incident.details}"
+        duration = (incident.ended_at - incident.started_at).total_seconds() if incident.ended_at else 0
+        return (f"[장애 종료] {incident.kind} {incident.check_type}/{incident.target}: "
+                f"{duration:.0f}초, 결과 {incident.sample_count}건")
+
+
+class _SeriesState:
+    """대상 하나의 감지 상태. 결과마다 상수 시간으로 갱신됩니다."""
+
+    __slots__ = ("failures", "successes", "outage",
+                 "latency_count", "latency_mean", "latency_var", "cusum", "latency_ok", "latency",
+                 "throughput_count", "throughput_mean", "throughput_ok", "throughput")
+
+    def __init__(self):
+        self.failures = 0
+        self.successes = 0
+        self.outage: Optional[Incident] = None
+
+        self.latency_count = 0
+        self.latency_mean = 0.0
+        self.latency_var = 0.0
+        self.cusum = 0.0
+        self.latency_ok = 0
+        self.latency: Optional[Incident] = None
+
+        self.throughput_count = 0
+        self.throughput_mean = 0.0
+        self.throughput_ok = 0
+        self.throughput: Optional[Incident] = None
+
+
+class Detector:
+    """
+    체크 결과를 하나씩 받아 장애 시작/종료를 감지합니다.
+
+    - 연속 실패: failure_threshold번 연속 실패하면 outage 시작, recovery_threshold번 연속 성공하면 종료
+    - 응답시간: EWMA 평균/분산을 기준으로 단측 CUSUM이 cusum_h 표준편차를 넘으면 latency 시작
+    - 속도: 다운로드 속도가 EWMA 기준보다 throughput_drop 비율 이상 낮으면 throughput 시작
+
+    상태는 (check_type, target)마다 따로 두되, 속도 테스트는 서버가 바뀌어도 check_type 하나로 봅니다.
+    장애가 열려 있는 동안에는 기준값을 갱신하지 않아 나빠진 상태에 적응하지 않습니다.
+    대상마다 숫자 몇 개만 보관하므로 체크 주기를 올려도 비용은 결과 수에 비례할 뿐입니다.
+    """
+
+    def __init__(self, failure_threshold: int = 3, recovery_threshold: int = 2,
+                 ewma_alpha: float = 0.1, cusum_k: float = 0.5, cusum_h: float = 5.0,
+                 min_std_ms: float = 1.0, warmup: int = 10, throughput_drop: float = 0.5):
+        self.failure_threshold = failure_threshold
+        self.recovery_threshold = recovery_threshold
+        self.ewma_alpha = ewma_alpha
+        self.cusum_k = cusum_k
+        self.cusum_h = cusum_h
+        self.min_std_ms = min_std_ms
+        self.warmup = warmup
+        self.throughput_drop = throughput_drop
+        self._lock = threading.Lock()
+        self._states: Dict[Tuple[str, str], _SeriesState] = {}
+
+    def open_incidents(self) -> List[Incident]:
+        """현재 진행 중인 장애 목록"""
+        with self._lock:
+            return [incident for state in self._states.values()
+                    for incident in (state.outage, state.latency, state.throughput) if incident is not None]
+
+    def process(self, result) -> List[IncidentEvent]:
+        """결과 하나를 반영하고 새로 생긴 장애 시작/종료 이벤트를 반환합니다."""
+        result = as_result(result)
+        if result.check_type in _SINGLE_SERIES_CHECKS:
+            key = (result.check_type, "")
+        else:
+            key = (result.check_type, result.target)
+        timestamp = result.timestamp if isinstance(result.timestamp, datetime) else datetime.now()
+
+        events: List[IncidentEvent] = []
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                state = self._states[key] = _SeriesState()
+
+            self._update_outage(state, result, timestamp, events)
+            if result.reachable and result.latency_ms is not None:
+                self._update_latency(state, result, result.latency_ms, timestamp, events)
+            if result.reachable and result.download_mbps is not None:
+                self._update_throughput(state, result, result.download_mbps, timestamp, events)
+
+            for incident in (state.outage, state.latency, state.throughput):
+                if incident is not None:
+                    incident.sample_count += 1
+        return events
+
+    def _open(self, kind: str, result, timestamp: datetime, details: str,
+              events: List[IncidentEvent]) -> Incident:
+        incident = Incident(kind, result.check_type, result.target, timestamp, details)
+        events.append(IncidentEvent(EVENT_OPENED, incident, timestamp))
+        return incident
+
+    def _close(self, incident: Incident, timestamp: datetime, events: List[IncidentEvent]) -> None:
+        incident.ended_at = timestamp
+        events.append(IncidentEvent(EVENT_CLOSED, incident, timestamp))
+
+    def _update_outage(self, state: _SeriesState, result, timestamp: datetime,
+                       events: List[IncidentEvent]) -> None:
+        if result.reachable:
+            state.failures = 0
+            state.successes += 1
+            if state.outage is not None and state.successes >= self.recovery_threshold:
+                self._close(state.outage, timestamp, events)
+                state.outage = None
+        else:
+            state.successes = 0
+            state.failures += 1
+            if state.outage is None and state.failures >= self.failure_threshold:
+                state.outage = self._open(
+                    INCIDENT_OUTAGE, result, timestamp,
+                    f"{state.failures}회 연속 실패: {result.error_message}", events
+                )
+
+    def _update_latency(self, state: _SeriesState, result, value: float, timestamp: datetime,
+                        events: List[IncidentEvent]) -> None:
+        if state.latency_count < self.warmup:
+            # 초기 기준값은 단순 누적 평균/분산 (Welford)
+            state.latency_count += 1
+            delta = value - state.latency_mean
+            state.latency_mean += delta / state.latency_count
+            state.latency_var += (delta * (value - state.latency_mean) - state.latency_var) / state.latency_count
+            return
+
+        std = max(math.sqrt(state.latency_var), self.min_std_ms)
+        excess = (value - state.latency_mean) / std - self.cusum_k
+        state.cusum = max(0.0, state.cusum + excess)
+
+        if state.latency is None:
+            if state.cusum > self.cusum_h:
+                state.latency = self._open(
+                    INCIDENT_LATENCY, result, timestamp,
+                    f"응답시간 {value:.2f}ms (기준 {state.latency_mean:.2f}±{std:.2f}ms)", events
+                )
+                state.latency_ok = 0
+                return
+            # 정상일 때만 기준값을 갱신합니다
+            alpha = self.ewma_alpha
+            delta = value - state.latency_mean
+            state.latency_mean += alpha * delta
+            state.latency_var = (1 - alpha) * (state.latency_var + alpha * delta * delta)
+        else:
+            if excess <= 0:
+                state.latency_ok += 1
+            else:
+                state.latency_ok = 0
+            if state.latency_ok >= self.recovery_threshold:
+                self._close(state.latency, timestamp, events)
+                state.latency = None
+                state.cusum = 0.0
+
+    def _update_throughput(self, state: _SeriesState, result, value: float, timestamp: datetime,
+                           events: List[IncidentEvent]) -> None:
+        if state.throughput_count == 0:
+            state.throughput_count = 1
+            state.throughput_mean = value
+            return
+
+        floor = state.throughput_mean * (1 - self.throughput_drop)
+        if state.throughput is None:
+            if state.throughput_count >= 2 and value < floor:
+                state.throughput = self._open(
+                    INCIDENT_THROUGHPUT, result, timestamp,
+                    f"다운로드 {value:.2f}Mbps (기준 {state.throughput_mean:.2f}Mbps)", events
+                )
+                state.throughput_ok = 0
+                return
+            state.throughput_count += 1
+            state.throughput_mean += self.ewma_alpha * (value - state.throughput_mean)
+        else:
+            state.throughput_ok = state.throughput_ok + 1 if value >= floor else 0
+            if state.throughput_ok >= self.recovery_threshold:
+                self._close(state.throughput, timestamp, events)
+                state.throughput = None
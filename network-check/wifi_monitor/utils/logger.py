@@ -1,19 +1,141 @@
+import atexit
+import gzip
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import shutil
 import sys
+from datetime import datetime
+
+from config import (
+    LOG_FILE, LOG_LEVEL, LOG_FORMAT, LOG_MAX_BYTES, LOG_BACKUP_COUNT,
+    LOG_ROTATE_WHEN, LOG_COMPRESS, LOG_QUEUE_SIZE,
+)
+
+TEXT_FORMAT = '[%(asctime)s] %(levelname)s - %(message)s'
+
+# LogRecord 기본 속성 (나머지는 extra로 넘어온 필드로 보고 JSON에 포함)
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener = None
+_queue_handler = None
+
+
+def _json_default(value):
+    # CheckResult 등 to_dict()가 있는 객체는 필드별로 기록합니다
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    return str(value)
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    한 줄에 JSON 객체 하나를 쓰는 포맷터입니다.
+
+    logger.info(..., extra={"probe": result})처럼 넘긴 필드도 그대로 포함됩니다.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=_json_default)
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """큐가 가득 차면 기다리지 않고 레코드를 버립니다 (체크 스레드가 디스크 I/O에 막히지 않도록)."""
+
+    dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _gzip_namer(name: str) -> str:
+    return name + ".gz"
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+def _build_file_handler() -> logging.Handler:
+    if LOG_ROTATE_WHEN:
+        handler = logging.handlers.TimedRotatingFileHandler(
+            LOG_FILE, when=LOG_ROTATE_WHEN, backupCount=LOG_BACKUP_COUNT, encoding='utf-8'
+        )
+    else:
+        handler = logging.handlers.RotatingFileHandler(
+            LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8'
+        )
+    if LOG_COMPRESS:
+        handler.namer = _gzip_namer
+        handler.rotator = _gzip_rotator
+    return handler
+
 
 def setup_logger():
     """
     로깅 설정을 초기화합니다.
-    
+
+    로그 레코드는 큐에 넣기만 하고, 콘솔/파일 출력은 QueueListener 스레드가 담당합니다.
+    파일은 크기(LOG_MAX_BYTES) 또는 시간(LOG_ROTATE_WHEN) 기준으로 교체되며
+    LOG_BACKUP_COUNT개까지만 보관하므로 SD 카드 사용량이 제한됩니다.
+    여러 번 호출해도 한 번만 설정됩니다.
+
     Returns:
         logging.Logger: 설정된 로거 인스턴스
     """
-    logging.basicConfig(
-        level=logging.INFO,
-        format='[%(asctime)s] %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler('wifi_monitor.log', encoding='utf-8')
-        ]
-    )
+    global _listener, _queue_handler
+
+    if _listener is None:
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        file_handler = _build_file_handler()
+        file_handler.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT))
+
+        log_queue = queue.Queue(LOG_QUEUE_SIZE)
+        _queue_handler = _DroppingQueueHandler(log_queue)
+        _listener = logging.handlers.QueueListener(
+            log_queue, stream_handler, file_handler, respect_handler_level=True
+        )
+        _listener.start()
+        atexit.register(shutdown_logger)
+
+        root = logging.getLogger()
+        root.setLevel(LOG_LEVEL)
+        root.addHandler(_queue_handler)
+
     return logging.getLogger(__name__)
+
+
+def shutdown_logger() -> None:
+    """큐에 남은 로그를 모두 기록하고 리스너 스레드를 멈춥니다."""
+    global _listener, _queue_handler
+
+    if _listener is None:
+        return
+    logging.getLogger().removeHandler(_queue_handler)
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    if _queue_handler.dropped:
+        print(f"로그 큐가 가득 차 {_queue_handler.dropped}건의 로그를 버렸습니다", file=sys.stderr)
+    _listener = None
+    _queue_handler = None
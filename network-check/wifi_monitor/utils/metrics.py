@@ -0,0 +1,310 @@
+import logging
+import math
+import threading
+from typing import TYPE_CHECKING, Callable, Dict, Any, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+from checks.result import as_result
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+# 응답 시간(ms)과 작업 시간(초) 히스토그램 버킷
+LATENCY_MS_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+DURATION_SECONDS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+class _Metric:
+    """라벨별 값을 메모리에 보관하는 메트릭의 공통 부분"""
+
+    metric_type = "untyped"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+        self._values: Dict[tuple, Any] = {}
+
+    def _key(self, labels: Dict[str, Any]) -> tuple:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name}: 라벨은 {self.label_names}이어야 합니다 (받은 값: {tuple(labels)})")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def _label_text(self, key: tuple, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+        pairs = list(zip(self.label_names, key)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.metric_type}"]
+        lines.extend(self._samples())
+        return lines
+
+
+class Counter(_Metric):
+    metric_type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{self._label_text(key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(_Metric):
+    metric_type = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{self._label_text(key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram(_Metric):
+    metric_type = "histogram"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DURATION_SECONDS_BUCKETS):
+        super().__init__(name, help_text, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [버킷별 개수..., 합계, 개수]
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+
+        lines = []
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{self._label_text(key, (('le', _format_value(bound)),))} {cumulative}")
+            lines.append(f"{self.name}_bucket{self._label_text(key, (('le', '+Inf'),))} {state[-1]}")
+            lines.append(f"{self.name}_sum{self._label_text(key)} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{self._label_text(key)} {state[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    메트릭 목록과 수집 콜백을 보관합니다.
+
+    수집 콜백은 render() 직전에 호출되므로 로컬 버퍼 대기 건수처럼 스크랩 시점에
+    읽으면 되는 값은 콜백에서 Gauge를 갱신하면 됩니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"이미 등록된 메트릭입니다: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식으로 모든 메트릭을 반환합니다."""
+        with self._lock:
+            collectors = list(self._collectors)
+            metrics = list(self._metrics.values())
+
+        for collector in collectors:
+            try:
+                collector()
+            except Exception as e:
+                logger.warning(f"메트릭 수집 콜백 오류: {e}")
+
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+PROBE_CHECKS = REGISTRY.register(Counter(
+    "wifi_monitor_checks_total", "체크 실행 횟수", ("check_type", "target", "result")))
+PROBE_REACHABLE = REGISTRY.register(Gauge(
+    "wifi_monitor_reachable", "마지막 체크의 접속 성공 여부 (1/0)", ("check_type", "target")))
+PROBE_LATENCY = REGISTRY.register(Histogram(
+    "wifi_monitor_latency_ms", "응답 시간 (밀리초)", ("check_type", "target"), LATENCY_MS_BUCKETS))
+PROBE_PACKET_LOSS = REGISTRY.register(Gauge(
+    "wifi_monitor_packet_loss_ratio", "마지막 체크의 패킷 손실률 (0.0 ~ 1.0)", ("check_type", "target")))
+PROBE_DOWNLOAD = REGISTRY.register(Gauge(
+    "wifi_monitor_download_mbps", "마지막 다운로드 속도 (Mbps)", ("check_type", "target")))
+PROBE_UPLOAD = REGISTRY.register(Gauge(
+    "wifi_monitor_upload_mbps", "마지막 업로드 속도 (Mbps)", ("check_type", "target")))
+CHECK_DURATION = REGISTRY.register(Histogram(
+    "wifi_monitor_check_duration_seconds", "체크 작업 실행 시간 (초)", ("check_type",)))
+DB_WRITE_SECONDS = REGISTRY.register(Histogram(
+    "wifi_monitor_db_write_seconds", "network_checks 일괄 저장(COPY) 시간 (초)", ("result",)))
+OUTBOX_DEPTH = REGISTRY.register(Gauge(
+    "wifi_monitor_outbox_depth", "로컬 버퍼에서 전송을 기다리는 결과 수"))
+SCHEDULER_LATENESS = REGISTRY.register(Gauge(
+    "wifi_monitor_scheduler_lateness_seconds", "작업의 최근 실행 지연 (초)", ("job",)))
+SCHEDULER_MAX_LATENESS = REGISTRY.register(Gauge(
+    "wifi_monitor_scheduler_max_lateness_seconds", "작업의 최대 실행 지연 (초)", ("job",)))
+SCHEDULER_INTERVAL = REGISTRY.register(Gauge(
+    "wifi_monitor_scheduler_interval_seconds", "작업의 현재 실행 주기 (초)", ("job",)))
+SCHEDULER_SKIPPED = REGISTRY.register(Gauge(
+    "wifi_monitor_scheduler_skipped_ticks", "건너뛴 틱 수 (프로세스 시작 이후)", ("job",)))
+STAGE_DURATION = REGISTRY.register(Histogram(
+    "wifi_monitor_stage_duration_seconds", "추적 span 단계별 소요 시간 (초, TRACE_EXPORTERS에 metrics 포함 시)",
+    ("stage",), buckets=(0.001, 0.005, 0.01, 0.025) + DURATION_SECONDS_BUCKETS))
+
+
+def observe_result(result) -> None:
+    """check_router()/check_speed()/check_bandwidth() 결과(CheckResult 또는 dict)를 메트릭에 반영합니다."""
+    result = as_result(result)
+    check_type = result.check_type
+    target = result.target
+    reachable = bool(result.reachable)
+
+    PROBE_CHECKS.inc(check_type=check_type, target=target, result="ok" if reachable else "fail")
+    PROBE_REACHABLE.set(1 if reachable else 0, check_type=check_type, target=target)
+
+    if result.latency_ms is not None:
+        PROBE_LATENCY.observe(result.latency_ms, check_type=check_type, target=target)
+    if result.packet_loss is not None:
+        PROBE_PACKET_LOSS.set(result.packet_loss, check_type=check_type, target=target)
+    if result.download_mbps is not None:
+        PROBE_DOWNLOAD.set(result.download_mbps, check_type=check_type, target=target)
+    if result.upload_mbps is not None:
+        PROBE_UPLOAD.set(result.upload_mbps, check_type=check_type, target=target)
+
+
+def observe_scheduler(stats: Dict[str, Dict[str, Any]]) -> None:
+    """FixedRateScheduler.get_stats() 결과를 메트릭에 반영합니다."""
+    for job, job_stats in stats.items():
+        SCHEDULER_LATENESS.set(job_stats["last_lateness_seconds"], job=job)
+        SCHEDULER_MAX_LATENESS.set(job_stats["max_lateness_seconds"], job=job)
+        SCHEDULER_SKIPPED.set(job_stats["skipped"], job=job)
+        SCHEDULER_INTERVAL.set(job_stats["interval_seconds"], job=job)
+
+
+# 라우트 핸들러: 쿼리 파라미터를 받아 (상태 코드, Content-Type, 본문)을 반환
+RouteHandler = Callable[[Dict[str, List[str]]], Tuple[int, str, bytes]]
+
+
+def _metrics_route(query: Dict[str, List[str]]) -> Tuple[int, str, bytes]:
+    return 200, CONTENT_TYPE_LATEST, REGISTRY.render().encode("utf-8")
+
+
+class MetricsServer:
+    """
+    /metrics를 제공하는 내장 HTTP 서버입니다 (데몬 스레드).
+
+    메모리의 값만 읽으므로 스크랩이 PostgreSQL에 접근하지 않습니다.
+    add_route()로 다른 조회 경로를 추가할 수 있습니다.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9105):
+        self.host = host
+        self.port = port
+        self._routes: Dict[str, RouteHandler] = {"/metrics": _metrics_route}
+        self._server: Optional["ThreadingHTTPServer"] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def add_route(self, path: str, handler: RouteHandler) -> None:
+        self._routes[path] = handler
+
+    def _make_handler(self):
+        # http.server(http.client, email 포함)는 메트릭을 켰을 때만 불러옵니다
+        from http.server import BaseHTTPRequestHandler
+
+        routes = self._routes
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                route = routes.get(parts.path)
+                if route is None:
+                    status, content_type, body = 404, "text/plain; charset=utf-8", b"not found\n"
+                else:
+                    try:
+                        status, content_type, body = route(parse_qs(parts.query))
+                    except Exception as e:
+                        logger.error(f"메트릭 서버 요청 처리 오류 ({parts.path}): {e}")
+                        status, content_type, body = 500, "text/plain; charset=utf-8", b"internal error\n"
+
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # 스크랩마다 접근 로그를 남기지 않습니다
+                pass
+
+        return _Handler
+
+    def start(self) -> None:
+        from http.server import ThreadingHTTPServer
+
+        self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True)
+        self._thread.start()
+        logger.info(f"메트릭 서버 시작: http://{self.host}:{self.port}/metrics")
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,114 @@
+import faulthandler
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SamplingProfiler:
+    """
+    모든 스레드의 스택을 주기적으로 샘플링해 folded stack 파일로 저장합니다.
+
+    cProfile은 자신을 켠 스레드만 보므로, 스케줄러 작업 스레드가 대부분의 일을 하는
+    이 서비스에서는 sys._current_frames()로 전체 스레드를 샘플링합니다. 출력 형식은
+    py-spy record --format raw와 같은 "스레드;함수 (파일:줄);... 개수"라서
+    flamegraph.pl, speedscope, inferno에 그대로 넣을 수 있습니다.
+    """
+
+    def __init__(self, output_dir: str = ".", duration: float = 30.0, hz: float = 100.0):
+        self.output_dir = output_dir
+        self.duration = duration
+        self.interval = 1.0 / hz if hz > 0 else 0.01
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        """샘플링을 시작합니다. 이미 실행 중이면 False"""
+        with self._lock:
+            if self.running:
+                return False
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+            return True
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        names = {}
+        stacks: Counter = Counter()
+        samples = 0
+        deadline = time.monotonic() + self.duration
+
+        while time.monotonic() < deadline:
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                parts = []
+                while frame is not None:
+                    code = frame.f_code
+                    parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                parts.append(names.get(ident, str(ident)))
+                stacks[";".join(reversed(parts))] += 1
+            samples += 1
+            time.sleep(self.interval)
+
+        path = os.path.join(self.output_dir, f"wifi_monitor_profile_{time.strftime('%Y%m%d_%H%M%S')}.folded")
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+            logger.info(f"프로파일 저장: {path} (샘플 {samples}회, 스택 {len(stacks)}종)")
+        except OSError as e:
+            logger.error(f"프로파일 저장 실패: {e}")
+
+
+_stack_file = None
+
+
+def install_signal_handlers(profiler: SamplingProfiler, stack_dump_path: str) -> None:
+    """
+    실행 중인 서비스에서 프로파일/스택을 받을 수 있도록 시그널을 등록합니다.
+
+    - SIGUSR1: profiler.duration초 동안 샘플링 후 folded stack 파일 저장
+    - SIGUSR2: 모든 스레드의 현재 스택을 stack_dump_path에 즉시 기록 (faulthandler, 멈춘 경우에도 동작)
+
+    치명적 오류(세그폴트 등) 때의 스택도 같은 파일에 남습니다.
+    메인 스레드에서 호출해야 하며, 시그널이 없는 플랫폼에서는 아무것도 하지 않습니다.
+    """
+    global _stack_file
+
+    if not hasattr(signal, "SIGUSR1"):
+        logger.warning("이 플랫폼에서는 프로파일 시그널을 지원하지 않습니다")
+        return
+
+    def _on_profile_signal(signum, frame):
+        if profiler.start():
+            logger.info(f"프로파일 시작: {profiler.duration:g}초 동안 전체 스레드 샘플링")
+        else:
+            logger.info("프로파일이 이미 실행 중입니다")
+
+    signal.signal(signal.SIGUSR1, _on_profile_signal)
+
+    try:
+        if _stack_file is None:
+            _stack_file = open(stack_dump_path, "a", encoding="utf-8")
+        faulthandler.enable(_stack_file, all_threads=True)
+        faulthandler.register(signal.SIGUSR2, _stack_file, all_threads=True)
+    except OSError as e:
+        logger.warning(f"스택 덤프 파일을 열 수 없습니다 ({stack_dump_path}): {e}")
+        return
+
+    logger.info(f"프로파일 시그널 등록: kill -USR1 {os.getpid()} (샘플링), "
+                f"kill -USR2 {os.getpid()} (스택 덤프 → {stack_dump_path})")
@@ -0,0 +1,208 @@
+import json
+import math
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from typing import Dict, Any, List, Optional, Tuple
+
+from checks.result import as_result
+
+_NAN = float("nan")
+
+
+def _percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    """정렬된 값의 백분위수 (PostgreSQL percentile_cont와 같은 선형 보간)"""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * q
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return sorted_values[lower]
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def _present(values) -> List[float]:
+    return [v for v in values if not math.isnan(v)]
+
+
+class SampleRing:
+    """
+    대상 하나의 최근 체크 결과를 고정 크기 array에 보관하는 링 버퍼입니다.
+
+    값마다 float 하나(8바이트)만 쓰므로 capacity개를 넘으면 가장 오래된 결과를
+    덮어쓰고 메모리는 늘어나지 않습니다. 값이 없으면(None) NaN으로 저장합니다.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.timestamps = array("d", bytes(8 * capacity))
+        self.reachable = array("b", bytes(capacity))
+        self.latency_ms = array("d", bytes(8 * capacity))
+        self.packet_loss = array("d", bytes(8 * capacity))
+        self.download_mbps = array("d", bytes(8 * capacity))
+        self.upload_mbps = array("d", bytes(8 * capacity))
+        self.size = 0
+        self.head = 0  # 다음에 쓸 위치
+
+    def append(self, timestamp: float, reachable: bool, latency_ms: Optional[float],
+               packet_loss: Optional[float], download_mbps: Optional[float], upload_mbps: Optional[float]) -> None:
+        i = self.head
+        self.timestamps[i] = timestamp
+        self.reachable[i] = 1 if reachable else 0
+        self.latency_ms[i] = _NAN if latency_ms is None else latency_ms
+        self.packet_loss[i] = _NAN if packet_loss is None else packet_loss
+        self.download_mbps[i] = _NAN if download_mbps is None else download_mbps
+        self.upload_mbps[i] = _NAN if upload_mbps is None else upload_mbps
+        self.head = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def _ordered(self, column: array) -> array:
+        """오래된 순서로 정렬된 column 복사본"""
+        if self.size < self.capacity:
+            return column[:self.size]
+        return column[self.head:] + column[:self.head]
+
+    def window(self, since: float) -> Dict[str, array]:
+        """since(epoch 초) 이후 결과를 열별 array로 반환합니다."""
+        timestamps = self._ordered(self.timestamps)
+        start = bisect_left(timestamps, since)
+        return {
+            "timestamps": timestamps[start:],
+            "reachable": self._ordered(self.reachable)[start:],
+            "latency_ms": self._ordered(self.latency_ms)[start:],
+            "packet_loss": self._ordered(self.packet_loss)[start:],
+            "download_mbps": self._ordered(self.download_mbps)[start:],
+            "upload_mbps": self._ordered(self.upload_mbps)[start:],
+        }
+
+
+def window_stats(columns: Dict[str, array], ewma_alpha: float = 0.3) -> Dict[str, Any]:
+    """
+    SampleRing.window() 결과의 통계를 계산합니다.
+
+    Returns:
+        {
+            "count": 15, "availability": 0.93, "packet_loss_avg": 0.02,
+            "latency_avg_ms": 3.1, "latency_p50_ms": 2.8, "latency_p95_ms": 6.0, "latency_p99_ms": 7.4,
+            "jitter_ms": 0.9, "latency_ewma_ms": 3.3,
+            "download_mbps": {"last": 94.1, "min": 80.2, "max": 95.0}, "upload_mbps": {...},
+            "first_timestamp": 1761370200.0, "last_timestamp": 1761371100.0
+        }
+    """
+    count = len(columns["timestamps"])
+    stats: Dict[str, Any] = {"count": count}
+    if count == 0:
+        return stats
+
+    stats["availability"] = sum(columns["reachable"]) / count
+    stats["first_timestamp"] = columns["timestamps"][0]
+    stats["last_timestamp"] = columns["timestamps"][-1]
+
+    losses = _present(columns["packet_loss"])
+    stats["packet_loss_avg"] = sum(losses) / len(losses) if losses else None
+
+    latencies = _present(columns["latency_ms"])
+    if latencies:
+        ordered = sorted(latencies)
+        stats["latency_avg_ms"] = sum(latencies) / len(latencies)
+        stats["latency_p50_ms"] = _percentile(ordered, 0.50)
+        stats["latency_p95_ms"] = _percentile(ordered, 0.95)
+        stats["latency_p99_ms"] = _percentile(ordered, 0.99)
+        # 연속한 결과 사이 응답시간 변화량의 평균 (RFC 3550 지터와 같은 개념)
+        stats["jitter_ms"] = (
+            sum(abs(b - a) for a, b in zip(latencies, latencies[1:])) / (len(latencies) - 1)
+            if len(latencies) > 1 else 0.0
+        )
+        ewma = latencies[0]
+        for value in latencies[1:]:
+            ewma += ewma_alpha * (value - ewma)
+        stats["latency_ewma_ms"] = ewma
+    else:
+        for key in ("latency_avg_ms", "latency_p50_ms", "latency_p95_ms", "latency_p99_ms",
+                    "jitter_ms", "latency_ewma_ms"):
+            stats[key] = None
+
+    for column in ("download_mbps", "upload_mbps"):
+        values = _present(columns[column])
+        stats[column] = {"last": values[-1], "min": min(values), "max": max(values)} if values else None
+
+    return stats
+
+
+class RecentSamples:
+    """
+    (check_type, target)별 SampleRing 모음입니다.
+
+    "최근 15분 손실률은?" 같은 질문을 원격 DB 대신 메모리에서 바로 답합니다.
+    """
+
+    def __init__(self, capacity: int = 2048):
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._rings: Dict[Tuple[str, str], SampleRing] = {}
+
+    def add(self, result) -> None:
+        """체크 결과(CheckResult 또는 dict)를 추가합니다."""
+        result = as_result(result)
+        key = (result.check_type, result.target)
+        timestamp = result.timestamp.timestamp() if hasattr(result.timestamp, "timestamp") else time.time()
+        with self._lock:
+            ring = self._rings.get(key)
+            if ring is None:
+                ring = self._rings[key] = SampleRing(self.capacity)
+            ring.append(timestamp, result.reachable, result.latency_ms, result.packet_loss,
+                        result.download_mbps, result.upload_mbps)
+
+    def series(self) -> List[Dict[str, Any]]:
+        """보관 중인 (check_type, target) 목록과 결과 수"""
+        with self._lock:
+            return [{"check_type": check_type, "target": target, "count": ring.size}
+                    for (check_type, target), ring in self._rings.items()]
+
+    def stats(self, check_type: str, target: str, window_seconds: float,
+              ewma_alpha: float = 0.3) -> Optional[Dict[str, Any]]:
+        """최근 window_seconds 동안의 통계. 해당 대상이 없으면 None"""
+        since = time.time() - window_seconds
+        with self._lock:
+            ring = self._rings.get((check_type, target))
+            if ring is None:
+                return None
+            columns = ring.window(since)
+        return window_stats(columns, ewma_alpha)
+
+
+def _json_response(status: int, body: Any) -> Tuple[int, str, bytes]:
+    return status, "application/json; charset=utf-8", json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+
+def make_query_routes(recent: RecentSamples) -> Dict[str, Any]:
+    """
+    MetricsServer.add_route()에 등록할 조회 경로를 만듭니다.
+
+    - /recent/series: 보관 중인 대상 목록
+    - /recent/stats?check_type=router&target=192.168.1.1&window=900: 최근 window초 통계
+    """
+
+    def series_route(query: Dict[str, List[str]]) -> Tuple[int, str, bytes]:
+        return _json_response(200, recent.series())
+
+    def stats_route(query: Dict[str, List[str]]) -> Tuple[int, str, bytes]:
+        check_type = query.get("check_type", ["router"])[0]
+        target = query.get("target", [None])[0]
+        if target is None:
+            return _json_response(400, {"error": "target 파라미터가 필요합니다"})
+        try:
+            window = float(query.get("window", ["900"])[0])
+            alpha = float(query.get("alpha", ["0.3"])[0])
+        except ValueError:
+            return _json_response(400, {"error": "window/alpha는 숫자여야 합니다"})
+
+        stats = recent.stats(check_type, target, window, alpha)
+        if stats is None:
+            return _json_response(404, {"error": f"{check_type}/{target} 결과가 없습니다"})
+        stats.update({"check_type": check_type, "target": target, "window_seconds": window})
+        return _json_response(200, stats)
+
+    return {"/recent/series": series_route, "/recent/stats": stats_route}
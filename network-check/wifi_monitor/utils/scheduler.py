@@ -0,0 +1,232 @@
+import logging
+import math
+import threading
+import time
+from typing import Callable, Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 이전 실행이 아직 끝나지 않았을 때 새 틱을 처리하는 방식
+OVERLAP_SKIP = "skip"          # 새 틱을 버림
+OVERLAP_QUEUE = "queue"        # 밀린 틱을 모두 순서대로 실행 (max_queue까지)
+OVERLAP_COALESCE = "coalesce"  # 밀린 틱을 한 번의 실행으로 합침
+OVERLAP_POLICIES = (OVERLAP_SKIP, OVERLAP_QUEUE, OVERLAP_COALESCE)
+
+
+class _Job:
+    """스케줄러에 등록된 작업 하나. 전용 워커 스레드에서 실행됩니다."""
+
+    def __init__(self, name: str, func: Callable, interval: float, overlap: str,
+                 args: Tuple, max_queue: int, next_deadline: float):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.overlap = overlap
+        self.args = args
+        self.max_queue = max_queue
+        self.next_deadline = next_deadline
+
+        self.cond = threading.Condition()
+        self.pending = []  # 실행 대기 중인 틱의 예정 시각 (monotonic)
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+
+        self.stats = {
+            "runs": 0,
+            "skipped": 0,
+            "coalesced": 0,
+            "failed": 0,
+            "last_lateness_seconds": 0.0,
+            "max_lateness_seconds": 0.0,
+            "total_lateness_seconds": 0.0,
+            "last_duration_seconds": 0.0,
+        }
+
+
+class FixedRateScheduler:
+    """
+    monotonic 시계 기준 고정 주기 스케줄러입니다.
+
+    각 작업의 n번째 틱은 start + n * interval에 예정되며, 실행이 늦어져도 다음
+    예정 시각이 밀리지 않습니다(드리프트 없음). 작업마다 전용 스레드에서 실행되므로
+    느린 작업(속도 테스트)이 빠른 작업(ping)의 주기를 막지 않습니다.
+
+    예정 시각 대비 실제 시작 시각의 차이(lateness)를 작업별로 기록합니다.
+    """
+
+    def __init__(self):
+        self._jobs: Dict[str, _Job] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+
+    def add_job(self, name: str, func: Callable, interval_seconds: float,
+                overlap: str = OVERLAP_SKIP, args: Tuple = (), first_run_delay: float = 0.0,
+                max_queue: int = 3) -> None:
+        """
+        작업을 등록합니다.
+
+        Args:
+            name: 작업 이름 (로그/통계 키)
+            func: 실행할 함수
+            interval_seconds: 실행 주기 (초)
+            overlap: 이전 실행이 끝나지 않았을 때의 정책 ("skip", "queue", "coalesce")
+            args: func에 넘길 인자
+            first_run_delay: 첫 실행까지의 지연 (초, 0이면 즉시 실행)
+            max_queue: overlap="queue"일 때 쌓아 둘 최대 틱 수
+        """
+        if overlap not in OVERLAP_POLICIES:
+            raise ValueError(f"알 수 없는 중첩 정책: {overlap} (가능한 값: {', '.join(OVERLAP_POLICIES)})")
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds는 0보다 커야 합니다")
+
+        job = _Job(name, func, interval_seconds, overlap, args, max_queue,
+                   time.monotonic() + first_run_delay)
+        job.thread = threading.Thread(target=self._worker, args=(job,), name=f"job-{name}", daemon=True)
+        with self._lock:
+            self._jobs[name] = job
+        job.thread.start()
+        self._wakeup.set()
+
+    def set_interval(self, name: str, interval_seconds: float) -> None:
+        """
+        작업의 주기를 바꿉니다 (다른 스레드에서 호출 가능).
+
+        주기를 줄이면 다음 틱이 새 주기 안으로 당겨지고, 늘리면 이미 예정된 다음 틱
+        이후부터 새 주기가 적용됩니다.
+        """
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds는 0보다 커야 합니다")
+        with self._lock:
+            job = self._jobs[name]
+            if job.interval == interval_seconds:
+                return
+            job.interval = interval_seconds
+            job.next_deadline = min(job.next_deadline, time.monotonic() + interval_seconds)
+        self._wakeup.set()
+
+    def get_interval(self, name: str) -> float:
+        with self._lock:
+            return self._jobs[name].interval
+
+    def _dispatch(self, job: _Job, deadline: float) -> None:
+        """예정 시각이 된 틱을 작업의 중첩 정책에 따라 워커에 넘깁니다."""
+        with job.cond:
+            busy = job.running or job.pending
+            if not busy:
+                job.pending.append(deadline)
+            elif job.overlap == OVERLAP_SKIP:
+                job.stats["skipped"] += 1
+                logger.warning(f"[{job.name}] 이전 실행이 끝나지 않아 이번 틱을 건너뜁니다")
+            elif job.overlap == OVERLAP_COALESCE:
+                if job.pending:
+                    job.stats["coalesced"] += 1
+                else:
+                    job.pending.append(deadline)
+            else:
+                if len(job.pending) < job.max_queue:
+                    job.pending.append(deadline)
+                else:
+                    job.stats["skipped"] += 1
+                    logger.warning(f"[{job.name}] 대기열이 가득 차 이번 틱을 건너뜁니다")
+            job.cond.notify()
+
+    def _worker(self, job: _Job) -> None:
+        while not self._stopped.is_set():
+            with job.cond:
+                while not job.pending and not self._stopped.is_set():
+                    job.cond.wait()
+                if self._stopped.is_set():
+                    return
+                deadline = job.pending.pop(0)
+                job.running = True
+
+            started = time.monotonic()
+            lateness = max(0.0, started - deadline)
+            try:
+                job.func(*job.args)
+            except Exception as e:
+                job.stats["failed"] += 1
+                logger.error(f"[{job.name}] 작업 실행 중 오류: {e}")
+            finally:
+                duration = time.monotonic() - started
+                with job.cond:
+                    job.running = False
+                    job.stats["runs"] += 1
+                    job.stats["last_lateness_seconds"] = lateness
+                    job.stats["max_lateness_seconds"] = max(job.stats["max_lateness_seconds"], lateness)
+                    job.stats["total_lateness_seconds"] += lateness
+                    job.stats["last_duration_seconds"] = duration
+
+            if lateness > 1.0:
+                logger.warning(f"[{job.name}] 예정 시각보다 {lateness:.2f}초 늦게 실행되었습니다")
+
+    def run_pending(self) -> float:
+        """
+        예정 시각이 지난 틱을 처리하고, 다음 예정 시각까지 남은 시간(초)을 반환합니다.
+        """
+        now = time.monotonic()
+        next_wakeup = math.inf
+        # set_interval()과 예정 시각을 동시에 바꾸지 않도록 _lock 안에서 처리합니다
+        with self._lock:
+            for job in self._jobs.values():
+                if job.next_deadline <= now:
+                    self._dispatch(job, job.next_deadline)
+                    # 고정 주기: 놓친 틱은 건너뛰고 다음 격자 시각으로 이동 (시스템 일시정지 등)
+                    missed = int((now - job.next_deadline) // job.interval)
+                    if missed:
+                        with job.cond:
+                            job.stats["skipped"] += missed
+                        logger.warning(f"[{job.name}] 틱 {missed}개를 놓쳤습니다")
+                    job.next_deadline += (missed + 1) * job.interval
+                next_wakeup = min(next_wakeup, job.next_deadline - now)
+        return max(0.0, next_wakeup)
+
+    def run_forever(self) -> None:
+        """stop()이 호출될 때까지 스케줄 루프를 실행합니다."""
+        while not self._stopped.is_set():
+            timeout = self.run_pending()
+            self._wakeup.wait(None if math.isinf(timeout) else timeout)
+            self._wakeup.clear()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """스케줄 루프와 워커 스레드를 멈춥니다. 실행 중인 작업은 timeout까지 기다립니다."""
+        self._stopped.set()
+        self._wakeup.set()
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            with job.cond:
+                job.cond.notify_all()
+        for job in jobs:
+            if job.thread is not None:
+                job.thread.join(timeout)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        작업별 실행 통계를 반환합니다.
+
+        Returns:
+            {
+                "router": {
+                    "interval_seconds": 60.0, "overlap": "skip",
+                    "runs": 10, "skipped": 0, "coalesced": 0, "failed": 0, "running": False,
+                    "last_lateness_seconds": 0.001, "max_lateness_seconds": 0.004,
+                    "avg_lateness_seconds": 0.002, "last_duration_seconds": 1.2
+                }
+            }
+        """
+        with self._lock:
+            jobs = list(self._jobs.values())
+
+        stats = {}
+        for job in jobs:
+            with job.cond:
+                job_stats = dict(job.stats)
+                job_stats["running"] = job.running
+            job_stats["interval_seconds"] = job.interval
+            job_stats["overlap"] = job.overlap
+            runs = job_stats["runs"]
+            job_stats["avg_lateness_seconds"] = job_stats.pop("total_lateness_seconds") / runs if runs else 0.0
+            stats[job.name] = job_stats
+        return stats
@@ -0,0 +1,346 @@
+import contextvars
+import itertools
+import json
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 다른 프로세스로 넘기는 추적 문맥: (trace_id, 부모 span_id)
+TraceContext = Tuple[str, str]
+
+_enabled = False
+_sample_rate = 1.0
+_exporters: List["SpanExporter"] = []
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("wifi_monitor_span", default=None)
+_span_ids = itertools.count(1)
+
+
+class _NoopSpan:
+    """추적이 꺼져 있거나 샘플링되지 않았을 때 쓰는 빈 span. 모든 호출이 공유합니다."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class _Unsampled:
+    """샘플링되지 않은 추적 안에 있다는 표시 (contextvar 값)."""
+
+    __slots__ = ()
+
+
+_UNSAMPLED = _Unsampled()
+
+
+class _UnsampledRoot(_NoopSpan):
+    __slots__ = ("_token",)
+
+    def __enter__(self):
+        self._token = _current.set(_UNSAMPLED)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current.reset(self._token)
+        return False
+
+
+class _Trace:
+    """한 작업(틱)의 span 모음. 루트 span이 끝나면 내보냅니다."""
+
+    __slots__ = ("trace_id", "spans", "_lock")
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: "Span") -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def finish(self, root: "Span") -> None:
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.start_ns)
+        for exporter in list(_exporters):
+            try:
+                exporter.export(root, spans)
+            except Exception as e:
+                logger.warning(f"추적 내보내기 실패 ({exporter.name}): {e}")
+
+
+class Span:
+    """구간 하나. with 블록으로 사용하며, 블록 안에서 만든 span은 자식이 됩니다."""
+
+    __slots__ = ("name", "trace", "span_id", "parent_id", "is_root", "start_ns", "end_ns",
+                 "pid", "thread_id", "thread_name", "attrs", "_token")
+
+    def __init__(self, name: str, trace: _Trace, parent_id: Optional[str], is_root: bool,
+                 attrs: Dict[str, Any]):
+        self.name = name
+        self.trace = trace
+        self.pid = os.getpid()
+        # 자식 프로세스의 span과 섞여도 겹치지 않도록 pid를 앞에 붙입니다
+        self.span_id = f"{self.pid:x}-{next(_span_ids):x}"
+        self.parent_id = parent_id
+        self.is_root = is_root
+        self.start_ns = 0
+        self.end_ns = 0
+        thread = threading.current_thread()
+        self.thread_id = thread.ident
+        self.thread_name = thread.name
+        self.attrs = attrs
+        self._token = None
+
+    def __enter__(self):
+        self._token = _current.set(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_ns = time.perf_counter_ns()
+        _current.reset(self._token)
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.trace.add(self)
+        if self.is_root:
+            self.trace.finish(self)
+        return False
+
+    def set(self, key: str, value: Any) -> None:
+        self.attrs[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1_000_000
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "pid": self.pid,
+            "thread_id": self.thread_id,
+            "thread_name": self.thread_name,
+            "attrs": self.attrs,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], trace: _Trace) -> "Span":
+        span = cls(data["name"], trace, data["parent_id"], False, data["attrs"])
+        span.span_id = data["span_id"]
+        span.start_ns = data["start_ns"]
+        span.end_ns = data["end_ns"]
+        span.pid = data["pid"]
+        span.thread_id = data["thread_id"]
+        span.thread_name = data["thread_name"]
+        return span
+
+
+def span(name: str, **attrs):
+    """
+    구간을 잽니다. 진행 중인 추적이 없으면 새 추적(루트 span)을 시작합니다.
+
+    추적이 꺼져 있으면 전역 플래그 하나만 확인하고 공유된 빈 span을 반환하므로,
+    체크/저장 코드에 그대로 남겨 두어도 비용이 거의 없습니다.
+
+        with tracing.span("db.copy", rows=len(batch)):
+            cursor.copy_expert(...)
+    """
+    if not _enabled:
+        return _NOOP
+    parent = _current.get()
+    if parent is None:
+        if _sample_rate < 1.0 and random.random() >= _sample_rate:
+            # 샘플링되지 않은 틱: 자식 span도 만들지 않도록 빈 span을 현재 span으로 둡니다
+            return _UnsampledRoot()
+        return Span(name, _Trace(uuid.uuid4().hex), None, True, attrs)
+    if parent is _UNSAMPLED:
+        return _NOOP
+    return Span(name, parent.trace, parent.span_id, False, attrs)
+
+
+def current_context() -> Optional[TraceContext]:
+    """다른 프로세스에서 추적을 이어가기 위한 문맥. 추적 중이 아니면 None"""
+    current = _current.get()
+    if not _enabled or current is None or current is _UNSAMPLED:
+        return None
+    return (current.trace.trace_id, current.span_id)
+
+
+def continue_trace(context: Optional[TraceContext], name: str, **attrs):
+    """
+    다른 프로세스에서 넘겨받은 문맥으로 추적을 이어갑니다.
+
+    반환된 span이 이 프로세스의 루트가 되며, 끝나면 설정된 내보내기(보통 CollectingExporter)로 전달됩니다.
+    """
+    if not _enabled or context is None:
+        return _NOOP
+    trace_id, parent_id = context
+    return Span(name, _Trace(trace_id), parent_id, True, attrs)
+
+
+def adopt_spans(spans: Iterable[Dict[str, Any]]) -> None:
+    """다른 프로세스에서 받은 span(to_dict 결과)을 현재 추적에 붙입니다."""
+    current = _current.get()
+    if not _enabled or current is None or current is _UNSAMPLED:
+        return
+    for data in spans:
+        if data.get("trace_id") == current.trace.trace_id:
+            current.trace.add(Span.from_dict(data, current.trace))
+
+
+class SpanExporter:
+    """끝난 추적을 받는 내보내기의 기본 클래스. export()를 구현하면 됩니다."""
+
+    name = "exporter"
+
+    def export(self, root: Span, spans: List[Span]) -> None:
+        raise NotImplementedError
+
+
+class LogExporter(SpanExporter):
+    """
+    추적 하나를 로그 한 줄로 남깁니다. 같은 이름의 span은 합산합니다.
+
+        추적 tick.router 612.3ms: router.check 604.1ms, ping 601.8ms (x3), outbox.write 2.4ms
+    """
+
+    name = "log"
+
+    def __init__(self, min_duration_ms: float = 0.0):
+        self.min_duration_ms = min_duration_ms
+
+    def export(self, root: Span, spans: List[Span]) -> None:
+        if root.duration_ms < self.min_duration_ms:
+            return
+        totals: Dict[str, List[float]] = {}
+        for item in spans:
+            if item is root:
+                continue
+            entry = totals.setdefault(item.name, [0.0, 0])
+            entry[0] += item.duration_ms
+            entry[1] += 1
+        stages = ", ".join(
+            f"{name} {total:.1f}ms" + (f" (x{count})" if count > 1 else "")
+            for name, (total, count) in totals.items()
+        )
+        logger.info(f"추적 {root.name} {root.duration_ms:.1f}ms" + (f": {stages}" if stages else ""),
+                    extra={"trace": [item.to_dict() for item in spans]})
+
+
+class MetricsExporter(SpanExporter):
+    """span 이름별 소요 시간을 wifi_monitor_stage_duration_seconds 히스토그램에 반영합니다."""
+
+    name = "metrics"
+
+    def export(self, root: Span, spans: List[Span]) -> None:
+        from utils.metrics import STAGE_DURATION
+
+        for item in spans:
+            STAGE_DURATION.observe(item.duration_ms / 1000, stage=item.name)
+
+
+class ChromeTraceExporter(SpanExporter):
+    """
+    Chrome 추적 형식(JSON 배열, "X" 이벤트)으로 파일에 이어 씁니다.
+
+    chrome://tracing 이나 https://ui.perfetto.dev 에서 바로 열 수 있습니다. 닫는 "]"가 없어도
+    두 도구 모두 읽으므로 이벤트를 계속 덧붙이고, max_bytes를 넘으면 .1로 옮기고 새로 시작합니다.
+    """
+
+    name = "chrome"
+
+    def __init__(self, path: str, max_bytes: int = 10 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def export(self, root: Span, spans: List[Span]) -> None:
+        lines = []
+        for item in spans:
+            args = {key: value for key, value in item.attrs.items()}
+            args["trace_id"] = item.trace.trace_id
+            lines.append(json.dumps({
+                "name": item.name,
+                "cat": item.name.split(".", 1)[0],
+                "ph": "X",
+                "ts": item.start_ns / 1000,
+                "dur": (item.end_ns - item.start_ns) / 1000,
+                "pid": item.pid,
+                "tid": item.thread_id,
+                "args": args,
+            }, ensure_ascii=False, default=str))
+
+        with self._lock:
+            try:
+                size = os.path.getsize(self.path)
+            except OSError:
+                size = 0
+            if size >= self.max_bytes:
+                os.replace(self.path, f"{self.path}.1")
+                size = 0
+            with open(self.path, "a", encoding="utf-8") as f:
+                if size == 0:
+                    f.write("[\n")
+                f.write(",\n".join(lines) + ",\n")
+
+
+class CollectingExporter(SpanExporter):
+    """끝난 span을 메모리에 모읍니다 (자식 프로세스에서 부모로 보낼 때, 테스트용)."""
+
+    name = "collect"
+
+    def __init__(self):
+        self.spans: List[Dict[str, Any]] = []
+
+    def export(self, root: Span, spans: List[Span]) -> None:
+        self.spans.extend(item.to_dict() for item in spans)
+
+
+def configure(enabled: bool, sample_rate: float = 1.0,
+              exporters: Optional[List[SpanExporter]] = None) -> None:
+    """추적을 켜거나 끕니다. sample_rate는 루트 span(틱)을 기록할 확률입니다."""
+    global _enabled, _sample_rate, _exporters
+
+    _sample_rate = min(1.0, max(0.0, sample_rate))
+    _exporters = list(exporters or [])
+    _enabled = enabled and bool(_exporters)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def build_exporters(names: Iterable[str], chrome_path: str, chrome_max_bytes: int,
+                    log_min_duration_ms: float = 0.0) -> List[SpanExporter]:
+    """설정 이름(log, metrics, chrome)으로 내보내기 목록을 만듭니다."""
+    exporters: List[SpanExporter] = []
+    for name in names:
+        if name == "log":
+            exporters.append(LogExporter(log_min_duration_ms))
+        elif name == "metrics":
+            exporters.append(MetricsExporter())
+        elif name == "chrome":
+            exporters.append(ChromeTraceExporter(chrome_path, chrome_max_bytes))
+        elif name:
+            raise ValueError(f"알 수 없는 추적 내보내기: {name} (가능한 값: log, metrics, chrome)")
+    return exporters